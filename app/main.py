@@ -1,13 +1,208 @@
 from __future__ import annotations
-from fastapi import FastAPI
+import math
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Header, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from pydantic import BaseModel
-from agent import root_handle
+from agent import compliance_gate_async, compliance_gate_batch, stream_chat
+from zero_touch_cx.admission import LOCAL_CLIENT, Shed, admission_stats, get_admission_controller, shed_response
+from zero_touch_cx.agents.fast_path import router_stats
+from zero_touch_cx.config import settings
+from zero_touch_cx.executors import shutdown_executors
+from zero_touch_cx.profiling import profile_requested
+from zero_touch_cx.agents.report_cards import report_card
+from zero_touch_cx.sessions import session_scope, session_stats
+from zero_touch_cx.singleflight import singleflight_stats
+from zero_touch_cx.serialization import dumps, dumps_str, encode_response
+from zero_touch_cx.scheduler import ReportScheduler
+from zero_touch_cx.tools.ach import shutdown_ach_pool
+from zero_touch_cx.tools.doc_store import get_doc_store
+from zero_touch_cx.tools.query_builder import query_budget_stats
+from zero_touch_cx.tools.upgrade_queue import stop_upgrade_queue
 
-app = FastAPI(title="Zero-Touch CX API")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    scheduler = ReportScheduler() if settings.report_scheduler_enabled else None
+    if scheduler:
+        scheduler.start()
+    yield
+    if scheduler:
+        scheduler.stop()
+    stop_upgrade_queue(flush=True)  # commit queued upgrades before exit
+    shutdown_ach_pool()
+    shutdown_executors(wait=False)
+
+class FastJSONResponse(JSONResponse):
+    """Encodes with zero_touch_cx.serialization.dumps (orjson when installed)."""
+
+    def render(self, content) -> bytes:
+        return dumps(content)
+
+app = FastAPI(title="Zero-Touch CX API", lifespan=lifespan, default_response_class=FastJSONResponse)
 
 class ChatIn(BaseModel):
     text: str
+    session_id: str | None = None  # multi-turn flows such as CONFIRM UPGRADE (zero_touch_cx/sessions.py)
+
+class ChatBatchIn(BaseModel):
+    texts: list[str]
+
+def _negotiated(content, accept: str | None, accept_encoding: str | None) -> Response:
+    """JSON, MessagePack or Arrow IPC per Accept; gzip/zstd above RESPONSE_COMPRESS_MIN_BYTES."""
+    try:
+        body, media_type, headers = encode_response(content, accept, accept_encoding)
+    except ValueError as e:
+        return FastJSONResponse({"detail": str(e)}, status_code=406)
+    return Response(body, media_type=media_type, headers=headers)
+
+def _wants_profile(x_profile: str | None) -> bool:
+    return (x_profile or "").lower() in ("1", "true", "yes")
+
+def _client(request: Request) -> str:
+    """Admission key: the caller's address (run uvicorn with --proxy-headers behind a proxy)."""
+    return request.client.host if request.client else LOCAL_CLIENT
+
+def _retry_after(response: dict) -> str:
+    return str(max(1, math.ceil(response["payload"]["retry_after_s"])))
 
 @app.post("/chat")
-def chat(inp: ChatIn):
-    return root_handle(inp.text)
+async def chat(
+    inp: ChatIn,
+    request: Request,
+    x_profile: str | None = Header(default=None),
+    accept: str | None = Header(default=None),
+    accept_encoding: str | None = Header(default=None),
+):
+    # `X-Profile: 1` forces a profile for this request (see zero_touch_cx/profiling.py)
+    with profile_requested(_wants_profile(x_profile)), session_scope(inp.session_id):
+        response = await compliance_gate_async(inp.text, _client(request))
+    # Returned as a Response so the payload is encoded once, off the event loop.
+    encoded = await run_in_threadpool(_negotiated, response, accept, accept_encoding)
+    payload = response.get("payload") or {}
+    if payload.get("type") == "shed" and encoded.status_code == 200:
+        encoded.status_code = 429
+        encoded.headers["Retry-After"] = _retry_after(response)
+    return encoded
+
+@app.get("/reports/{report_id}")
+def get_report(
+    report_id: str,
+    customer_id: str,
+    start_date: str | None = None,
+    end_date: str | None = None,
+    include_rows: bool = False,
+    accept: str | None = Header(default=None),
+    accept_encoding: str | None = Header(default=None),
+):
+    """ReportCard for one customer; bulk consumers can ask for Arrow IPC or MessagePack."""
+    try:
+        card = report_card(report_id, customer_id, start_date, end_date, include_rows)
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Unknown report {report_id}")
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    return _negotiated(card, accept, accept_encoding)
+
+
+def _byte_range(header: str | None, size: int) -> tuple[int, int] | None:
+    """(start, end) inclusive for a single ``bytes=`` range; None means the whole file."""
+    if not header:
+        return None
+    unit, _, spec = header.partition("=")
+    if unit.strip() != "bytes" or "," in spec:
+        return None  # unsupported: serve the whole document
+    first, _, last = spec.strip().partition("-")
+    try:
+        if first:
+            start, end = int(first), int(last) if last else size - 1
+        else:
+            start, end = max(0, size - int(last)), size - 1
+    except ValueError:
+        return None
+    if start >= size or start > end:
+        raise HTTPException(status_code=416, detail="Range not satisfiable", headers={"Content-Range": f"bytes */{size}"})
+    return start, min(end, size - 1)
+
+
+@app.get("/documents/{digest}")
+def get_document(digest: str, document_type: str, expires: int, sig: str, range_: str | None = Header(default=None, alias="Range")):
+    """Serves a retrieval link from retrieve_document_copy; supports single byte ranges."""
+    store = get_doc_store()
+    if not store.verify_link(digest, document_type, expires, sig):
+        raise HTTPException(status_code=403, detail="Invalid or expired document link")
+    path = store.blob_path(digest)
+    if not path.exists():
+        raise HTTPException(status_code=404, detail="Document not found")
+    size = path.stat().st_size
+    media_type = store.content_type(digest)
+    headers = {"Accept-Ranges": "bytes", "Cache-Control": "private, no-store"}
+    requested = _byte_range(range_, size)
+    if requested is None:
+        headers["Content-Length"] = str(size)
+        return StreamingResponse(store.iter_range(digest, 0, size - 1), media_type=media_type, headers=headers)
+    start, end = requested
+    headers.update({"Content-Range": f"bytes {start}-{end}/{size}", "Content-Length": str(end - start + 1)})
+    return StreamingResponse(store.iter_range(digest, start, end), status_code=206, media_type=media_type, headers=headers)
+
+@app.post("/chat/batch")
+async def chat_batch(inp: ChatBatchIn, request: Request):
+    """Streams one NDJSON line per input message, in input order."""
+    if len(inp.texts) > settings.batch_max_messages:
+        raise HTTPException(status_code=413, detail=f"At most {settings.batch_max_messages} messages per batch.")
+    # Admitted as a whole: one rate token per message, or a 429 before any work starts.
+    try:
+        await run_in_threadpool(get_admission_controller().check_batch, inp.texts, _client(request))
+    except Shed as shed:
+        response = shed_response(shed)
+        return FastJSONResponse(response, status_code=429, headers={"Retry-After": _retry_after(response)})
+
+    def lines():
+        for index, response in enumerate(compliance_gate_batch(inp.texts)):
+            yield dumps({"index": index, **response}) + b"\n"
+
+    # Starlette iterates sync generators in its threadpool, so waiting on domain calls
+    # does not block the event loop.
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {dumps_str(data)}\n\n"
+
+@app.post("/chat/stream")
+async def chat_stream(inp: ChatIn, request: Request):
+    """Server-sent events: `summary` (with KPIs) first, then `rows` chunks, then `done`."""
+    stream = stream_chat(inp.text, _client(request))
+    # The first event decides admission; a shed request gets a 429 instead of an event stream.
+    with session_scope(inp.session_id):
+        first = await stream.__anext__()
+    event, data = first
+    if event == "summary" and (data.get("payload") or {}).get("type") == "shed":
+        await stream.aclose()
+        return FastJSONResponse(data, status_code=429, headers={"Retry-After": _retry_after(data)})
+
+    async def events():
+        try:
+            yield _sse(event, data)
+            with session_scope(inp.session_id):
+                async for later in stream:
+                    yield _sse(*later)
+        finally:
+            await stream.aclose()
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.get("/metrics")
+def metrics():
+    """Admission control state, coalesced tool calls, session store hits, and routing/query counters."""
+    return {
+        "admission": admission_stats(),
+        "singleflight": singleflight_stats(),
+        "sessions": session_stats(),
+        "fast_path": router_stats(),
+        "bq_budget": query_budget_stats(),
+    }
@@ -0,0 +1,48 @@
+"""Throughput of the intent classifiers, in messages/sec.
+
+    PYTHONPATH=. python benchmarks/bench_intent.py [--n 200000]
+
+Compares the single-message classify_intent loop with the two batch paths of
+classify_intents (rules and hashed n-gram model) on samples drawn from
+data/intent_samples.csv.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+
+from zero_touch_cx.agents.intent_model import load_intent_model, load_samples
+from zero_touch_cx.agents.intent_tools import classify_intent, classify_intents
+
+
+def _rate(fn, texts: list[str]) -> float:
+    started = time.perf_counter()
+    fn(texts)
+    return len(texts) / (time.perf_counter() - started)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--n", type=int, default=200_000, help="messages per run")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    texts, _ = load_samples()
+    rng = random.Random(args.seed)
+    batch = [rng.choice(texts) for _ in range(args.n)]
+    load_intent_model()  # train/load outside the timed region
+
+    runs = {
+        "classify_intent loop": lambda ts: [classify_intent(t) for t in ts],
+        "classify_intents rules": lambda ts: classify_intents(ts, method="rules"),
+        "classify_intents model": lambda ts: classify_intents(ts, method="model"),
+    }
+    print(f"{'path':<26}{'msgs/sec':>14}")
+    for name, fn in runs.items():
+        print(f"{name:<26}{_rate(fn, batch):>14,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,262 @@
+"""Offline load harness: chats/sec, latency percentiles and RSS for one instance.
+
+    PYTHONPATH=.:zero_touch_cx python -m benchmarks.loadtest.run --concurrency 32 --duration 30
+    PYTHONPATH=.:zero_touch_cx python -m benchmarks.loadtest.run --mix report=50,billing=50 --bq-latency-ms 200
+
+Starts ``app.main:app`` in a child process with the stand-ins from standins.py
+(BigQuery, GCS and the model answer locally after a configurable latency), then
+replays a seeded mix of report, balance, billing and upgrade requests from
+``--concurrency`` clients for ``--duration`` seconds. Reports are read to the end
+over ``/chat/stream``; the other kinds go to ``/chat``. A stream that sends an
+``error`` event counts as a failed request. Nothing leaves the box.
+Server output goes to ``--server-log``.
+
+All clients connect from 127.0.0.1, which admission control treats as a single
+caller, so the server is started with per-client and per-tool rate limits lifted
+(SERVER_ENV; variables already set in the environment win).
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+from collections import Counter, defaultdict
+from pathlib import Path
+
+import httpx
+
+ROOT = Path(__file__).resolve().parents[2]
+
+REQUESTS = {
+    "report": ("/chat/stream", "send the wire status report for {cust} for the last {days} days"),
+    "balance": ("/chat", "what is the intraday balance for {cust}"),
+    "billing": ("/chat", "show the billing summary for {cust}"),
+    "upgrade": ("/chat", "upgrade {cust} to the pro plan"),
+}
+DEFAULT_MIX = "report=40,balance=20,billing=25,upgrade=15"
+# Admission limits for the server under test; the in-flight limit and its queue stay as configured.
+SERVER_ENV = {
+    "ADMISSION_CUSTOMER_RATE_PER_S": "1000000",
+    "ADMISSION_CUSTOMER_BURST": "1000000",
+    "ADMISSION_TOOL_RATES": "",
+}
+
+
+def parse_mix(spec: str) -> dict[str, float]:
+    mix = {}
+    for part in spec.split(","):
+        kind, _, weight = part.partition("=")
+        if kind.strip() not in REQUESTS:
+            raise ValueError(f"unknown request kind {kind!r}; choose from {', '.join(REQUESTS)}")
+        mix[kind.strip()] = float(weight or 1)
+    return mix
+
+
+def percentile(sorted_values: list[float], q: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(q / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def rss_kb(pid: int) -> dict[str, int]:
+    """Current (VmRSS) and peak (VmHWM) resident set size of a process, from /proc."""
+    out = {}
+    try:
+        for line in Path(f"/proc/{pid}/status").read_text().splitlines():
+            key, _, value = line.partition(":")
+            if key in ("VmRSS", "VmHWM"):
+                out[key] = int(value.split()[0])
+    except OSError:
+        pass
+    return out
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(port: int, args: argparse.Namespace, log) -> subprocess.Popen:
+    env = {**SERVER_ENV, **os.environ, "PYTHONPATH": os.pathsep.join([str(ROOT), str(ROOT / "zero_touch_cx")])}
+    cmd = [
+        sys.executable, "-m", "benchmarks.loadtest.server", "--port", str(port),
+        "--bq-latency-ms", str(args.bq_latency_ms),
+        "--gcs-latency-ms", str(args.gcs_latency_ms),
+        "--model-latency-ms", str(args.model_latency_ms),
+        "--report-rows", str(args.report_rows),
+    ]
+    return subprocess.Popen(cmd, cwd=ROOT, env=env, stdout=log, stderr=subprocess.STDOUT)
+
+
+async def wait_ready(base_url: str, proc: subprocess.Popen, timeout_s: float = 60) -> None:
+    deadline = time.monotonic() + timeout_s
+    async with httpx.AsyncClient(base_url=base_url) as client:
+        while time.monotonic() < deadline:
+            if proc.poll() is not None:
+                raise RuntimeError(f"server exited with code {proc.returncode}")
+            try:
+                if (await client.get("/openapi.json")).status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.2)
+    raise TimeoutError(f"server not ready after {timeout_s}s")
+
+
+def stream_status(status_code: int, body: str) -> int:
+    """HTTP status of a /chat/stream response, or 500 when the stream ended in an error event."""
+    if status_code == 200 and any(block.startswith("event: error") for block in body.split("\n\n")):
+        return 500
+    return status_code
+
+
+async def drive(base_url: str, mix: dict[str, float], concurrency: int, duration_s: float, seed: int) -> list[tuple]:
+    """Closed-loop clients; returns (kind, status_code, latency_s) per request."""
+    kinds, weights = list(mix), list(mix.values())
+    results: list[tuple] = []
+    deadline = time.monotonic() + duration_s
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async def client_loop(worker: int, client: httpx.AsyncClient) -> None:
+        rng = random.Random(seed * 10_007 + worker)
+        while time.monotonic() < deadline:
+            kind = rng.choices(kinds, weights)[0]
+            path, template = REQUESTS[kind]
+            text = template.format(cust=f"cust_{rng.randrange(1, 4):03d}", days=rng.choice([7, 30, 90]))
+            started = time.perf_counter()
+            try:
+                resp = await client.post(path, json={"text": text})
+                status = stream_status(resp.status_code, resp.text) if path == "/chat/stream" else resp.status_code
+            except httpx.HTTPError:
+                status = 0
+            results.append((kind, status, time.perf_counter() - started))
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=120) as client:
+        await asyncio.gather(*(client_loop(i, client) for i in range(concurrency)))
+    return results
+
+
+async def sample_rss(pid: int, samples: list[int], stop: asyncio.Event) -> None:
+    while not stop.is_set():
+        samples.append(rss_kb(pid).get("VmRSS", 0))
+        try:
+            await asyncio.wait_for(stop.wait(), timeout=0.5)
+        except asyncio.TimeoutError:
+            pass
+
+
+def summarize(results: list[tuple], elapsed_s: float) -> dict:
+    by_kind: dict[str, list[tuple]] = defaultdict(list)
+    for row in results:
+        by_kind[row[0]].append(row)
+    by_kind["all"] = results
+
+    summary = {}
+    for kind, rows in by_kind.items():
+        latencies = sorted(r[2] * 1000 for r in rows)
+        summary[kind] = {
+            "requests": len(rows),
+            "errors": sum(1 for r in rows if r[1] != 200),
+            "statuses": dict(sorted(Counter(r[1] for r in rows).items())),
+            "rps": round(len(rows) / elapsed_s, 1) if elapsed_s else 0.0,
+            "p50_ms": round(percentile(latencies, 50), 1),
+            "p95_ms": round(percentile(latencies, 95), 1),
+            "p99_ms": round(percentile(latencies, 99), 1),
+        }
+    return summary
+
+
+async def run(args: argparse.Namespace) -> dict:
+    port = args.port or _free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    args.server_log.parent.mkdir(parents=True, exist_ok=True)
+    log = open(args.server_log, "w", encoding="utf-8")
+    proc = start_server(port, args, log)
+    try:
+        await wait_ready(base_url, proc)
+        if args.warmup:
+            await drive(base_url, parse_mix(args.mix), args.concurrency, args.warmup, args.seed + 1)
+        rss_start = rss_kb(proc.pid)
+        samples: list[int] = []
+        stop = asyncio.Event()
+        sampler = asyncio.create_task(sample_rss(proc.pid, samples, stop))
+        started = time.perf_counter()
+        results = await drive(base_url, parse_mix(args.mix), args.concurrency, args.duration, args.seed)
+        elapsed = time.perf_counter() - started
+        stop.set()
+        await sampler
+        rss_end = rss_kb(proc.pid)
+    finally:
+        proc.terminate()
+        try:
+            proc.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+        log.close()
+
+    return {
+        "concurrency": args.concurrency,
+        "duration_s": round(elapsed, 2),
+        "mix": parse_mix(args.mix),
+        "latency_ms": {"bigquery": args.bq_latency_ms, "gcs": args.gcs_latency_ms, "model": args.model_latency_ms},
+        "results": summarize(results, elapsed),
+        "rss_mb": {
+            "start": round(rss_start.get("VmRSS", 0) / 1024, 1),
+            "end": round(rss_end.get("VmRSS", 0) / 1024, 1),
+            "peak": round(max(samples + [rss_end.get("VmHWM", 0)]) / 1024, 1),
+        },
+    }
+
+
+def print_report(report: dict) -> None:
+    print(f"concurrency {report['concurrency']}, {report['duration_s']}s, mix {report['mix']}")
+    print(f"{'kind':<10}{'requests':>10}{'errors':>8}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}")
+    for kind, row in sorted(report["results"].items(), key=lambda kv: kv[0] == "all"):
+        print(
+            f"{kind:<10}{row['requests']:>10}{row['errors']:>8}{row['rps']:>9}"
+            f"{row['p50_ms']:>9}{row['p95_ms']:>9}{row['p99_ms']:>9}"
+        )
+    failed = {k: v["statuses"] for k, v in report["results"].items() if v["errors"] and k != "all"}
+    if failed:
+        print(f"status codes where requests failed (0 = transport error): {failed}")
+    rss = report["rss_mb"]
+    print(f"RSS MB: start {rss['start']}, end {rss['end']}, peak {rss['peak']}")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Offline load test for app.main:app")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=30, help="measured seconds")
+    parser.add_argument("--warmup", type=float, default=3, help="unmeasured seconds before the run")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"kind=weight list (default {DEFAULT_MIX})")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--port", type=int, default=0, help="0 picks a free port")
+    parser.add_argument("--bq-latency-ms", type=float, default=80)
+    parser.add_argument("--gcs-latency-ms", type=float, default=50)
+    parser.add_argument("--model-latency-ms", type=float, default=600)
+    parser.add_argument("--report-rows", type=int, default=200)
+    parser.add_argument("--server-log", type=Path, default=ROOT / "artifacts" / "loadtest" / "server.log")
+    parser.add_argument("--json", type=Path, help="also write the report here")
+    args = parser.parse_args(argv)
+    parse_mix(args.mix)
+
+    report = asyncio.run(run(args))
+    print_report(report)
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,40 @@
+"""Serve app.main:app with the offline stand-ins installed (started by the load harness).
+
+    PYTHONPATH=.:zero_touch_cx python -m benchmarks.loadtest.server --port 8765
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--bq-latency-ms", type=float, default=80)
+    parser.add_argument("--gcs-latency-ms", type=float, default=50)
+    parser.add_argument("--model-latency-ms", type=float, default=600)
+    parser.add_argument("--report-rows", type=int, default=200)
+    args = parser.parse_args()
+
+    # Settings are read at import: take the GCP code paths, but never look for credentials.
+    os.environ["MOCK_MODE"] = "false"
+    os.environ.setdefault("GCS_BUCKET", "loadtest-bucket")
+    os.environ.setdefault("NO_GCE_CHECK", "true")
+
+    import uvicorn
+
+    from app.main import app
+    from benchmarks.loadtest.standins import Latencies, install
+
+    install(
+        Latencies(args.bq_latency_ms / 1000, args.gcs_latency_ms / 1000, args.model_latency_ms / 1000),
+        report_rows=args.report_rows,
+    )
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
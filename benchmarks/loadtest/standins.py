@@ -0,0 +1,168 @@
+"""Offline stand-ins for BigQuery, GCS and Gemini used by the load harness.
+
+They keep the real call shapes (``client.query(sql, job_config).result(page_size).pages``,
+``storage.Client().bucket().blob().upload_from_filename()``, ADK ``BaseLlm``) and add a
+configurable latency, so the app under load spends its time the way it would in GCP
+but never touches the network or needs credentials.
+"""
+
+from __future__ import annotations
+
+import random
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Iterator
+
+STATUSES = ("SUCCESS", "COMPLETED", "PENDING", "FAILED")
+
+
+@dataclass
+class Latencies:
+    bigquery_s: float = 0.08
+    gcs_s: float = 0.05
+    model_s: float = 0.6
+
+
+class FakeRowIterator:
+    """Iterable of rows with BigQuery's ``.pages`` view."""
+
+    def __init__(self, rows: list[dict], page_size: int | None):
+        self._rows = rows
+        self._page_size = page_size or max(1, len(rows))
+
+    def __iter__(self) -> Iterator[dict]:
+        return iter(self._rows)
+
+    @property
+    def total_rows(self) -> int:
+        return len(self._rows)
+
+    @property
+    def pages(self) -> Iterator[list[dict]]:
+        for i in range(0, len(self._rows), self._page_size):
+            yield self._rows[i:i + self._page_size]
+
+
+class FakeQueryJob:
+    def __init__(self, rows: list[dict], total_bytes_processed: int = 0):
+        self._rows = rows
+        self.total_bytes_processed = total_bytes_processed
+
+    def result(self, page_size: int | None = None, **_: Any) -> FakeRowIterator:
+        return FakeRowIterator(self._rows, page_size)
+
+
+class FakeBigQueryClient:
+    """Answers the queries in agents/tools.py with synthetic rows after ``latency_s``."""
+
+    def __init__(self, latency_s: float, report_rows: int = 200, seed: int = 0, bytes_per_query: int = 50 * 2**20):
+        self.latency_s = latency_s
+        self.report_rows = report_rows
+        self.bytes_per_query = bytes_per_query
+        self._rng = random.Random(seed)
+        self.queries = 0
+        self.dry_runs = 0
+
+    def query(self, sql: str, job_config: Any = None, **_: Any) -> FakeQueryJob:
+        if getattr(job_config, "dry_run", False):
+            self.dry_runs += 1
+            time.sleep(self.latency_s / 4)
+            return FakeQueryJob([], self.bytes_per_query)
+        self.queries += 1
+        time.sleep(self.latency_s)
+        params = {p.name: getattr(p, "value", None) for p in getattr(job_config, "query_parameters", None) or []}
+        return FakeQueryJob(self._rows_for(sql, params))
+
+    def _rows_for(self, sql: str, params: dict) -> list[dict]:
+        customer_id = params.get("customer_id") or "cust_001"
+        if "COUNT(*)" in sql:
+            n = self.report_rows
+            return [{
+                "total_count": n,
+                "pending_count": n // 10,
+                "completed_count": n * 8 // 10,
+                "failed_count": n - n // 10 - n * 8 // 10,
+            }]
+        if "mrr_usd" in sql:
+            start, end = params["start_date"], params["end_date"]
+            days = (end - start).days + 1
+            return [{
+                "plan": "Starter", "period_start": start, "from_date": start, "to_date": end,
+                "days": days, "amount": 19.0 * days / params["days_in_month"],
+            }]
+        if "AccountBalance" in sql:
+            return [{
+                "customer_id": customer_id,
+                "current_balance": 125_000.0,
+                "available_balance": 118_250.5,
+                "last_update_ts": datetime.now(timezone.utc),
+            }]
+        if "wire_report" in sql:
+            return [{"report_id": params.get("report_id"), "SenderName": params.get("sender_name"), "Amount": 1000.0}]
+        if "report_event" in sql:
+            start = datetime(2025, 1, 1)
+            return [
+                {
+                    "CustomerID": customer_id,
+                    "report_id": f"T-{1000 + i % 50}",
+                    "run_ts": (start + timedelta(hours=i)).isoformat(),
+                    "status": self._rng.choice(STATUSES),
+                }
+                for i in range(self.report_rows)
+            ]
+        return []
+
+
+class FakeBlob:
+    def __init__(self, latency_s: float):
+        self.latency_s = latency_s
+
+    def upload_from_filename(self, filename: str, **_: Any) -> None:
+        time.sleep(self.latency_s)
+
+
+class FakeBucket:
+    def __init__(self, latency_s: float):
+        self.latency_s = latency_s
+
+    def blob(self, name: str) -> FakeBlob:
+        return FakeBlob(self.latency_s)
+
+
+class FakeStorageClient:
+    latency_s = 0.0
+
+    def __init__(self, *_: Any, **__: Any):
+        pass
+
+    def bucket(self, name: str) -> FakeBucket:
+        return FakeBucket(self.latency_s)
+
+
+def _agents(agent) -> Iterator[Any]:
+    yield agent
+    for sub in getattr(agent, "sub_agents", None) or []:
+        yield from _agents(sub)
+
+
+def install(latencies: Latencies, report_rows: int = 200) -> FakeBigQueryClient:
+    """Swap every GCP client the app uses for a stand-in. Call before serving."""
+    from google.cloud import storage
+
+    from zero_touch_cx.agents import tools
+    from zero_touch_cx.agents.local_model import LocalStubLlm
+    from zero_touch_cx.tools import bigquery_tools
+    from agent import root_agent
+
+    client = FakeBigQueryClient(latencies.bigquery_s, report_rows)
+    tools.get_bigquery_client = lambda: client
+    bigquery_tools._bq_client = client
+
+    FakeStorageClient.latency_s = latencies.gcs_s
+    storage.Client = FakeStorageClient
+
+    model = LocalStubLlm(latency_s=latencies.model_s)
+    for agent in _agents(root_agent):
+        agent.model = model
+    return client
@@ -0,0 +1,239 @@
+"""Micro-benchmarks for the hot functions, with per-function regression checks.
+
+    PYTHONPATH=.:zero_touch_cx python -m benchmarks.run                  # compare with baselines.json
+    PYTHONPATH=.:zero_touch_cx python -m benchmarks.run --scale 10       # 10x larger synthetic data
+    PYTHONPATH=.:zero_touch_cx python -m benchmarks.run --only mask_pii rag_search
+    PYTHONPATH=.:zero_touch_cx python -m benchmarks.run --update-baseline
+
+Each benchmark builds its inputs from benchmarks/synthetic.py, then times the
+best of ``--repeat`` runs and reports microseconds per call. A function whose
+time per call exceeds its stored baseline by more than ``--tolerance`` is
+reported as REGRESSED and the command exits non-zero. Baselines are only
+comparable at the scale they were recorded with, and on similar hardware.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from contextlib import ExitStack
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable
+from unittest import mock
+
+from benchmarks import synthetic
+
+BASELINE_PATH = Path(__file__).with_name("baselines.json")
+
+
+@dataclass
+class Context:
+    scale: float
+    seed: int
+    tmp: Path
+    patches: ExitStack
+
+    def n(self, base: int) -> int:
+        return max(1, int(base * self.scale))
+
+    def patch(self, target, attr: str, value) -> None:
+        self.patches.enter_context(mock.patch.object(target, attr, value))
+
+
+# name -> setup(ctx) returning (run, calls_per_run)
+BENCHMARKS: dict[str, Callable[[Context], tuple[Callable[[], object], int]]] = {}
+
+
+def benchmark(name: str):
+    def register(setup):
+        BENCHMARKS[name] = setup
+        return setup
+    return register
+
+
+@benchmark("validate_and_sanitize")
+def _validate_and_sanitize(ctx: Context):
+    from zero_touch_cx.agents.compliance_agent import validate_and_sanitize
+    texts = synthetic.chat_messages(ctx.n(2000), ctx.seed)
+    return lambda: [validate_and_sanitize(t) for t in texts], len(texts)
+
+
+@benchmark("mask_pii")
+def _mask_pii(ctx: Context):
+    from zero_touch_cx.tools.dlp_tools import mask_pii
+    texts = synthetic.chat_messages(ctx.n(5000), ctx.seed)
+    return lambda: [mask_pii(t) for t in texts], len(texts)
+
+
+@benchmark("classify_intent")
+def _classify_intent(ctx: Context):
+    from zero_touch_cx.agents.intent_tools import classify_intent
+    texts = synthetic.chat_messages(ctx.n(5000), ctx.seed)
+    return lambda: [classify_intent(t) for t in texts], len(texts)
+
+
+@benchmark("check_eligibility")
+def _check_eligibility(ctx: Context):
+    from zero_touch_cx.agents.tools import check_eligibility
+    queries = synthetic.eligibility_queries(ctx.n(5000), ctx.seed)
+    return lambda: [check_eligibility(q) for q in queries], len(queries)
+
+
+@benchmark("rag_search")
+def _rag_search(ctx: Context):
+    from zero_touch_cx.tools import rag_tools
+    docs = synthetic.write_docs(ctx.tmp / "docs", ctx.n(200), seed=ctx.seed)
+    ctx.patch(rag_tools, "DOCS_DIR", docs)
+    queries = synthetic.rag_queries(ctx.n(20), ctx.seed)
+    return lambda: [rag_tools.rag_search(q) for q in queries], len(queries)
+
+
+@benchmark("mock_store.current_plan")
+def _current_plan(ctx: Context):
+    from zero_touch_cx.tools import mock_store
+    n_customers = ctx.n(1000)
+    synthetic.write_billing_history(ctx.tmp, n_customers, seed=ctx.seed)
+    ctx.patch(mock_store, "DATA_DIR", ctx.tmp)
+    customers = [f"cust_{i % n_customers:03d}" for i in range(ctx.n(50))]
+    return lambda: [mock_store.current_plan(c) for c in customers], len(customers)
+
+
+@benchmark("bar_chart")
+def _bar_chart(ctx: Context):
+    from zero_touch_cx.tools import charts
+    ctx.patch(charts, "TMP_DIR", ctx.tmp)
+    labels, values = synthetic.chart_series(ctx.n(30), ctx.seed)
+    calls = 5
+    return lambda: [charts.bar_chart("Bench", labels, values, f"bench_{i}.png") for i in range(calls)], calls
+
+
+@benchmark("root_handle")
+def _root_handle(ctx: Context):
+    from zero_touch_cx.agent import root_handle
+    from zero_touch_cx.agents.intent_tools import classify_intent
+    # The upgrade path needs the upgrade flow (prepare_upgrade); benchmark the other routes.
+    texts = [
+        t for t in synthetic.chat_messages(ctx.n(500), ctx.seed, blocked_rate=0)
+        if classify_intent(t)["intent"] != "plan_upgrade"
+    ]
+    return lambda: [root_handle(t) for t in texts], len(texts)
+
+
+def _report_card_fields(ctx: Context) -> dict:
+    from zero_touch_cx.schemas import KPI
+    return dict(
+        customer_id="cust_001", report_id="T-1004", title="Wire Status Report",
+        date_range="2025-01-01 to 2025-12-31", rationale="bench", confidence=0.9,
+        kpis=[KPI(name="pending_count", value=1), KPI(name="failed_count", value=2)],
+        rows=synthetic.report_rows(ctx.n(5000), ctx.seed),
+    )
+
+
+@benchmark("serialize_report.validated")
+def _serialize_report_validated(ctx: Context):
+    # The old path: validate the card and envelope, dump, JSON round trip, then re-encode for the response.
+    import json as stdlib_json
+    from zero_touch_cx.schemas import AgentResponse, ReportCard
+    fields = _report_card_fields(ctx)
+
+    def run():
+        card = ReportCard(**fields).model_dump(exclude_none=True)
+        resp = stdlib_json.loads(AgentResponse(summary="ready", payload=card).model_dump_json())
+        return stdlib_json.dumps(resp, default=str).encode()
+    return run, 1
+
+
+@benchmark("serialize_report.trusted")
+def _serialize_report_trusted(ctx: Context):
+    # Current path: rows attached unvalidated, envelope via trusted_dict, one dumps().
+    from zero_touch_cx.schemas import AgentResponse, ReportCard
+    from zero_touch_cx.serialization import dumps, trusted_dict
+    fields = _report_card_fields(ctx)
+    rows = fields.pop("rows")
+
+    def run():
+        card = ReportCard(**fields).model_dump(exclude_none=True)
+        card["rows"] = rows
+        return dumps(trusted_dict(AgentResponse, summary="ready", payload=card))
+    return run, 1
+
+
+def run_benchmark(name: str, scale: float = 1.0, repeat: int = 5, seed: int = 0) -> float:
+    """Best-of-``repeat`` microseconds per call for one benchmark."""
+    with ExitStack() as patches, tempfile.TemporaryDirectory(prefix="zt-bench-") as tmp:
+        ctx = Context(scale=scale, seed=seed, tmp=Path(tmp), patches=patches)
+        run, calls = BENCHMARKS[name](ctx)
+        run()  # warm caches, lazy imports and first-use setup
+        best = float("inf")
+        for _ in range(repeat):
+            started = time.perf_counter()
+            run()
+            best = min(best, time.perf_counter() - started)
+        return best / calls * 1e6
+
+
+def compare(results: dict[str, float], baseline: dict[str, float], tolerance: float) -> dict[str, str]:
+    """Per-function verdict: ok / REGRESSED / improved / new."""
+    verdicts = {}
+    for name, us in results.items():
+        base = baseline.get(name)
+        if base is None:
+            verdicts[name] = "new"
+        elif us > base * (1 + tolerance):
+            verdicts[name] = "REGRESSED"
+        elif us < base / (1 + tolerance):
+            verdicts[name] = "improved"
+        else:
+            verdicts[name] = "ok"
+    return verdicts
+
+
+def load_baseline(path: Path, scale: float) -> dict[str, float]:
+    if not path.exists():
+        return {}
+    stored = json.loads(path.read_text(encoding="utf-8"))
+    if stored.get("scale") != scale:
+        print(f"baseline recorded at scale {stored.get('scale')}, not {scale}; skipping comparison")
+        return {}
+    return stored["us_per_call"]
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Hot-path micro-benchmarks")
+    parser.add_argument("--only", nargs="*", choices=sorted(BENCHMARKS), help="subset to run")
+    parser.add_argument("--scale", type=float, default=1.0, help="synthetic data size multiplier")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown vs baseline")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--update-baseline", action="store_true", help="store these results as the baseline")
+    args = parser.parse_args(argv)
+
+    names = args.only or list(BENCHMARKS)
+    baseline = load_baseline(args.baseline, args.scale)
+    results = {}
+    for name in names:
+        results[name] = run_benchmark(name, args.scale, args.repeat, args.seed)
+    verdicts = compare(results, baseline, args.tolerance)
+
+    print(f"{'benchmark':<26}{'us/call':>12}{'baseline':>12}{'ratio':>8}  verdict")
+    for name in names:
+        base = baseline.get(name)
+        ratio = f"{results[name] / base:.2f}" if base else "-"
+        base_s = f"{base:.1f}" if base else "-"
+        print(f"{name:<26}{results[name]:>12.1f}{base_s:>12}{ratio:>8}  {verdicts[name]}")
+
+    if args.update_baseline:
+        stored = {"scale": args.scale, "us_per_call": {**baseline, **{k: round(v, 2) for k, v in results.items()}}}
+        args.baseline.write_text(json.dumps(stored, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+        print(f"baseline written to {args.baseline}")
+        return 0
+    return 1 if "REGRESSED" in verdicts.values() else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,121 @@
+"""Seeded synthetic data for the benchmarks.
+
+Every generator takes an explicit ``seed`` so runs are reproducible, and a size
+argument so the same benchmark can be pointed at toy or production-sized data.
+"""
+
+from __future__ import annotations
+
+import random
+from datetime import date, timedelta
+from pathlib import Path
+
+from zero_touch_cx.agents.tools import Customer, FEATURE_SYNONYMS
+
+PLANS = ["Basic", "Starter", "Pro", "Max"]
+
+_CHAT_TEMPLATES = [
+    "Show my billing for {cust}",
+    "billing summary {cust} this month",
+    "send the wire status report for {cust} last {days} days",
+    "can I get the report for the last {days} days",
+    "upgrade {cust} to {plan}",
+    "what plan am I on, I want to upgrade",
+    "need the report and an upgrade to {plan}",
+    "what is the weather today",
+    "reach me at {email} about the billing for {cust}",
+    "call {phone} regarding the report for {cust}",
+]
+_BLOCKED_TEMPLATES = [
+    "my password is hunter{days}, show billing",
+    "card 4111111111111111 for {cust}",
+    "ssn 123-45-{digits} please update",
+]
+_WORDS = (
+    "wire report balance plan upgrade billing statement feature policy image detail "
+    "payment deposit intraday account notification portal api export limit customer "
+    "gold silver bronze pro starter basic max monthly daily history schedule"
+).split()
+
+
+def customer_id(rng: random.Random, n_customers: int = 1000) -> str:
+    return f"cust_{rng.randrange(n_customers):03d}"
+
+
+def chat_messages(n: int, seed: int = 0, blocked_rate: float = 0.1) -> list[str]:
+    """Mixed chat traffic: billing/report/upgrade/other, with PII and policy violations."""
+    rng = random.Random(seed)
+    out = []
+    for _ in range(n):
+        templates = _BLOCKED_TEMPLATES if rng.random() < blocked_rate else _CHAT_TEMPLATES
+        out.append(
+            rng.choice(templates).format(
+                cust=customer_id(rng),
+                days=rng.choice([7, 30, 60, 90]),
+                plan=rng.choice(PLANS).lower(),
+                email=f"user{rng.randrange(10_000)}@example.com",
+                phone=f"+1 555 {rng.randrange(1000):03d} {rng.randrange(10_000):04d}",
+                digits=f"{rng.randrange(10_000):04d}",
+            )
+        )
+    return out
+
+
+def eligibility_queries(n: int, seed: int = 0) -> list[str]:
+    """Queries naming a known customer and a feature phrase (check_eligibility input)."""
+    rng = random.Random(seed)
+    customers = list(Customer)
+    phrases = [p for ps in FEATURE_SYNONYMS.values() for p in ps] + ["something unknown"]
+    return [f"{rng.choice(customers)} wants the {rng.choice(phrases)} for today" for _ in range(n)]
+
+
+def write_billing_history(directory: Path, n_customers: int, changes: int = 3, seed: int = 0) -> Path:
+    """billing_history.csv with ``changes`` plan periods per customer, rows shuffled."""
+    rng = random.Random(seed)
+    rows = []
+    for c in range(n_customers):
+        start = date(2024, 1, 1)
+        for _ in range(changes):
+            start += timedelta(days=rng.randrange(30, 200))
+            plan = rng.choice(PLANS)
+            rows.append(f"cust_{c:03d},{plan},{start.isoformat()},{PLANS.index(plan) * 19}")
+    rng.shuffle(rows)
+    path = Path(directory) / "billing_history.csv"
+    path.write_text("customer_id,plan,start_date,mrr_usd\n" + "\n".join(rows) + "\n", encoding="utf-8")
+    return path
+
+
+def write_docs(directory: Path, n_docs: int, words_per_doc: int = 400, seed: int = 0) -> Path:
+    """A corpus of markdown docs for the mock rag_search."""
+    rng = random.Random(seed)
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    for i in range(n_docs):
+        body = " ".join(rng.choice(_WORDS) for _ in range(words_per_doc))
+        (directory / f"doc_{i:05d}.md").write_text(f"# Doc {i}\n\n{body}\n", encoding="utf-8")
+    return directory
+
+
+def rag_queries(n: int, seed: int = 0, words: int = 4) -> list[str]:
+    rng = random.Random(seed)
+    return [" ".join(rng.choice(_WORDS) for _ in range(words)) for _ in range(n)]
+
+
+def chart_series(n_labels: int, seed: int = 0) -> tuple[list[str], list[float]]:
+    rng = random.Random(seed)
+    return [f"d{i}" for i in range(n_labels)], [rng.uniform(0, 100) for _ in range(n_labels)]
+
+
+def report_rows(n: int, seed: int = 0, n_customers: int = 1000) -> list[dict]:
+    """Wire status event rows as the report tools return them."""
+    rng = random.Random(seed)
+    start = date(2025, 1, 1)
+    return [
+        {
+            "customer_id": customer_id(rng, n_customers),
+            "report_id": rng.choice(["T-1004", "T-2001"]),
+            "run_ts": f"{start + timedelta(days=rng.randrange(365))}T{rng.randrange(24):02d}:00:00",
+            "status": rng.choice(["PENDING", "COMPLETED", "FAILED"]),
+        }
+        for _ in range(n)
+    ]
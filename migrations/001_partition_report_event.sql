@@ -0,0 +1,16 @@
+-- Day-partition report_event on run_ts and cluster it by customer and status, so the
+-- report queries (tools/query_builder.py) scan only the days and customer they ask for.
+-- BigQuery cannot change partitioning in place: copy into a new table, then swap names.
+-- The old table is kept as report_event_unpartitioned until it is dropped by hand.
+
+CREATE TABLE IF NOT EXISTS `ccibt-hack25ww7-704.client_report_data.report_event_partitioned`
+PARTITION BY DATE(run_ts)
+CLUSTER BY CustomerID, status
+OPTIONS (require_partition_filter = TRUE)
+AS SELECT * FROM `ccibt-hack25ww7-704.client_report_data.report_event`;
+
+ALTER TABLE `ccibt-hack25ww7-704.client_report_data.report_event`
+  RENAME TO report_event_unpartitioned;
+
+ALTER TABLE `ccibt-hack25ww7-704.client_report_data.report_event_partitioned`
+  RENAME TO report_event;
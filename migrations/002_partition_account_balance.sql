@@ -0,0 +1,14 @@
+-- Day-partition AccountBalance on TransactionTS and cluster it by customer.
+-- get_intraday_balance sums a customer's whole history, so no partition filter is
+-- required; clustering on CustomerID is what limits its scan.
+
+CREATE TABLE IF NOT EXISTS `ccibt-hack25ww7-704.client_report_data.AccountBalance_partitioned`
+PARTITION BY DATE(TransactionTS)
+CLUSTER BY CustomerID
+AS SELECT * FROM `ccibt-hack25ww7-704.client_report_data.AccountBalance`;
+
+ALTER TABLE `ccibt-hack25ww7-704.client_report_data.AccountBalance`
+  RENAME TO AccountBalance_unpartitioned;
+
+ALTER TABLE `ccibt-hack25ww7-704.client_report_data.AccountBalance_partitioned`
+  RENAME TO AccountBalance;
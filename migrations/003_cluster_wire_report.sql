@@ -0,0 +1,12 @@
+-- Cluster wire_report by (report_id, SenderName), the key of every point lookup
+-- (tools/wire_reports.py), so a lookup reads a few blocks instead of the whole table.
+
+CREATE TABLE IF NOT EXISTS `ccibt-hack25ww7-704.client_report_data.wire_report_clustered`
+CLUSTER BY report_id, SenderName
+AS SELECT * FROM `ccibt-hack25ww7-704.client_report_data.wire_report`;
+
+ALTER TABLE `ccibt-hack25ww7-704.client_report_data.wire_report`
+  RENAME TO wire_report_unclustered;
+
+ALTER TABLE `ccibt-hack25ww7-704.client_report_data.wire_report_clustered`
+  RENAME TO wire_report;
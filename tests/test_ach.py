@@ -0,0 +1,120 @@
+import dataclasses
+
+from zero_touch_cx.agents import tools
+from zero_touch_cx.tools import ach
+from zero_touch_cx.tools.ach import PendingAchIndex, verify_file
+
+
+def _entry(code, routing, account, cents, trace):
+    return f"6{code}{routing}1{account:<17}{cents:010d}{'':15}{'RECEIVER':<22}  0{trace:015d}"
+
+
+def _batch(number, entries, svc="200"):
+    """entries: (code, routing, account, cents)."""
+    records = [f"5{svc}{'ACME PAYROLL':<16}{'':20}{'1234567890'}PPD{'PAYROLL':<10}{'':6}250303{'':3}1{'09100001'}{number:07d}"]
+    debit = credit = hashed = 0
+    for i, (code, routing, account, cents) in enumerate(entries):
+        records.append(_entry(code, routing, account, cents, number * 10_000 + i))
+        hashed += int(routing)
+        if code[1] in "6789":
+            debit += cents
+        else:
+            credit += cents
+    records.append(
+        f"8{svc}{len(entries):06d}{hashed % 10**10:010d}{debit:012d}{credit:012d}{'1234567890'}{'':19}{'':6}{'09100001'}{number:07d}"
+    )
+    return records, (len(entries), hashed, debit, credit)
+
+
+def _file(batches, tamper=None):
+    records, totals = ["1" + " " * 93], [0, 0, 0, 0]
+    for number, entries in enumerate(batches, 1):
+        batch, sums = _batch(number, entries)
+        if tamper == number:
+            batch[-1] = batch[-1][:20] + f"{int(batch[-1][20:32]) + 1:012d}" + batch[-1][32:]
+        records += batch
+        totals = [a + b for a, b in zip(totals, sums)]
+    blocks = -(-(len(records) + 1) // 10)
+    count, hashed, debit, credit = totals
+    records.append(f"9{len(batches):06d}{blocks:06d}{count:08d}{hashed % 10**10:010d}{debit:012d}{credit:012d}{'':39}")
+    records += ["9" * 94] * (blocks * 10 - len(records))
+    assert all(len(r) == 94 for r in records)
+    return records
+
+
+def _entries(n, base=0):
+    return [("27" if i % 2 else "22", f"{91000019 + i:08d}", f"000{base + i:010d}", 100 + i) for i in range(n)]
+
+
+INDEX = PendingAchIndex([{"account_suffix": "8294", "amount": "41527.93", "verification_status": "APPROVED"}])
+
+
+def test_valid_file_matches_pending_entries(tmp_path):
+    batches = [_entries(300, base=b * 1000) for b in range(5)] + [[("27", "09100001", "55558294", 4152793)]]
+    path = tmp_path / "payroll.ach"
+    path.write_text("\n".join(_file(batches)) + "\n")
+
+    report = verify_file(path, INDEX, workers=1)
+    assert report["status"] == "VALID", report["errors"]
+    assert report["batches"] == 6 and report["entries"] == 1501
+    assert [m["account_suffix"] for m in report["matched_pending"]] == ["8294"]
+    assert report["unmatched_entries"] == 1500 and len(report["unmatched_sample"]) == ach.SAMPLE_SIZE
+
+
+def test_blocked_file_in_process_pool_reports_bad_totals(tmp_path):
+    path = tmp_path / "blocked.ach"
+    path.write_text("".join(_file([_entries(50), _entries(50, 500), _entries(50, 900)], tamper=2)))
+
+    serial = verify_file(path, INDEX, workers=1)
+    parallel = verify_file(path, INDEX, workers=2)
+    ach.shutdown_ach_pool()
+    assert parallel == serial
+    assert parallel["status"] == "INVALID"
+    assert [e.split(" is ")[0] for e in parallel["errors"]] == ["batch 2: total debit"]
+
+
+def test_file_control_mismatch(tmp_path):
+    records = _file([_entries(10)])
+    control = next(i for i, r in enumerate(records) if r.startswith("9") and r != "9" * 94)
+    records[control] = records[control][:13] + "00000011" + records[control][21:]
+    path = tmp_path / "count.ach"
+    path.write_text("\n".join(records))
+    assert verify_file(path, INDEX, workers=1)["errors"] == ["file control: entry/addenda count is 11, batches add up to 10"]
+
+
+def test_truncated_file(tmp_path):
+    path = tmp_path / "short.ach"
+    path.write_text("\n".join(_file([_entries(3)])[:4]))
+    errors = verify_file(path, INDEX, workers=1)["errors"]
+    assert "batch 1: no batch control" in errors and "no file control record" in errors
+
+
+def test_return_entries_count_towards_the_batch_totals(tmp_path):
+    returns = [("21", "09100001", "000123", 1000), ("26", "09100001", "000124", 250), ("22", "09100001", "000125", 75)]
+    path = tmp_path / "returns.ach"
+    path.write_text("\n".join(_file([returns])))
+    report = verify_file(path, INDEX, workers=1)
+    assert report["status"] == "VALID", report["errors"]
+    assert report["entries"] == 3
+
+
+def test_bulk_tool_only_reads_the_ach_inbox(monkeypatch, tmp_path):
+    inbox = tmp_path / "inbox"
+    inbox.mkdir()
+    (inbox / "payroll.ach").write_text("\n".join(_file([_entries(3)])))
+    (tmp_path / "secret.txt").write_text("not an ach file")
+    monkeypatch.setattr(tools, "settings", dataclasses.replace(tools.settings, ach_inbox_path=str(inbox)))
+
+    assert tools.verify_ach_bulk_file("payroll.ach")["status"] == "VALID"
+    assert tools.verify_ach_bulk_file("../secret.txt")["status"] == "REJECTED"
+    assert tools.verify_ach_bulk_file(str(tmp_path / "secret.txt"))["status"] == "REJECTED"
+    assert tools.verify_ach_bulk_file("missing.ach")["status"] == "NOT_FOUND"
+
+
+def test_single_entry_keeps_response_shape():
+    approved = tools.verify_ach_file("8294", 41527.93)
+    assert approved["verification_status"] == "APPROVED"
+    assert "(03/03/2025)" in approved["next_action"]
+    review = tools.verify_ach_file("8294", 41527.94)
+    assert review["verification_status"] == "PENDING_REVIEW"
+    assert set(approved) == set(review) == {"verification_status", "account_suffix", "amount", "next_action", "source"}
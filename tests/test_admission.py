@@ -0,0 +1,162 @@
+import asyncio
+import dataclasses
+
+from fastapi.testclient import TestClient
+
+from zero_touch_cx import admission
+from zero_touch_cx.admission import AdmissionController, Shed, TokenBucket, classify_tool
+
+
+def _settings(monkeypatch, **overrides):
+    monkeypatch.setattr(admission, "settings", dataclasses.replace(admission.settings, **overrides))
+    monkeypatch.setattr(admission, "_controller", None)
+
+
+def test_token_bucket_refills_at_rate():
+    bucket = TokenBucket(rate=2, burst=2)
+    now = bucket.updated
+    assert bucket.take(now) == 0 and bucket.take(now) == 0
+    assert bucket.take(now) == 0.5
+    assert bucket.take(now + 0.5) == 0
+    assert bucket.take(now + 1.5, n=5) == 0 and bucket.tokens == -3  # a batch from a full bucket leaves debt
+    assert bucket.take(now + 2.5) == 1.0
+
+
+def test_requests_are_classified_into_lanes():
+    assert classify_tool("intraday balance for cust_002") == "balance"
+    assert classify_tool("wire status report for last 90 days") == "wire_report"
+    assert classify_tool("show billing") == "billing"
+
+
+def test_customer_and_tool_buckets(monkeypatch):
+    _settings(monkeypatch, admission_customer_rate_per_s=0.001, admission_customer_burst=2,
+              admission_tool_rates="wire_report=0.001/3")
+    controller = AdmissionController()
+    controller.check_rates("cust_001", "balance")
+    controller.check_rates("cust_001", "wire_report")
+    try:
+        controller.check_rates("cust_001", "balance")
+        raise AssertionError("flooding customer was admitted")
+    except Shed as shed:
+        assert shed.reason == "customer_rate" and shed.retry_after_s > 0
+
+    controller.check_rates("cust_002", "wire_report")
+    controller.check_rates("cust_003", "wire_report")
+    try:
+        controller.check_rates("cust_004", "wire_report")
+        raise AssertionError("tool budget exceeded")
+    except Shed as shed:
+        assert shed.reason == "tool_rate"
+    controller.check_rates("cust_004", "balance")  # the refused report did not use up cust_004's token
+    controller.check_rates("cust_004", "balance")
+    assert controller.stats()["shed"] == {"customer_rate": 1, "tool_rate": 1}
+
+
+def test_priority_lanes_and_queue_shedding(monkeypatch):
+    _settings(monkeypatch, admission_queue_timeout_s=1.0)
+
+    async def run():
+        controller = AdmissionController(max_inflight=1, max_queued=2)
+        order = []
+
+        async def request(tool):
+            try:
+                await controller.acquire(tool)
+            except Shed as shed:
+                order.append((tool, shed.reason))
+                return
+            order.append(tool)
+            await asyncio.sleep(0.01)
+            controller.release()
+
+        await controller.acquire("other")  # hold the only slot
+        tasks = [asyncio.create_task(request(t)) for t in ("wire_report", "wire_report", "balance")]
+        await asyncio.sleep(0.01)
+        assert controller.stats()["queued_by_lane"] == {0: 1, 2: 1}
+        controller.release()
+        await asyncio.gather(*tasks)
+        return order, controller.stats()
+
+    order, stats = asyncio.run(run())
+    assert order == [("wire_report", "queue_full"), "balance", "wire_report"]
+    assert stats["in_flight"] == 0 and stats["shed"] == {"queue_full": 1}
+
+
+def test_shed_requests_get_their_tokens_back(monkeypatch):
+    _settings(monkeypatch, admission_queue_timeout_s=0.01, admission_customer_rate_per_s=0.001,
+              admission_customer_burst=2, admission_tool_rates="wire_report=0.001/2")
+
+    async def run():
+        controller = AdmissionController(max_inflight=1, max_queued=1)
+        await controller.acquire("other")  # hold the only slot
+        for _ in range(2):
+            try:
+                async with controller.admit("wire status report for last 90 days", "10.0.0.1"):
+                    raise AssertionError("admitted without a free slot")
+            except Shed as shed:
+                assert shed.reason == "queue_timeout"
+        return controller
+
+    controller = asyncio.run(run())
+    assert controller.clients.get("10.0.0.1").tokens == 2
+    assert controller.stats()["tool_tokens"]["wire_report"] == 2
+
+
+def test_chat_sheds_with_agent_response(monkeypatch):
+    _settings(monkeypatch, admission_customer_rate_per_s=0.001, admission_customer_burst=1)
+    from app.main import app
+
+    with TestClient(app, client=("10.0.0.1", 50000)) as client:
+        first = client.post("/chat", json={"text": "billing for cust_009"}, headers={"X-Customer-Id": "flooder"})
+        # Rotating the customer in the header or the text does not get a fresh bucket.
+        shed = client.post("/chat", json={"text": "billing for cust_008"}, headers={"X-Customer-Id": "rotated"})
+        other = TestClient(app, client=("10.0.0.2", 50000)).post("/chat", json={"text": "billing for cust_009"})
+        metrics = client.get("/metrics").json()
+
+    assert first.status_code == 200 and other.status_code == 200
+    assert shed.status_code == 429 and int(shed.headers["retry-after"]) >= 1
+    payload = shed.json()["payload"]
+    assert (payload["type"], payload["reason"], payload["tool"]) == ("shed", "customer_rate", "billing")
+    assert metrics["admission"]["shed"] == {"customer_rate": 1}
+    assert metrics["admission"]["admitted"] == 2
+
+
+def test_batch_takes_one_token_per_message(monkeypatch):
+    _settings(monkeypatch, admission_customer_rate_per_s=0.001, admission_customer_burst=3)
+    from app.main import app
+
+    with TestClient(app, client=("10.0.0.3", 50000)) as client:
+        first = client.post("/chat/batch", json={"texts": ["billing for cust_001", "billing for cust_002"]})
+        shed = client.post("/chat/batch", json={"texts": ["billing for cust_001", "billing for cust_002"]})
+
+    assert first.status_code == 200 and len(first.text.splitlines()) == 2
+    assert shed.status_code == 429 and int(shed.headers["retry-after"]) >= 1
+    assert shed.json()["payload"]["reason"] == "customer_rate"
+
+
+def test_batch_empties_but_never_owes_a_tool_bucket(monkeypatch):
+    _settings(monkeypatch, admission_customer_rate_per_s=1, admission_customer_burst=10,
+              admission_tool_rates="wire_report=10/20")
+    controller = AdmissionController()
+    controller.check_batch(["wire status report for cust_001"] * 500, "10.0.0.4")
+    assert controller.tools["wire_report"].tokens == 0
+    assert controller.clients.get("10.0.0.4").tokens < -400  # the batch's own client pays it back
+
+    try:
+        controller.check_rates("10.0.0.5", "wire_report")
+        raise AssertionError("tool bucket was not emptied")
+    except Shed as shed:
+        assert shed.reason == "tool_rate" and shed.retry_after_s <= 0.1
+
+
+def test_shed_stream_is_rejected_before_it_opens(monkeypatch):
+    _settings(monkeypatch, admission_customer_rate_per_s=0.001, admission_customer_burst=1)
+    from app.main import app
+
+    with TestClient(app, client=("10.0.0.6", 50000)) as client:
+        first = client.post("/chat/stream", json={"text": "show billing for cust_001"})
+        shed = client.post("/chat/stream", json={"text": "show billing for cust_001"})
+
+    assert first.status_code == 200 and first.text.startswith("event: summary")
+    assert shed.status_code == 429 and int(shed.headers["retry-after"]) >= 1
+    assert shed.json()["payload"]["type"] == "shed"
@@ -0,0 +1,55 @@
+import asyncio
+import dataclasses
+import time
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+import agent
+
+
+def test_chat_runs_compliance_first():
+    with TestClient(app) as client:
+        blocked = client.post("/chat", json={"text": "my password is hunter2, show billing"}).json()
+        allowed = client.post("/chat", json={"text": "Show my billing for cust_001"}).json()
+    assert blocked["payload"]["type"] == "compliance_block"
+    assert allowed["payload"]["compliance"]["allow"] is True
+
+
+def test_slow_requests_time_out_without_blocking_others(monkeypatch):
+    def slow_root_handle(text, intent_info=None):
+        time.sleep(0.5)
+        return {"summary": "late", "payload": {}}
+
+    monkeypatch.setattr(agent, "root_handle", slow_root_handle)
+    monkeypatch.setattr(agent, "settings", dataclasses.replace(agent.settings, request_timeout_s=0.1))
+
+    async def run():
+        return await asyncio.gather(*(agent.compliance_gate_async("billing for cust_001") for _ in range(8)))
+
+    started = time.perf_counter()
+    results = asyncio.run(run())
+    assert time.perf_counter() - started < 0.5
+    assert all(r["payload"]["type"] == "timeout" and r["handoff_required"] for r in results)
+
+
+def test_timed_out_request_keeps_its_slot_until_the_job_ends(monkeypatch):
+    from zero_touch_cx import admission
+
+    def slow_root_handle(text, intent_info=None):
+        time.sleep(0.3)
+        return {"summary": "late", "payload": {}}
+
+    monkeypatch.setattr(agent, "root_handle", slow_root_handle)
+    monkeypatch.setattr(agent, "settings", dataclasses.replace(agent.settings, request_timeout_s=0.05))
+    monkeypatch.setattr(admission, "_controller", None)
+
+    async def run():
+        response = await agent.compliance_gate_async("billing for cust_001")
+        held = admission.admission_stats()["in_flight"]
+        await asyncio.sleep(0.4)
+        return response, held, admission.admission_stats()["in_flight"]
+
+    response, held, after = asyncio.run(run())
+    assert response["payload"]["type"] == "timeout"
+    assert (held, after) == (1, 0)
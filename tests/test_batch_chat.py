@@ -0,0 +1,60 @@
+import json
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+import agent
+
+
+def test_batch_groups_domain_calls_and_keeps_input_order(monkeypatch):
+    calls = []
+
+    def fake_fetch(intent, customer_id, arg, user_text):
+        calls.append((intent, customer_id, arg))
+        return {"billing": {"customer_id": customer_id}}
+
+    monkeypatch.setattr(agent, "_fetch_payload", fake_fetch)
+    texts = [
+        "billing for cust_001",
+        "my password is 123, billing please",
+        "Show billing cust_002",
+        "what is the weather",
+        "billing summary cust_001",
+    ]
+    with TestClient(app) as client:
+        resp = client.post("/chat/batch", json={"texts": texts})
+    lines = [json.loads(line) for line in resp.text.splitlines()]
+
+    assert [line["index"] for line in lines] == list(range(len(texts)))
+    assert lines[0]["payload"]["billing"]["customer_id"] == "cust_001"
+    assert lines[1]["payload"]["type"] == "compliance_block"
+    assert lines[2]["payload"]["billing"]["customer_id"] == "cust_002"
+    assert lines[3]["payload"]["type"] == "compliance_block"
+    assert lines[4]["payload"]["compliance"]["allow"] is True
+    assert sorted(calls) == [("billing_inquiry", "cust_001", None), ("billing_inquiry", "cust_002", None)]
+
+
+def test_batch_api_matches_single_message_path():
+    texts = ["billing for cust_001", "Upgrade to pro and send a report"]
+    batch = [r["data"] for r in agent.handle_user_inputs(texts)]
+    single = [agent.handle_user_input(t)["data"] for t in texts]
+    assert batch == single
+
+
+def test_reports_asking_for_rows_are_not_grouped_with_plain_ones(monkeypatch):
+    calls = []
+
+    def fake_fetch(intent, customer_id, arg, user_text):
+        calls.append(user_text)
+        return {"kind": "report_card", "rows": [] if "raw rows" in user_text else None}
+
+    monkeypatch.setattr(agent, "_fetch_payload", fake_fetch)
+    texts = [
+        "wire status report for cust_001 last 30 days",
+        "wire status report for cust_001 last 30 days, send the raw rows",
+        "wire status report for cust_001 last 30 days",
+    ]
+    responses = list(agent.compliance_gate_batch(texts))
+
+    assert sorted(calls) == sorted(texts[:2])
+    assert [r["payload"]["rows"] for r in responses] == [None, [], None]
@@ -0,0 +1,18 @@
+from benchmarks.run import BENCHMARKS, compare, run_benchmark
+
+
+def test_compare_flags_regressions_per_function():
+    baseline = {"mask_pii": 10.0, "rag_search": 100.0, "bar_chart": 50.0}
+    results = {"mask_pii": 14.0, "rag_search": 101.0, "bar_chart": 20.0, "root_handle": 5.0}
+    assert compare(results, baseline, tolerance=0.25) == {
+        "mask_pii": "REGRESSED",
+        "rag_search": "ok",
+        "bar_chart": "improved",
+        "root_handle": "new",
+    }
+
+
+def test_benchmarks_run_at_small_scale():
+    for name in ("validate_and_sanitize", "check_eligibility", "rag_search", "mock_store.current_plan"):
+        assert name in BENCHMARKS
+        assert run_benchmark(name, scale=0.02, repeat=1) > 0
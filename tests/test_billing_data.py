@@ -0,0 +1,61 @@
+from datetime import date
+
+import pytest
+
+from zero_touch_cx.tools.billing_data import CsvBillingSource, MonthToDateCache
+
+
+@pytest.fixture
+def source(tmp_path):
+    path = tmp_path / "billing_history.csv"
+    path.write_text(
+        "customer_id,plan,start_date,mrr_usd\n"
+        "cust_001,Basic,2025-01-01,0\n"
+        "cust_001,Pro,2026-03-11,31\n"
+        "cust_001,Starter,2025-06-01,62\n"
+        "cust_002,Max,2026-02-01,199\n"
+    )
+    return CsvBillingSource(path)
+
+
+def test_line_items_prorate_plan_changes_within_the_month(source):
+    lines = source.line_items("cust_001", date(2026, 3, 1), date(2026, 3, 20))
+    assert [(l["plan"], l["days"], round(l["amount"], 2)) for l in lines] == [("Starter", 10, 20.0), ("Pro", 10, 10.0)]
+    assert source.line_items("cust_003", date(2026, 3, 1), date(2026, 3, 20)) == []
+
+
+def test_month_to_date_only_queries_new_days(source):
+    calls = []
+    original = source.line_items
+
+    def counting(customer_id, start, end):
+        calls.append((start, end))
+        return original(customer_id, start, end)
+
+    source.line_items = counting
+    cache = MonthToDateCache(source, maxsize=8, ttl_s=None)
+
+    first = cache.month_to_date("cust_001", date(2026, 3, 15), today=date(2026, 3, 15))
+    second = cache.month_to_date("cust_001", date(2026, 3, 20), today=date(2026, 3, 20))
+    assert calls == [
+        (date(2026, 3, 1), date(2026, 3, 14)),
+        (date(2026, 3, 15), date(2026, 3, 15)),
+        (date(2026, 3, 15), date(2026, 3, 19)),
+        (date(2026, 3, 20), date(2026, 3, 20)),
+    ]
+    assert sum(l["days"] for l in first["lines"]) == 15
+    assert second["lines"] == original("cust_001", date(2026, 3, 1), date(2026, 3, 20))
+
+
+def test_shorter_range_after_a_longer_one_is_cut_back(source):
+    cache = MonthToDateCache(source, maxsize=8, ttl_s=None)
+    cache.month_to_date("cust_001", date(2026, 3, 20), today=date(2026, 3, 25))
+
+    for end in (date(2026, 3, 5), date(2026, 3, 12)):
+        lines = cache.month_to_date("cust_001", end, today=date(2026, 3, 25))["lines"]
+        expected = source.line_items("cust_001", date(2026, 3, 1), end)
+        assert [(l["plan"], l["to_date"], l["days"]) for l in lines] == [
+            (l["plan"], l["to_date"], l["days"]) for l in expected
+        ]
+        assert sum(l["amount"] for l in lines) == pytest.approx(sum(l["amount"] for l in expected))
+    assert cache.stats()["queried_days"] == 20
@@ -0,0 +1,94 @@
+import dataclasses
+from urllib.parse import parse_qs, urlsplit
+
+from fastapi.testclient import TestClient
+
+from zero_touch_cx.agents import tools
+from zero_touch_cx.tools import doc_store
+from zero_touch_cx.tools.doc_store import DocStore
+
+PDF = b"%PDF-1.7\n" + bytes(range(256)) * 40
+
+
+def _use_store(monkeypatch, root):
+    patched = dataclasses.replace(doc_store.settings, doc_store_path=str(root), doc_link_secret="test-secret")
+    monkeypatch.setattr(doc_store, "settings", patched)
+    monkeypatch.setattr(doc_store, "_store", None)
+    return doc_store.get_doc_store()
+
+
+def test_put_lookup_by_either_id_and_dedup(tmp_path):
+    store = DocStore(tmp_path)
+    ref = store.put(PDF, transaction_id="TX-1", check_number="1001", document_type="CHECK_IMAGE")
+    again = store.put(PDF, transaction_id="TX-2", document_type="CHECK_IMAGE")
+
+    assert ref == again and ref.content_type == "application/pdf"
+    assert store.lookup(check_number="1001", document_type="CHECK_IMAGE") == ref
+    assert store.lookup(transaction_id="TX-2", document_type="check_image") == ref
+    assert store.lookup(transaction_id="TX-1", document_type="STATEMENT") is None
+    assert store.stats()["documents"] == 3
+    assert len(list((tmp_path / "blobs").rglob("*"))) == 3  # two fan-out dirs and one blob
+
+
+def test_index_grows_and_reopens(tmp_path, monkeypatch):
+    monkeypatch.setattr(doc_store, "INITIAL_CAPACITY", 8)
+    store = DocStore(tmp_path)
+    for i in range(40):
+        store.put(f"doc {i}".encode(), transaction_id=f"TX-{i}")
+
+    stats = DocStore(tmp_path).stats()
+    assert stats["documents"] == 40 and stats["capacity"] == 64 and stats["load"] <= doc_store.MAX_LOAD
+    reopened = DocStore(tmp_path)
+    assert all(reopened.lookup(transaction_id=f"TX-{i}").size == len(f"doc {i}") for i in range(40))
+
+
+def test_range_reads(tmp_path):
+    store = DocStore(tmp_path)
+    ref = store.put(PDF, transaction_id="TX-1")
+    assert store.read_range(ref.digest, 100, 50) == PDF[100:150]
+    assert b"".join(store.iter_range(ref.digest, 10, 5000, chunk_size=512)) == PDF[10:5001]
+
+
+def test_links_are_cached_and_verified(tmp_path, monkeypatch):
+    store = _use_store(monkeypatch, tmp_path)
+    ref = store.put(PDF, check_number="891472")
+    link = store.retrieval_link(ref, "TRANSACTION_IMAGE")
+    assert store.retrieval_link(ref, "TRANSACTION_IMAGE") == link
+
+    query = {k: v[0] for k, v in parse_qs(urlsplit(link).query).items()}
+    assert store.verify_link(ref.digest, "TRANSACTION_IMAGE", int(query["expires"]), query["sig"])
+    assert not store.verify_link(ref.digest, "CHECK_IMAGE", int(query["expires"]), query["sig"])
+    assert not store.verify_link(ref.digest, "TRANSACTION_IMAGE", 1, query["sig"])
+
+
+def test_tool_and_endpoint_serve_ranges(tmp_path, monkeypatch):
+    store = _use_store(monkeypatch, tmp_path)
+    store.put(PDF, transaction_id="TX-77", document_type="STATEMENT")
+
+    result = tools.retrieve_document_copy(transaction_id="TX-77", document_type="STATEMENT")
+    assert result["status"] == "SUCCESS" and result["size_bytes"] == len(PDF)
+    assert tools.retrieve_document_copy(transaction_id="TX-78")["status"] == "NOT_FOUND"
+
+    from app.main import app
+
+    with TestClient(app) as client:
+        full = client.get(result["retrieval_link"])
+        assert full.status_code == 200 and full.content == PDF
+        assert full.headers["content-type"] == "application/pdf"
+
+        part = client.get(result["retrieval_link"], headers={"Range": "bytes=-100"})
+        assert part.status_code == 206 and part.content == PDF[-100:]
+        assert part.headers["content-range"] == f"bytes {len(PDF) - 100}-{len(PDF) - 1}/{len(PDF)}"
+
+        assert client.get(result["retrieval_link"], headers={"Range": f"bytes={len(PDF)}-"}).status_code == 416
+        assert client.get(result["retrieval_link"].replace("sig=", "sig=0")).status_code == 403
+
+
+def test_concurrent_workers_agree_on_the_link_secret(tmp_path):
+    from concurrent.futures import ThreadPoolExecutor
+
+    stores = [DocStore(tmp_path) for _ in range(16)]
+    with ThreadPoolExecutor(16) as pool:
+        secrets_seen = set(pool.map(lambda s: s._secret(), stores))
+    assert len(secrets_seen) == 1 and len(secrets_seen.pop()) == 64
+    assert [p.name for p in tmp_path.glob(".link_secret*")] == [".link_secret"]
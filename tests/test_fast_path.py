@@ -0,0 +1,56 @@
+import asyncio
+import threading
+
+from google.adk.agents.llm_agent import Agent
+from google.adk.runners import InMemoryRunner
+from google.genai import types
+
+from zero_touch_cx.agents import fast_path
+from zero_touch_cx.agents.local_model import LocalStubLlm
+
+
+def _run_turns(agent, texts):
+    runner = InMemoryRunner(agent=agent, app_name="fast_path_test")
+
+    async def run():
+        session = await runner.session_service.create_session(app_name="fast_path_test", user_id="u")
+        replies = []
+        for text in texts:
+            message = types.Content(role="user", parts=[types.Part(text=text)])
+            async for event in runner.run_async(user_id="u", session_id=session.id, new_message=message):
+                if event.content and event.content.parts and event.content.parts[0].text:
+                    replies.append(event.content.parts[0].text)
+        return replies
+
+    return asyncio.run(run())
+
+
+def test_high_confidence_requests_skip_the_model():
+    handled = []
+
+    def handler(text):
+        handled.append(text)
+        assert threading.current_thread().name.startswith("zero-touch-bigquery")  # not on the event loop
+        return {"summary": f"handled {text}"}
+
+    before, after = fast_path.fast_path_callbacks(handler, lambda r: r["summary"])
+    model = LocalStubLlm(reply="from the model")
+    agent = Agent(model=model, name="gateway", instruction="route", before_model_callback=before, after_model_callback=after)
+    stats_before = fast_path.router_stats()
+
+    replies = _run_turns(agent, ["Show my billing for cust_002", "Upgrade to pro and show a report"])
+
+    assert replies == ["handled Show my billing for cust_002", "from the model"]
+    assert handled == ["Show my billing for cust_002"]
+    assert model.calls == 1
+    stats = fast_path.router_stats()
+    assert stats["fast_path"] == stats_before["fast_path"] + 1
+    assert stats["llm"] == stats_before["llm"] + 1
+    assert stats["saved_ms"] > stats_before["saved_ms"]
+    assert len(fast_path._model_started) == 0
+
+
+def test_route_decision_requires_customer_id():
+    assert fast_path.route_decision("wire status report for cust_001") == (True, "intent=report_request")
+    assert fast_path.route_decision("wire status report") == (False, "missing_customer_id")
+    assert fast_path.route_decision("hello there") == (False, "intent=other")
@@ -0,0 +1,62 @@
+"""Import-time budget for cold starts.
+
+Runs `python -X importtime -c "import zero_touch_cx.agent"` in a fresh interpreter and
+fails when heavy dependencies sneak back into the import path or the import gets slower
+than the budget. Budgets can be tuned per machine with IMPORT_TIME_BUDGET_MS and
+IMPORT_TIME_OWN_BUDGET_MS.
+"""
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+TOTAL_BUDGET_MS = float(os.getenv("IMPORT_TIME_BUDGET_MS", "3000"))
+OWN_BUDGET_MS = float(os.getenv("IMPORT_TIME_OWN_BUDGET_MS", "150"))
+
+# Must only be imported on first use in lazy-init mode.
+DEFERRED_MODULES = [
+    "matplotlib",
+    "pandas",
+    "google.cloud.logging",
+    "google.cloud.storage",
+    "google.cloud.bigquery",
+    "google.adk.tools.bigquery",
+    "opentelemetry.exporter.cloud_trace",
+]
+
+
+def parse_importtime(stderr: str) -> dict[str, tuple[int, int]]:
+    """Map module name -> (self_us, cumulative_us) from `-X importtime` output."""
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        modules[name.strip()] = (int(self_us), int(cumulative_us))
+    return modules
+
+
+def _import_agent() -> dict[str, tuple[int, int]]:
+    env = {**os.environ, "LAZY_INIT": "true", "MOCK_MODE": "true"}
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import zero_touch_cx.agent"],
+        cwd=ROOT, env=env, capture_output=True, text=True, timeout=120,
+    )
+    assert proc.returncode == 0, proc.stderr[-2000:]
+    return parse_importtime(proc.stderr)
+
+
+def test_agent_import_defers_heavy_dependencies():
+    modules = _import_agent()
+    loaded = [m for m in DEFERRED_MODULES if m in modules]
+    assert not loaded, f"imported at agent import time: {loaded}"
+
+
+def test_agent_import_within_budget():
+    modules = _import_agent()
+    total_ms = modules["zero_touch_cx.agent"][1] / 1000
+    own_ms = sum(s for name, (s, _) in modules.items() if name.startswith("zero_touch_cx")) / 1000
+    assert total_ms <= TOTAL_BUDGET_MS, f"import took {total_ms:.0f}ms (budget {TOTAL_BUDGET_MS:.0f}ms)"
+    assert own_ms <= OWN_BUDGET_MS, f"project modules took {own_ms:.0f}ms (budget {OWN_BUDGET_MS:.0f}ms)"
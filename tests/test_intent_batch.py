@@ -0,0 +1,19 @@
+from zero_touch_cx.agents.intent_model import IntentModel, load_samples, train
+from zero_touch_cx.agents.intent_tools import classify_intent, classify_intents
+
+
+def test_rules_batch_matches_single_message_path():
+    texts, _ = load_samples()
+    texts += ["", "PLAN\nreport", "billing", "upgrade\n\nwire status", "İstanbul report"]
+    assert classify_intents(texts) == [classify_intent(t) for t in texts]
+    assert classify_intents([]) == []
+
+
+def test_model_learns_samples_and_round_trips(tmp_path):
+    texts, labels = load_samples()
+    model = train(texts, labels)
+    predicted = [p["intent"] for p in model.predict(texts)]
+    assert sum(p == l for p, l in zip(predicted, labels)) / len(labels) > 0.9
+
+    model.save(tmp_path / "intent.npz")
+    assert IntentModel.load(tmp_path / "intent.npz").predict(texts) == model.predict(texts)
@@ -0,0 +1,41 @@
+import dataclasses
+
+import pytest
+
+from benchmarks.loadtest.run import SERVER_ENV, parse_mix, percentile, stream_status, summarize
+from benchmarks.loadtest.standins import FakeBigQueryClient
+from zero_touch_cx.agents import tools
+
+
+def test_fake_bigquery_serves_report_queries(monkeypatch):
+    client = FakeBigQueryClient(latency_s=0, report_rows=7)
+    monkeypatch.setattr(tools, "get_bigquery_client", lambda: client)
+    monkeypatch.setattr(tools, "settings", dataclasses.replace(tools.settings, mock_mode=False))
+
+    counts = tools.summarize_wire_status("cust_001", "2025-01-01", "2025-01-31")
+    pages = list(tools.iter_wire_status_report_pages("cust_001", "2025-01-01", "2025-01-31", page_size=3))
+
+    assert counts["total_count"] == 7 and counts["source"] == "bigquery"
+    assert [len(p) for p in pages] == [3, 3, 1]
+    assert pages[0][0]["CustomerID"] == "cust_001"
+    assert client.queries == 2
+
+
+def test_mix_and_percentiles():
+    assert parse_mix("report=3,billing") == {"report": 3.0, "billing": 1.0}
+    with pytest.raises(ValueError):
+        parse_mix("weather=1")
+    values = [float(v) for v in range(1, 101)]
+    assert (percentile(values, 50), percentile(values, 99)) == (50.0, 99.0)
+
+    summary = summarize([("report", 200, 0.1), ("billing", 500, 0.3)], elapsed_s=2.0)
+    assert summary["all"]["requests"] == 2 and summary["all"]["errors"] == 1
+    assert summary["billing"]["statuses"] == {500: 1}
+
+
+def test_streams_that_end_in_an_error_count_as_failures():
+    ok = "event: summary\ndata: {}\n\nevent: done\ndata: {}\n\n"
+    failed = "event: summary\ndata: {}\n\nevent: error\ndata: {}\n\nevent: done\ndata: {}\n\n"
+    assert (stream_status(200, ok), stream_status(200, failed), stream_status(429, "{}")) == (200, 500, 429)
+    # Every client shares 127.0.0.1, so the server under test must not rate-limit per client.
+    assert float(SERVER_ENV["ADMISSION_CUSTOMER_RATE_PER_S"]) >= 1000 and SERVER_ENV["ADMISSION_TOOL_RATES"] == ""
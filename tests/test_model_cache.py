@@ -0,0 +1,77 @@
+import asyncio
+import dataclasses
+import time
+
+from google.adk.agents.llm_agent import Agent
+from google.adk.runners import InMemoryRunner
+from google.genai import types
+
+from zero_touch_cx.agents import model_cache
+from zero_touch_cx.agents.local_model import LocalStubLlm
+
+
+def _ask_in_new_sessions(agent, text, sessions):
+    runner = InMemoryRunner(agent=agent, app_name="model_cache_test")
+
+    async def run():
+        replies = []
+        for n in range(sessions):
+            session = await runner.session_service.create_session(app_name="model_cache_test", user_id=f"user{n}")
+            message = types.Content(role="user", parts=[types.Part(text=text)])
+            async for event in runner.run_async(user_id=f"user{n}", session_id=session.id, new_message=message):
+                if event.content and event.content.parts and event.content.parts[0].text:
+                    replies.append(event.content.parts[0].text)
+        return replies
+
+    return asyncio.run(run())
+
+
+def _agent(name, model):
+    before, after = model_cache.model_cache_callbacks(name)
+    return Agent(model=model, name=name, instruction="Answer plan questions.",
+                 before_model_callback=before, after_model_callback=after)
+
+
+def test_identical_turns_are_served_from_cache():
+    model_cache.clear_model_cache()
+    model = LocalStubLlm(reply="Pro includes scheduled reports.", latency_s=0.05)
+    stats_before = model_cache.model_cache_stats()
+
+    agent = _agent("plan_agent", model)
+    replies = _ask_in_new_sessions(agent, "What does Pro include?", sessions=1)
+    started = time.perf_counter()
+    replies += _ask_in_new_sessions(agent, "What does Pro include?", sessions=4)
+    elapsed = time.perf_counter() - started
+
+    assert replies == ["Pro includes scheduled reports."] * 5
+    assert model.calls == 1
+    assert elapsed < 0.05 * 4
+    stats = model_cache.model_cache_stats()
+    assert stats["hits"] - stats_before["hits"] == 4
+    assert stats["saved_ms"] > stats_before["saved_ms"]
+    assert len(model_cache._pending) == 0
+
+
+def test_agents_can_opt_out(monkeypatch):
+    model_cache.clear_model_cache()
+    monkeypatch.setattr(model_cache, "settings", dataclasses.replace(
+        model_cache.settings, model_cache_disabled_agents="live_agent"))
+    model = LocalStubLlm(reply="fresh")
+    _ask_in_new_sessions(_agent("live_agent", model), "What does Pro include?", sessions=3)
+    assert model.calls == 3
+
+
+def test_only_call_ids_are_ignored_in_the_key():
+    from google.adk.models.llm_request import LlmRequest
+
+    def request(call_id, account_id):
+        return LlmRequest(model="m", contents=[
+            types.Content(role="model", parts=[types.Part(function_call=types.FunctionCall(
+                id=call_id, name="get_account", args={"id": "a"}))]),
+            types.Content(role="user", parts=[types.Part(function_response=types.FunctionResponse(
+                id=call_id, name="get_account", response={"id": account_id, "balance": 10}))]),
+        ])
+
+    key = model_cache.cache_key("agent", request("call-1", "acct_1"))
+    assert model_cache.cache_key("agent", request("call-2", "acct_1")) == key
+    assert model_cache.cache_key("agent", request("call-1", "acct_2")) != key
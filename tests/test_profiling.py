@@ -0,0 +1,41 @@
+import dataclasses
+import time
+
+from zero_touch_cx import profiling
+
+
+def _busy(ms):
+    end = time.perf_counter() + ms / 1000
+    while time.perf_counter() < end:
+        pass
+
+
+def test_forced_profile_writes_folded_stacks(tmp_path, monkeypatch):
+    monkeypatch.setattr(profiling, "PROFILE_DIR", tmp_path)
+    with profiling.maybe_profile("unit", force=True) as tag:
+        _busy(50)
+    assert tag
+    files = list(tmp_path.glob(f"{tag}-unit.folded"))
+    assert len(files) == 1
+    assert "_busy" in files[0].read_text()
+
+
+def test_nested_entry_points_profile_once(tmp_path, monkeypatch):
+    monkeypatch.setattr(profiling, "PROFILE_DIR", tmp_path)
+    with profiling.maybe_profile("outer", force=True):
+        with profiling.maybe_profile("inner", force=True) as inner:
+            _busy(10)
+    assert inner is None
+    assert len(list(tmp_path.iterdir())) == 1
+
+
+def test_not_profiled_by_default_and_old_files_pruned(tmp_path, monkeypatch):
+    monkeypatch.setattr(profiling, "PROFILE_DIR", tmp_path)
+    monkeypatch.setattr(profiling, "settings", dataclasses.replace(profiling.settings, profile_max_files=2))
+    with profiling.maybe_profile("off") as tag:
+        pass
+    assert tag is None
+    for _ in range(4):
+        with profiling.maybe_profile("many", force=True):
+            _busy(10)
+    assert len(list(tmp_path.iterdir())) == 2
@@ -0,0 +1,85 @@
+import dataclasses
+from datetime import date
+
+import pytest
+
+from zero_touch_cx.agents import tools
+from zero_touch_cx.tools import query_builder as qb
+
+
+class Job:
+    def __init__(self, rows, total_bytes_processed=0):
+        self.rows, self.total_bytes_processed = rows, total_bytes_processed
+
+    def result(self, page_size=None):
+        return self.rows
+
+
+class DayPricedClient:
+    """Dry runs cost ``gib_per_day`` per day in the start/end window (one day if unbounded)."""
+
+    def __init__(self, gib_per_day=1):
+        self.gib_per_day = gib_per_day
+        self.dry_runs, self.jobs = 0, []
+
+    def query(self, sql, job_config=None):
+        params = {p.name: p.value for p in job_config.query_parameters}
+        if job_config.dry_run:
+            self.dry_runs += 1
+            days = 1
+            if "start_date" in params:
+                days = (date.fromisoformat(str(params["end_date"])) - date.fromisoformat(str(params["start_date"]))).days + 1
+            return Job([], days * self.gib_per_day * 2**30)
+        self.jobs.append((sql, params, job_config.maximum_bytes_billed))
+        return Job([{"CustomerID": params["customer_id"], "status": "FAILED"}])
+
+
+@pytest.fixture
+def budget(monkeypatch):
+    monkeypatch.setattr(qb, "settings", dataclasses.replace(qb.settings, bq_max_bytes_scanned=10 * 2**30))
+    qb._dry_runs.clear()
+
+
+def test_partition_range_is_pruning_friendly():
+    query = (
+        qb.select(qb.REPORT_EVENT, "status")
+        .where_equals("CustomerID", "customer_id", "STRING", "cust_001")
+        .where_partition_range("2025-01-01", "2025-01-31")
+    )
+    sql = query.sql()
+    assert "DATE(run_ts)" not in sql
+    assert "run_ts >= TIMESTAMP(@start_date)" in sql
+    assert "run_ts < TIMESTAMP(DATE_ADD(@end_date, INTERVAL 1 DAY))" in sql
+    assert sql.index("CustomerID = @customer_id") < sql.index("run_ts >=")
+    date_spec = dataclasses.replace(qb.REPORT_EVENT, partition_type="DATE")
+    assert "run_ts <= @end_date" in qb.select(date_spec, "x").where_partition_range(None, "2025-01-31").sql()
+
+
+def test_over_budget_is_downgraded_or_refused(budget):
+    client = DayPricedClient()
+    query = (
+        qb.select(qb.REPORT_EVENT, "status")
+        .where_equals("CustomerID", "customer_id", "STRING", "cust_001")
+        .where_partition_range("2025-01-01", "2025-01-30")
+    )
+    with pytest.raises(qb.QueryBudgetExceeded):
+        qb.run_query(query, client)
+    assert client.jobs == []
+
+    _, ran = qb.run_query(query, client, downgrade=qb.shrink_window)
+    assert ran.param("start_date") == "2025-01-21" and ran.param("end_date") == "2025-01-30"
+    assert client.jobs[-1][2] == 10 * 2**30  # maximum_bytes_billed
+    dry_runs = client.dry_runs
+    qb.run_query(query, client, downgrade=qb.shrink_window)
+    assert client.dry_runs == dry_runs  # both estimates came from the cache
+
+
+def test_report_tool_reports_narrowed_window(budget, monkeypatch):
+    client = DayPricedClient()
+    monkeypatch.setattr(tools, "get_bigquery_client", lambda: client)
+    out = tools.generate_wire_status_report("cust_001", "2025-01-01", "2025-01-30")
+    assert out["window_narrowed"] and out["date_range"] == "2025-01-21 to 2025-01-30"
+    assert out["report_count"] == 1
+
+    monkeypatch.setattr(qb, "settings", dataclasses.replace(qb.settings, bq_max_bytes_scanned=2**29))
+    assert "budget" in tools.get_intraday_balance("cust_001")["error"]
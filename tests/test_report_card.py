@@ -0,0 +1,53 @@
+from zero_touch_cx.agents import report_cards
+from zero_touch_cx.tools.mock_store import load_csv
+
+
+def _expected_counts(customer_id, start, end):
+    df = load_csv("report_events.csv")
+    day = df["run_ts"].str[:10]
+    df = df[(df["customer_id"] == customer_id) & (day >= start) & (day <= end)]
+    return df
+
+
+def test_card_has_kpis_chart_and_no_rows_by_default(monkeypatch, tmp_path):
+    from zero_touch_cx.tools import charts
+    monkeypatch.setattr(charts, "TMP_DIR", tmp_path)
+
+    card = report_cards.build_wire_status_card("cust_001", "2025-01-01", "2026-12-31")
+    events = _expected_counts("cust_001", "2025-01-01", "2026-12-31")
+    kpis = {k["name"]: k["value"] for k in card["kpis"]}
+
+    assert card["kind"] == "report_card" and card["data_source"] == "mock"
+    assert kpis["failed_count"] == int((events["status"] == "FAILED").sum())
+    assert kpis["pending_count"] == int((events["status"] == "PENDING").sum())
+    assert card["chart_uri"].startswith("file://") and "rows" not in card
+
+
+def test_rows_only_when_requested():
+    card = report_cards.build_wire_status_card("cust_002", "2025-01-01", "2026-12-31", include_rows=True, with_chart=False)
+    assert len(card["rows"]) == len(_expected_counts("cust_002", "2025-01-01", "2026-12-31"))
+    assert report_cards.wants_rows("send me the raw rows for my wire report")
+    assert not report_cards.wants_rows("wire status report for last 30 days")
+
+
+def test_chart_is_opt_in_on_chat_and_rendered_once_per_window(monkeypatch, tmp_path):
+    from zero_touch_cx.tools import charts
+    monkeypatch.setattr(charts, "TMP_DIR", tmp_path)
+    rendered = []
+    real_render = report_cards._render_chart
+    monkeypatch.setattr(report_cards, "_render_chart", lambda *a: rendered.append(a[:3]) or real_render(*a))
+    report_cards._chart_uris.clear()
+
+    first = report_cards.build_wire_status_card("cust_001", "2025-01-01", "2026-12-31")
+    second = report_cards.build_wire_status_card("cust_001", "2025-01-01", "2026-12-31")
+    assert first["chart_uri"] == second["chart_uri"] and len(rendered) == 1
+
+    assert report_cards.wants_chart("wire status report with a chart for cust_003")
+    assert not report_cards.wants_chart("wire status report for cust_003 last 30 days")
+
+
+def test_orchestration_agent_builds_the_report_card():
+    from zero_touch_cx.agents import root_orchestration_agent
+
+    out = root_orchestration_agent.root_handle("Show wire status report for cust_001 last 30 days")
+    assert out["payload"]["kind"] == "report_card" and out["payload"]["customer_id"] == "cust_001"
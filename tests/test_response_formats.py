@@ -0,0 +1,56 @@
+import gzip
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from zero_touch_cx import serialization as ser
+
+RESPONSE = {
+    "summary": "ready",
+    "payload": {"kind": "report_card", "rows": [{"status": "FAILED", "n": i} for i in range(50)]},
+}
+
+
+def test_negotiate_prefers_highest_q_available():
+    assert ser.negotiate(None) == ser.JSON
+    assert ser.negotiate("text/html, */*;q=0.1") == ser.JSON
+    assert ser.negotiate("text/csv") is None
+    assert ser.negotiate("application/json;q=0.5, application/x-nope") == ser.JSON
+
+
+def test_compress_only_above_threshold():
+    body = ser.dumps(RESPONSE)
+    assert ser.compress(body, "gzip", min_bytes=len(body) + 1) == (body, None)
+    packed, encoding = ser.compress(body, "br, gzip;q=0.8", min_bytes=0)
+    assert encoding == "gzip" and gzip.decompress(packed) == body
+    assert ser.compress(body, "identity", min_bytes=0) == (body, None)
+
+
+def test_msgpack_round_trip():
+    msgpack = pytest.importorskip("msgpack")
+    assert ser.negotiate("application/msgpack") == ser.MSGPACK
+    assert msgpack.unpackb(ser.encode(RESPONSE, ser.MSGPACK)) == RESPONSE
+
+
+def test_arrow_stream_carries_rows_as_columns():
+    pa = pytest.importorskip("pyarrow")
+    table = pa.ipc.open_stream(ser.encode(RESPONSE, ser.ARROW_STREAM)).read_all()
+    assert table.column_names == ["status", "n"] and table.num_rows == 50
+    rest = json.loads(table.schema.metadata[ser.ARROW_METADATA_KEY])
+    assert rest == {"summary": "ready", "payload": {"kind": "report_card"}}
+
+
+def test_report_endpoint_negotiates():
+    from app.main import app
+    url = "/reports/T-1004?customer_id=cust_001&start_date=2025-01-01&end_date=2025-12-31"
+    with TestClient(app) as client:
+        card = client.get(url).json()
+        assert card["report_id"] == "T-1004" and "rows" not in card
+        assert client.get(url, headers={"Accept": "text/csv"}).status_code == 406
+        assert client.get("/reports/T-9999?customer_id=cust_001").status_code == 404
+        if ser._optional("pyarrow"):
+            import pyarrow as pa
+            r = client.get(url + "&include_rows=true", headers={"Accept": ser.ARROW_STREAM})
+            assert r.headers["content-type"] == ser.ARROW_STREAM
+            assert pa.ipc.open_stream(r.content).read_all().num_rows > 0
@@ -0,0 +1,61 @@
+import dataclasses
+from datetime import date
+
+from zero_touch_cx import scheduler
+from zero_touch_cx.kvstore import SqliteKV
+
+
+def test_sqlite_kv_round_trip(tmp_path):
+    kv = SqliteKV(tmp_path / "kv.sqlite")
+    assert kv.set_many([("a|1", {"x": 1}), ("a|2", [1, 2]), ("b|1", "s")]) == 3
+    kv.set("a|1", {"x": 2})
+    assert kv.get("a|1")[0] == {"x": 2}
+    assert list(kv.keys("a|")) == ["a|1", "a|2"]
+    assert set(kv.get_many(["a|2", "b|1", "zz"])) == {"a|2", "b|1"}
+    assert kv.get("missing") is None
+
+
+def test_precompute_fills_cache_and_staleness_falls_back(monkeypatch, tmp_path):
+    monkeypatch.setattr(
+        scheduler, "settings",
+        dataclasses.replace(scheduler.settings, report_cache_path=str(tmp_path / "reports.sqlite")),
+    )
+    today = date(2025, 11, 30)
+    stats = scheduler.precompute_report_cards(
+        customers=["cust_001", "cust_002"], report_ids=["T-1004", "T-2001"], windows_days=[30],
+        workers=2, today=today,
+    )
+    assert stats["tasks"] == 4 and stats["stored"] == 4 and stats["failed"] == 0
+
+    start, end = scheduler.report_window(30, today)
+    card = scheduler.cached_report_card("cust_001", "T-1004", start, end)
+    assert card["kind"] == "report_card" and card["report_id"] == "T-1004"
+    assert scheduler.cached_report_card("cust_002", "T-2001", start, end)["report_id"] == "T-2001"
+    assert scheduler.cached_report_card("cust_001", "T-1004", start, end, max_age_s=-1) is None
+    assert scheduler.cached_report_card("cust_003", "T-1004", start, end) is None
+
+
+def test_eligible_customers_by_current_plan():
+    assert scheduler.eligible_customers(["Starter"]) == ["cust_001", "cust_002"]
+    assert scheduler.eligible_customers(["Max"]) == []
+
+
+def test_usage_card_tool_reads_the_precomputed_card(monkeypatch, tmp_path):
+    from zero_touch_cx.agents import report_cards
+
+    monkeypatch.setattr(
+        scheduler, "settings",
+        dataclasses.replace(scheduler.settings, report_cache_path=str(tmp_path / "reports.sqlite")),
+    )
+    start, end = scheduler.report_window(30)
+    scheduler.store_report_cards([("cust_001", "T-2001", start, end, {"report_id": "T-2001", "precomputed": True})])
+    assert report_cards.get_usage_summary_card("cust_001")["precomputed"] is True
+
+
+def test_store_paths_resolve_from_the_repo_root():
+    from pathlib import Path
+
+    from zero_touch_cx.config import ROOT, settings
+
+    for path in (settings.report_cache_path, settings.session_store_path, settings.doc_store_path):
+        assert Path(path).is_absolute() and Path(path).is_relative_to(ROOT / "artifacts")
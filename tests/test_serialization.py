@@ -0,0 +1,38 @@
+import json
+from datetime import date
+from decimal import Decimal
+
+import numpy as np
+from fastapi.testclient import TestClient
+
+from zero_touch_cx.schemas import AgentResponse
+from zero_touch_cx.serialization import dumps, trusted_dict
+
+
+def test_trusted_dict_matches_validated_dump():
+    fields = dict(summary="ok", payload={"rows": [{"a": 1}]}, handoff_required=True)
+    assert trusted_dict(AgentResponse, **fields) == AgentResponse(**fields).model_dump()
+
+
+def test_dumps_handles_tool_values():
+    out = json.loads(dumps({
+        "d": date(2025, 1, 2), "m": Decimal("1.50"), "n": np.int64(3), "a": np.arange(2),
+        "k": AgentResponse(summary="x"), 1: "int key",
+    }))
+    assert out["d"] == "2025-01-02" and out["m"] == 1.5 and out["n"] == 3 and out["a"] == [0, 1]
+    assert out["k"]["summary"] == "x" and out["1"] == "int key"
+
+
+def test_billing_summary_is_plain_dict():
+    from zero_touch_cx.agents.billing_agent import get_customer_billing_summary
+    resp = get_customer_billing_summary("cust_001", "billing please")
+    assert set(resp) == set(AgentResponse.model_fields)
+    json.loads(dumps(resp))
+
+
+def test_chat_endpoint_encodes_once():
+    from app.main import app
+    with TestClient(app) as client:
+        r = client.post("/chat", json={"text": "Show me my wire status report for last 30 days cust_001"})
+    assert r.status_code == 200 and r.headers["content-type"] == "application/json"
+    assert r.json()["payload"]["kind"] == "report_card"
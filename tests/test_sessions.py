@@ -0,0 +1,67 @@
+import time
+
+import agent
+from zero_touch_cx import sessions
+from zero_touch_cx.sessions import SessionStore, session_scope
+from zero_touch_cx.tools import billing_tools, upgrade_queue
+
+
+def test_store_keys_by_session_and_customer(tmp_path):
+    store = SessionStore(str(tmp_path / "sessions.sqlite"), ttl_s=60)
+    store.put("s1", "cust_001", {"upgrade_quote": {"requested_plan": "Pro"}})
+    store.put("s1", "cust_003", {"upgrade_quote": {"requested_plan": "Max"}})
+    store.put("s2", "cust_001", {"note": "other session"})
+
+    assert store.get("s1")["customer_id"] == "cust_003"  # last customer of the session
+    assert store.get("s1", "cust_001")["upgrade_quote"] == {"requested_plan": "Pro"}
+    assert store.get("s2", "cust_003") is None
+
+    # A second process (fresh LRU) reads the same state from SQLite.
+    reopened = SessionStore(str(tmp_path / "sessions.sqlite"), ttl_s=60)
+    assert reopened.get("s1", "cust_003")["upgrade_quote"]["requested_plan"] == "Max"
+    assert reopened.snapshot()["store_hits"] == 1
+
+
+def test_state_expires(tmp_path):
+    store = SessionStore(str(tmp_path / "sessions.sqlite"), ttl_s=60)
+    store.store.set("s1|cust_001", {"upgrade_quote": None}, updated_at=time.time() - 120)
+    assert store.get("s1", "cust_001") is None
+    assert store.store.get("s1|cust_001") is None
+
+
+def test_confirm_turn_reuses_the_quote(monkeypatch, tmp_path):
+    monkeypatch.setattr(sessions, "_store", SessionStore(str(tmp_path / "sessions.sqlite")))
+    queue = upgrade_queue.UpgradeQueue(tmp_path / "q.sqlite", store=object())
+    monkeypatch.setattr(upgrade_queue, "get_upgrade_queue", lambda: queue)
+    billing_tools.forget_cached_plan("cust_003")
+
+    lookups = {"eligibility": 0, "policy": 0}
+    real_eligibility, real_policy = billing_tools.check_upgrade_eligibility, billing_tools.policy_check
+
+    def counted(name, fn):
+        def wrapper(*args):
+            lookups[name] += 1
+            return fn(*args)
+        return wrapper
+
+    monkeypatch.setattr(billing_tools, "check_upgrade_eligibility", counted("eligibility", real_eligibility))
+    monkeypatch.setattr(billing_tools, "policy_check", counted("policy", real_policy))
+
+    with session_scope("web-42"):
+        quote = agent.root_handle("Upgrade cust_003 to the Max plan")
+        confirm = agent.root_handle("CONFIRM UPGRADE")
+
+    assert quote["payload"]["requires_confirmation"] and quote["payload"]["requested_plan"] == "Max"
+    assert confirm["payload"]["customer_id"] == "cust_003" and confirm["payload"]["requested_plan"] == "Max"
+    assert confirm["payload"]["upgrade"]["ticket_id"].startswith("chg_")
+    assert confirm["summary"].startswith("Your upgrade to the Max plan is submitted (ticket chg_")
+    assert lookups == {"eligibility": 1, "policy": 1}
+
+    state = sessions.get_session_store().get("web-42", "cust_003")
+    assert state["upgrade_quote"] is None and state["upgrade_ticket"] == confirm["payload"]["upgrade"]["ticket_id"]
+
+    # Without a session every turn starts from scratch (and defaults apply).
+    assert agent.root_handle("CONFIRM UPGRADE")["payload"]["customer_id"] == "cust_001"
+    queue.stop(flush=False)
+    billing_tools.forget_cached_plan("cust_003")
+    billing_tools.forget_cached_plan("cust_001")
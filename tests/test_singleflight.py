@@ -0,0 +1,111 @@
+import asyncio
+import dataclasses
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+
+from zero_touch_cx import executors, singleflight
+from zero_touch_cx.agents import tools
+from zero_touch_cx.singleflight import coalesce
+
+
+def _slow(name, delay=0.2, fail=False):
+    calls = []
+
+    @coalesce(name)
+    def lookup(customer_id: str, days: int = 30) -> dict:
+        calls.append(customer_id)
+        time.sleep(delay)
+        if fail:
+            raise RuntimeError("bigquery down")
+        return {"customer_id": customer_id.strip(), "days": days}
+
+    return lookup, calls
+
+
+def test_concurrent_threads_share_one_execution():
+    lookup, calls = _slow("test_threads")
+    args = [("cust_001",), (" cust_001 ",), ("cust_001", 30), ("cust_002",)] * 5
+    with ThreadPoolExecutor(len(args)) as pool:
+        results = list(pool.map(lambda a: lookup(*a), args))
+
+    assert sorted(set(calls)) == ["cust_001", "cust_002"]  # one execution per distinct call
+    assert all(r == {"customer_id": a[0].strip(), "days": 30} for r, a in zip(results, args))
+    stats = singleflight.singleflight_stats()["test_threads"]
+    assert stats["executions"] == 2 and stats["coalesced"] == 18 and stats["in_flight"] == 0
+
+    lookup("cust_001")  # nothing is cached once the flight lands
+    assert len(calls) == 3
+
+
+def test_errors_reach_every_caller():
+    lookup, calls = _slow("test_errors", fail=True)
+    with ThreadPoolExecutor(4) as pool:
+        futures = [pool.submit(lookup, "cust_001") for _ in range(4)]
+    for future in futures:
+        with pytest.raises(RuntimeError, match="bigquery down"):
+            future.result()
+    assert len(calls) == 1 and singleflight.singleflight_stats()["test_errors"]["errors"] == 1
+
+
+def test_asyncio_tasks_join_a_thread_flight():
+    lookup, calls = _slow("test_async")
+    leader = threading.Thread(target=lookup, args=("cust_001",))
+    leader.start()
+    time.sleep(0.05)
+
+    async def run():
+        return await asyncio.gather(*(lookup.aio("cust_001") for _ in range(10)), lookup.aio("cust_003"))
+
+    results = asyncio.run(run())
+    leader.join()
+    assert calls == ["cust_001", "cust_003"]
+    assert results[0] == {"customer_id": "cust_001", "days": 30} and results[0] is not results[1]
+
+
+def test_async_caller_and_pool_job_share_a_one_worker_pool(monkeypatch):
+    monkeypatch.setitem(executors.POOL_SIZES, "bigquery", 1)
+    monkeypatch.setattr(executors, "_pools", {})
+    lookup, calls = _slow("test_one_worker", delay=0.05)
+
+    def pool_job():
+        time.sleep(0.05)  # the async call asks while this job holds the only worker
+        return lookup("cust_001")
+
+    async def run():
+        job = executors.submit_blocking("bigquery", pool_job)
+        result = await asyncio.wait_for(lookup.aio("cust_001"), 2)
+        return result, await asyncio.wait_for(asyncio.wrap_future(job), 2)
+
+    try:
+        results = asyncio.run(run())
+    finally:
+        executors.shutdown_executors(wait=False)
+    assert results == ({"customer_id": "cust_001", "days": 30},) * 2
+    assert calls == ["cust_001", "cust_001"]
+
+
+def test_intraday_balance_runs_one_query(monkeypatch):
+    from zero_touch_cx.tools import query_builder
+
+    class Client:
+        queries = 0
+
+        def query(self, sql, job_config=None):
+            Client.queries += 1
+            time.sleep(0.2)
+            row = {"customer_id": "USR-AstroZen", "current_balance": 10.0, "available_balance": 5.0,
+                   "last_update_ts": datetime(2025, 3, 3, 9, 30)}
+            return SimpleNamespace(result=lambda: [row])
+
+    monkeypatch.setattr(query_builder, "settings", dataclasses.replace(query_builder.settings, bq_max_bytes_scanned=0))
+    monkeypatch.setattr(tools, "get_bigquery_client", Client)
+    with ThreadPoolExecutor(50) as pool:
+        results = list(pool.map(tools.get_intraday_balance, ["USR-AstroZen"] * 50))
+
+    assert Client.queries == 1
+    assert {r["current_balance_total"] for r in results} == {"10.00"}
@@ -0,0 +1,58 @@
+import time
+
+from zero_touch_cx.agents import speculative_tools
+
+
+def _slow(result, delay=0.2):
+    def tool(*args, **kwargs):
+        time.sleep(delay)
+        return result
+    return tool
+
+
+def test_data_fetch_overlaps_eligibility_check(monkeypatch):
+    real_check = speculative_tools.check_eligibility
+    monkeypatch.setattr(speculative_tools, "check_eligibility", lambda q: (time.sleep(0.2), real_check(q))[1])
+    monkeypatch.setitem(speculative_tools.DATA_TOOLS, "get_intraday_balance", _slow({"status": "SUCCESS"}))
+
+    started = time.perf_counter()
+    out = speculative_tools.fetch_if_eligible(
+        "live balance for USR-AstroZen", tool_args={"customer_id": "USR-AstroZen"}
+    )
+    assert time.perf_counter() - started < 0.35
+    assert out["eligibility"]["eligibility"] == "INCLUDED"
+    assert out["data_tool"] == "get_intraday_balance"
+    assert out["data"] == {"status": "SUCCESS"}
+
+
+def test_ineligible_fetch_is_discarded(monkeypatch):
+    monkeypatch.setitem(speculative_tools.DATA_TOOLS, "get_intraday_balance", _slow({"secret": 1}, 0.05))
+    before = speculative_tools.speculation_stats()
+    out = speculative_tools.fetch_if_eligible(
+        "live balance for USR-StellarQ", tool_args={"customer_id": "USR-StellarQ"}
+    )
+    after = speculative_tools.speculation_stats()
+    assert out["eligibility"]["eligibility"] == "NOT_AVAILABLE"
+    assert out["data_tool"] == "get_intraday_balance" and "data" not in out
+    assert (after["cancelled"] + after["discarded"]) - (before["cancelled"] + before["discarded"]) == 1
+
+
+def test_tool_and_customer_must_match_the_checked_query(monkeypatch):
+    calls = []
+    monkeypatch.setitem(speculative_tools.DATA_TOOLS, "get_intraday_balance", lambda **kw: calls.append(kw) or {"secret": 1})
+    monkeypatch.setitem(speculative_tools.DATA_TOOLS, "get_detailed_wire_report", lambda **kw: calls.append(kw) or {"secret": 2})
+
+    # An INCLUDED feature does not unlock another feature's data tool ...
+    wrong_tool = speculative_tools.fetch_if_eligible(
+        "live balance for USR-AstroZen", "get_detailed_wire_report", {"customer_id": "USR-AstroZen", "report_id": "r1"}
+    )
+    # ... nor another customer's data.
+    wrong_customer = speculative_tools.fetch_if_eligible(
+        "live balance for USR-AstroZen", "get_intraday_balance", {"customer_id": "USR-StellarQ"}
+    )
+    assert wrong_tool["error"] == "DATA_TOOL_MISMATCH" and wrong_customer["error"] == "CUSTOMER_MISMATCH"
+    assert all(set(out) == {"eligibility", "data_tool", "error", "message"} for out in (wrong_tool, wrong_customer))
+    assert calls == []
+
+    out = speculative_tools.fetch_if_eligible("live balance for USR-AstroZen")
+    assert out["data"] == {"secret": 1} and calls == [{"customer_id": "USR-AstroZen"}]
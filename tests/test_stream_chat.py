@@ -0,0 +1,63 @@
+import json
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+
+
+def _events(body: str):
+    for block in body.strip().split("\n\n"):
+        event, data = block.split("\n", 1)
+        yield event.removeprefix("event: "), json.loads(data.removeprefix("data: "))
+
+
+def test_report_stream_sends_kpis_before_rows():
+    with TestClient(app) as client:
+        resp = client.post("/chat/stream", json={"text": "wire status report for cust_001 last 2000 days"})
+    assert resp.headers["content-type"].startswith("text/event-stream")
+    events = list(_events(resp.text))
+
+    assert events[0][0] == "summary"
+    kpis = {k["name"]: k["value"] for k in events[0][1]["payload"]["kpis"]}
+    assert set(kpis) == {"pending_count", "completion_rate", "failed_count"}
+    rows = [row for name, data in events if name == "rows" for row in data["rows"]]
+    assert events[-1] == ("done", {"row_count": len(rows)})
+    assert len(rows) == events[0][1]["payload"]["report_count"] > 0
+    assert kpis["failed_count"] == sum(r["status"] == "FAILED" for r in rows)
+
+
+def test_non_report_requests_stream_a_single_response():
+    with TestClient(app) as client:
+        resp = client.post("/chat/stream", json={"text": "my password is hunter2"})
+    events = list(_events(resp.text))
+    assert [name for name, _ in events] == ["summary", "done"]
+    assert events[0][1]["payload"]["type"] == "compliance_block"
+
+
+def test_failures_end_the_stream_with_an_error_event(monkeypatch):
+    import agent
+    from zero_touch_cx.executors import run_blocking
+    from zero_touch_cx.tools.query_builder import QueryBudgetExceeded
+
+    def over_budget(*args):
+        raise QueryBudgetExceeded(2 * 2**30, 2**30)
+
+    monkeypatch.setattr(agent.summarize_wire_status, "aio", lambda *a: run_blocking("bigquery", over_budget))
+    with TestClient(app) as client:
+        resp = client.post("/chat/stream", json={"text": "wire status report for cust_001 last 2000 days"})
+    events = list(_events(resp.text))
+    assert [name for name, _ in events] == ["error", "done"]
+    assert events[0][1]["payload"]["type"] == "error" and "narrow the date range" in events[0][1]["summary"]
+
+    def broken_pages(*args):
+        yield [{"report_id": "r1"}]
+        raise RuntimeError("connection reset")
+
+    monkeypatch.undo()
+    monkeypatch.setattr(agent, "iter_wire_status_report_pages", broken_pages)
+    with TestClient(app) as client:
+        resp = client.post("/chat/stream", json={"text": "wire status report for cust_001 last 2000 days"})
+    events = list(_events(resp.text))
+    assert [name for name, _ in events] == ["summary", "rows", "error", "done"]
+    assert "connection reset" in events[2][1]["payload"]["reason"]
+    assert events[-1] == ("done", {"row_count": 1})
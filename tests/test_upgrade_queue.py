@@ -0,0 +1,140 @@
+import dataclasses
+
+import pandas as pd
+
+from zero_touch_cx.tools import billing_tools, upgrade_queue
+from zero_touch_cx.tools.billing_data import CsvBillingStore
+
+
+def _store(tmp_path):
+    path = tmp_path / "billing_history.csv"
+    path.write_text("customer_id,plan,start_date,mrr_usd\ncust_001,Starter,2025-01-01,19.0\n")
+    return CsvBillingStore(path)
+
+
+def test_enqueue_is_idempotent_and_commits_in_one_batch(tmp_path):
+    store = _store(tmp_path)
+    queue = upgrade_queue.UpgradeQueue(tmp_path / "q.sqlite", store=store, price_of=billing_tools.PLAN_PRICING.get)
+    first = queue.enqueue("cust_001", "Pro")
+    again = queue.enqueue("cust_001", "Pro")
+    other = queue.enqueue("cust_002", "Max")
+    assert again["duplicate"] and again["ticket_id"] == first["ticket_id"]
+    assert not first["duplicate"] and other["ticket_id"] != first["ticket_id"]
+
+    queue.stop(flush=True)
+    assert queue.stats()["committed"] == 2 and queue.pending() == 0
+    df = pd.read_csv(store.path)
+    assert list(df["plan"]) == ["Starter", "Pro", "Max"]
+    assert df.loc[1, "mrr_usd"] == 49.0
+    # Within the idempotency window a committed upgrade is not applied again.
+    assert queue.enqueue("cust_001", "Pro")["duplicate"]
+    queue.stop(flush=True)
+    assert len(pd.read_csv(store.path)) == 3
+
+
+def test_failed_commits_retry_then_fail(monkeypatch, tmp_path):
+    monkeypatch.setattr(upgrade_queue, "settings", dataclasses.replace(upgrade_queue.settings, upgrade_max_attempts=2))
+
+    class Broken:
+        def append_periods(self, periods):
+            raise OSError("disk full")
+
+    failed = []
+    queue = upgrade_queue.UpgradeQueue(tmp_path / "q.sqlite", store=Broken(), on_failure=lambda c, p: failed.append((c, p)))
+    key = queue.enqueue("cust_001", "Max")["idempotency_key"]
+    queue.stop(flush=False)
+    assert queue.commit_batch() == 0 and queue.status(key)["status"] == "queued"
+    queue.commit_batch()
+    assert queue.status(key)["status"] == "failed" and queue.status(key)["error"] == "disk full"
+    assert failed == [("cust_001", "Max")]
+    # A failed upgrade can be requested again.
+    assert not queue.enqueue("cust_001", "Max")["duplicate"]
+    queue.stop(flush=False)
+
+
+def test_confirmed_upgrade_only_enqueues(monkeypatch, tmp_path):
+    store = _store(tmp_path)
+    queue = upgrade_queue.UpgradeQueue(tmp_path / "q.sqlite", store=store, price_of=billing_tools.PLAN_PRICING.get)
+    monkeypatch.setattr(upgrade_queue, "get_upgrade_queue", lambda: queue)
+    billing_tools.forget_cached_plan("cust_001")
+
+    pending = billing_tools.prepare_upgrade("cust_001", "Pro", "Upgrade me to Pro")
+    assert pending["requires_confirmation"] and "upgrade" not in pending
+
+    decision = billing_tools.prepare_upgrade("cust_001", "Pro", "CONFIRM UPGRADE to Pro")
+    assert decision["kind"] == "upgrade_decision" and not decision["requires_confirmation"]
+    assert decision["upgrade"]["ticket_id"].startswith("chg_")
+    # Write-behind: eligibility sees the new plan before the billing write lands.
+    assert billing_tools.check_upgrade_eligibility("cust_001", "Pro")["current_plan"] == "Pro"
+    queue.stop(flush=True)
+    assert pd.read_csv(store.path)["plan"].iloc[-1] == "Pro"
+    billing_tools.forget_cached_plan("cust_001")
+
+
+def test_plan_changed_back_and_forth_ends_on_the_last_request(tmp_path):
+    store = _store(tmp_path)
+    queue = upgrade_queue.UpgradeQueue(tmp_path / "q.sqlite", store=store, price_of=billing_tools.PLAN_PRICING.get)
+    tickets = [
+        queue.enqueue("cust_001", "Pro", "Starter"),
+        queue.enqueue("cust_001", "Starter", "Pro"),
+        queue.enqueue("cust_001", "Pro", "Starter"),  # same change as the first, but it was superseded
+    ]
+    assert not any(t["duplicate"] for t in tickets)
+    queue.stop(flush=True)
+    assert pd.read_csv(store.path)["plan"].iloc[-1] == "Pro"
+    assert queue.enqueue("cust_001", "Pro", "Starter")["duplicate"]  # still the latest change
+
+    # Committed changes are superseded the same way.
+    assert not queue.enqueue("cust_001", "Starter", "Pro")["duplicate"]
+    queue.stop(flush=True)
+    assert not queue.enqueue("cust_001", "Pro", "Starter")["duplicate"]
+    queue.stop(flush=True)
+    assert list(pd.read_csv(store.path)["plan"].iloc[-2:]) == ["Starter", "Pro"]
+
+
+def test_default_mock_store_is_a_copy_of_the_tracked_data(monkeypatch, tmp_path):
+    from zero_touch_cx.tools import billing_data
+    from zero_touch_cx.tools.mock_store import DATA_DIR
+
+    copy = tmp_path / "artifacts" / "billing_history.csv"
+    monkeypatch.setattr(billing_data, "settings", dataclasses.replace(billing_data.settings, billing_store_path=str(copy)))
+    tracked = (DATA_DIR / "billing_history.csv").read_text()
+
+    store = billing_data.get_billing_store()
+    store.append_periods([{"customer_id": "cust_001", "plan": "Max", "start_date": "2026-01-01", "mrr_usd": 199.0}])
+    assert store.path == copy and (DATA_DIR / "billing_history.csv").read_text() == tracked
+    assert copy.read_text() == tracked + "cust_001,Max,2026-01-01,199.0\n"
+
+
+def test_retried_upgrade_keeps_its_ticket(monkeypatch, tmp_path):
+    store = _store(tmp_path)
+    queue = upgrade_queue.UpgradeQueue(tmp_path / "q.sqlite", store=store, price_of=billing_tools.PLAN_PRICING.get)
+    monkeypatch.setattr(upgrade_queue, "get_upgrade_queue", lambda: queue)
+    billing_tools.forget_cached_plan("cust_001")
+
+    # The first call already put Pro in the plan cache; the retry must not key on it.
+    first = billing_tools.execute_upgrade("cust_001", "Pro")
+    retry = billing_tools.execute_upgrade("cust_001", "Pro")
+    assert (first["status"], first["queue_status"]) == ("success", "queued")
+    assert retry["duplicate"] and retry["ticket_id"] == first["ticket_id"]
+    queue.stop(flush=True)
+    assert billing_tools.execute_upgrade("cust_001", "Pro")["queue_status"] == "committed"
+    queue.stop(flush=True)
+    assert list(pd.read_csv(store.path)["plan"]) == ["Starter", "Pro"]
+    billing_tools.forget_cached_plan("cust_001")
+
+
+def test_mock_plans_are_read_from_the_billing_store(monkeypatch, tmp_path):
+    from zero_touch_cx import config
+    from zero_touch_cx.tools import billing_data, mock_store
+
+    store_path = tmp_path / "billing_history.csv"
+    monkeypatch.setattr(config, "settings", dataclasses.replace(config.settings, billing_store_path=str(store_path)))
+    monkeypatch.setattr(billing_data, "settings", config.settings)
+    assert mock_store.current_plan("cust_001") == "Starter"  # seed data until the first upgrade
+
+    billing_data.get_billing_store().append_periods(
+        [{"customer_id": "cust_001", "plan": "Max", "start_date": "2026-01-01", "mrr_usd": 199.0}]
+    )
+    assert mock_store.current_plan("cust_001") == "Max"
+    assert billing_data.CsvBillingSource().path == store_path
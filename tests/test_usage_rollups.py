@@ -0,0 +1,34 @@
+import pandas as pd
+
+from zero_touch_cx.tools.mock_store import load_csv
+from zero_touch_cx.tools.usage_rollups import UsageRollups, usage_kpis
+
+
+def _brute_force(events, customer_id, start, end):
+    ts = pd.to_datetime(events["event_ts"])
+    rows = events[(events["customer_id"] == customer_id) & (ts >= start) & (ts < end)]
+    grouped = rows.groupby("feature")["value"].agg(["size", "sum"])
+    return {f: {"events": int(r["size"]), "value": float(r["sum"])} for f, r in grouped.iterrows()}
+
+
+def test_incremental_ingest_matches_raw_events_for_any_window():
+    events = load_csv("usage_events.csv").sort_values("event_ts")
+    half = len(events) // 2
+    rollups = UsageRollups()
+    assert rollups.ingest(events.iloc[:half]) == half
+    assert rollups.ingest(events) == len(events) - half  # already-seen events are skipped
+
+    for customer_id, start, end in [
+        ("cust_001", "2025-11-15", "2025-12-31"),
+        ("cust_002", "2025-11-15T05:00", "2025-11-18T13:00"),
+        ("cust_001", "2025-11-16T06:00", "2025-11-16T19:00"),
+        ("cust_003", "2025-11-01", "2026-02-01"),
+    ]:
+        expected = _brute_force(events, customer_id, pd.Timestamp(start), pd.Timestamp(end))
+        assert rollups.summary(customer_id, start, end) == expected
+
+
+def test_usage_kpis():
+    kpis = usage_kpis({"api_calls": {"events": 3, "value": 10.0}, "dashboards": {"events": 5, "value": 1.0}})
+    assert [(k.name, k.value) for k in kpis] == [("top_feature", "dashboards"), ("total_events", 8)]
+    assert [k.value for k in usage_kpis({})] == ["none", 0]
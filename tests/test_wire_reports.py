@@ -0,0 +1,73 @@
+import time
+from types import SimpleNamespace
+
+from zero_touch_cx.agents import tools
+from zero_touch_cx.tools import wire_reports
+from zero_touch_cx.tools.wire_reports import WireReportLookup
+
+SCHEMA = ["report_id", "SenderName", "ReceiverName", "Amount", "Status", "InternalNotes"]
+WIRES = [
+    {"report_id": f"W-{i}", "SenderName": s, "ReceiverName": "Acme", "Amount": 10.0 * i, "Status": "SENT", "InternalNotes": "x"}
+    for i, s in enumerate(["AstroZen", "AstroZen", "Lumen"])
+]
+
+
+class WireClient:
+    def __init__(self):
+        self.lookups, self.sql = 0, []
+
+    def get_table(self, fqn):
+        return SimpleNamespace(schema=[SimpleNamespace(name=n) for n in SCHEMA])
+
+    def _rows(self, sql, job_config):
+        self.sql.append(sql)
+        params = {p.name: getattr(p, "value", None) or getattr(p, "values", None) for p in job_config.query_parameters}
+        columns = SCHEMA if "*" in sql.split("FROM")[0] else [c for c in SCHEMA if c in sql.split("FROM")[0]]
+        rows = [w for w in WIRES if w["report_id"] == params.get("report_id", w["report_id"])]
+        rows = [w for w in rows if w["SenderName"] in params.get("senders", [params.get("sender_name")])]
+        return [{c: w[c] for c in columns} for w in rows]
+
+    def query_and_wait(self, sql, job_config=None):
+        self.lookups += 1
+        return self._rows(sql, job_config)
+
+    def query(self, sql, job_config=None):
+        return SimpleNamespace(result=lambda: self._rows(sql, job_config))
+
+
+def test_lookup_projects_and_caches(tmp_path):
+    client = WireClient()
+    lookup = WireReportLookup(lambda: client, str(tmp_path / "wires.sqlite"))
+    record = lookup.get("W-1", "USR-AstroZen", view="summary")
+    assert record == {"report_id": "W-1", "SenderName": "AstroZen", "ReceiverName": "Acme", "Amount": 10.0, "Status": "SENT"}
+    assert "InternalNotes" not in client.sql[0] and "t.*" not in client.sql[0]
+
+    started = time.perf_counter()
+    for _ in range(200):
+        assert lookup.get("W-1", "AstroZen", view="summary") == record
+    assert (time.perf_counter() - started) / 200 < 0.005
+    assert client.lookups == 1
+
+    assert lookup.get("W-9", "AstroZen") is None
+    assert lookup.get("W-9", "AstroZen") is None
+    assert client.lookups == 2  # not-found is cached too
+
+    # A new process sharing the store does not go back to BigQuery.
+    other = WireReportLookup(lambda: client, str(tmp_path / "wires.sqlite"))
+    assert other.get("W-1", "AstroZen", view="summary") == record
+    assert client.lookups == 2 and other.stats["store_hits"] == 1
+
+
+def test_warm_loads_active_customers(tmp_path, monkeypatch):
+    client = WireClient()
+    lookup = WireReportLookup(lambda: client, str(tmp_path / "wires.sqlite"))
+    assert lookup.warm(customers=["USR-AstroZen", "Lumen"]) == 3
+    assert "QUALIFY ROW_NUMBER()" in client.sql[-1]
+    assert "InternalNotes" not in lookup.get("W-2", "Lumen")
+    assert lookup.get("W-0", "AstroZen")["Amount"] == 0.0
+    assert client.lookups == 0
+
+    monkeypatch.setattr(wire_reports, "_lookup", lookup)
+    out = tools.get_detailed_wire_report("W-0", "USR-AstroZen")
+    assert out["status"] == "SUCCESS" and out["details"]["report_id"] == "W-0"
+    assert tools.get_detailed_wire_report("W-0", "AstroZen", view="bogus")["status"] == "ERROR"
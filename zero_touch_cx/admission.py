@@ -0,0 +1,324 @@
+"""Admission control ahead of the compliance gate.
+
+Each chat is classified with cheap regexes (no model call) into a tool before
+any work is done. Then three checks apply, in order:
+
+- a per-client token bucket (ADMISSION_CUSTOMER_RATE_PER_S / _BURST) keyed on
+  the caller's address, so one integration cannot flood the API. Customer IDs
+  in headers or text are not used: callers choose them freely;
+- a per-tool bucket (ADMISSION_TOOL_RATES, e.g. ``wire_report=5/10`` for 5 per
+  second with bursts of 10), which caps expensive BigQuery work across all
+  customers;
+- the global in-flight limit (MAX_INFLIGHT_CHATS). Once it is reached, requests
+  wait in priority lanes (LANES: balances first, historical reports last) for up
+  to ADMISSION_QUEUE_TIMEOUT_S. A full queue (ADMISSION_MAX_QUEUED) sheds its
+  lowest-priority waiter, and a shed request gets its rate tokens back.
+
+/chat/batch takes one client token per message and one tool token per message
+of that tool, all or nothing. A batch larger than the burst runs the client's
+own bucket into debt that its later requests wait out; the shared tool buckets
+are only emptied, so a batch never starves other customers for longer than one
+token takes to refill.
+
+Rejected requests get a structured AgentResponse (payload type ``shed``) with a
+retry hint instead of waiting indefinitely. admission_stats() is served at
+/metrics.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import re
+import threading
+import time
+from concurrent.futures import Future
+from contextlib import asynccontextmanager, suppress
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Iterable, Mapping, Optional
+
+from .cache import TTLCache
+from .config import settings
+from .observability import logger
+from .schemas import AgentResponse
+from .serialization import trusted_dict
+
+# Lower runs first when the in-flight limit is reached.
+LANES = {"balance": 0, "documents": 1, "ach": 1, "billing": 1, "upgrade": 1, "other": 1, "wire_report": 2}
+
+_TOOL_PATTERNS = [
+    ("balance", re.compile(r"\bbalances?\b")),
+    ("ach", re.compile(r"\bach\b|\bnacha\b")),
+    ("documents", re.compile(r"\bcopy of\b|\bcheck (?:image|copy)\b|\bdocuments?\b")),
+]
+_INTENT_TOOLS = {"report_request": "wire_report", "billing_inquiry": "billing", "plan_upgrade": "upgrade"}
+# Bucket for in-process callers (tests, CLI) that have no client address.
+LOCAL_CLIENT = "local"
+
+
+def classify_tool(user_text: str) -> str:
+    """The tool (and so the lane and tool bucket) a chat will use."""
+    from .agents.intent_tools import _intent_from_text
+
+    text = user_text.lower()
+    tool = next((name for name, rx in _TOOL_PATTERNS if rx.search(text)), None)
+    return tool or _INTENT_TOOLS.get(_intent_from_text(text)["intent"], "other")
+
+
+class TokenBucket:
+    __slots__ = ("rate", "burst", "max_debt", "tokens", "updated")
+
+    def __init__(self, rate: float, burst: float, max_debt: float = float("inf")):
+        self.rate, self.burst, self.max_debt = rate, max(1.0, burst), max_debt
+        self.tokens, self.updated = self.burst, time.monotonic()
+
+    def refill(self, now: Optional[float] = None) -> float:
+        now = time.monotonic() if now is None else now
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        return self.tokens
+
+    def take(self, now: Optional[float] = None, n: int = 1) -> float:
+        """0.0 if n tokens were taken, else seconds until they will be available.
+
+        More than ``burst`` tokens are taken from a full bucket, leaving it at most
+        ``max_debt`` below empty.
+        """
+        self.refill(now)
+        need = min(n, self.burst)
+        if self.tokens >= need:
+            self.tokens = max(self.tokens - n, -self.max_debt)
+            return 0.0
+        return (need - self.tokens) / self.rate if self.rate > 0 else float("inf")
+
+    def refund(self, n: float = 1) -> None:
+        self.tokens = min(self.burst, self.tokens + n)
+
+
+def parse_rates(spec: str) -> dict[str, tuple[float, float]]:
+    """``"wire_report=5/10,balance=50"`` -> {tool: (rate per second, burst)}; burst defaults to 2x rate."""
+    rates = {}
+    for part in filter(None, (p.strip() for p in spec.split(","))):
+        name, _, value = part.partition("=")
+        rate, _, burst = value.partition("/")
+        rates[name.strip()] = (float(rate), float(burst) if burst else 2 * float(rate))
+    return rates
+
+
+class Shed(Exception):
+    def __init__(self, reason: str, retry_after_s: float, tool: str):
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after_s = retry_after_s
+        self.tool = tool
+
+
+@dataclass
+class Admission:
+    """An admitted request; ``hold_until`` keeps its slot while work it gave up on still runs."""
+
+    client: str
+    tool: str
+    pending: Optional[Future] = None
+
+    def hold_until(self, future: Future) -> None:
+        self.pending = future
+
+
+@dataclass(order=True)
+class _Waiter:
+    lane: int
+    seq: int
+    tool: str = field(compare=False)
+    future: asyncio.Future = field(compare=False)
+
+
+class AdmissionController:
+    def __init__(self, max_inflight: Optional[int] = None, max_queued: Optional[int] = None):
+        self.max_inflight = max_inflight or settings.max_inflight_chats
+        self.max_queued = settings.admission_max_queued if max_queued is None else max_queued
+        # Idle buckets expire, which is the same as a full bucket.
+        self.clients = TTLCache(maxsize=settings.admission_max_customers, ttl_s=settings.admission_bucket_idle_s)
+        self.tool_rates = parse_rates(settings.admission_tool_rates)
+        # Shared by all customers, so a batch may empty a tool bucket but not owe it.
+        self.tools = {name: TokenBucket(*rate, max_debt=0) for name, rate in self.tool_rates.items()}
+        self.in_flight = 0
+        self._waiters: list[_Waiter] = []  # heap: best lane, then arrival
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+        self.admitted = 0
+        self.shed: dict[str, int] = {}
+
+    def _shed(self, reason: str, retry_after_s: float, tool: str) -> Shed:
+        self.shed[reason] = self.shed.get(reason, 0) + 1
+        return Shed(reason, retry_after_s, tool)
+
+    def _client_bucket(self, client: str) -> TokenBucket:
+        bucket = self.clients.get(client) or TokenBucket(
+            settings.admission_customer_rate_per_s, settings.admission_customer_burst
+        )
+        self.clients.set(client, bucket)  # restarts the idle timer
+        return bucket
+
+    def check_rates(self, client: str, tools: str | Mapping[str, int]) -> None:
+        """Take one token per request from the client's bucket and each tool's bucket, or raise Shed.
+
+        ``tools`` is one request's tool, or {tool: requests} for a batch. Nothing is
+        taken when any bucket sheds.
+        """
+        counts = {tools: 1} if isinstance(tools, str) else dict(tools)
+        label = next(iter(counts)) if len(counts) == 1 else "batch"
+        with self._lock:
+            bucket = self._client_bucket(client)
+            now = time.monotonic()
+            wait = bucket.take(now, sum(counts.values()))
+            if wait:
+                raise self._shed("customer_rate", wait, label)
+            taken = []
+            for tool, n in counts.items():
+                tool_bucket = self.tools.get(tool)
+                if tool_bucket is None:
+                    continue
+                before = tool_bucket.refill(now)
+                wait = tool_bucket.take(now, n)
+                if wait:
+                    bucket.refund(sum(counts.values()))
+                    for b, m in taken:
+                        b.refund(m)
+                    raise self._shed("tool_rate", wait, tool)
+                taken.append((tool_bucket, before - tool_bucket.tokens))
+
+    def refund_rates(self, client: str, tool: str) -> None:
+        """Return the tokens check_rates took for a request that was then shed."""
+        with self._lock:
+            bucket = self.clients.get(client)
+            if bucket is not None:
+                bucket.refund()
+            tool_bucket = self.tools.get(tool)
+            if tool_bucket is not None:
+                tool_bucket.refund()
+
+    def check_batch(self, user_texts: Iterable[str], client: str = LOCAL_CLIENT) -> None:
+        """Rate-limit a /chat/batch request by its size; raises Shed."""
+        counts: dict[str, int] = {}
+        for text in user_texts:
+            tool = classify_tool(text)
+            counts[tool] = counts.get(tool, 0) + 1
+        if counts:
+            self.check_rates(client, counts)
+
+    async def acquire(self, tool: str) -> None:
+        """Take an in-flight slot, waiting in the tool's lane when none is free."""
+        lane = LANES.get(tool, 1)
+        timeout = settings.admission_queue_timeout_s
+        if self.in_flight < self.max_inflight and not self._waiters:
+            self.in_flight += 1
+            return
+        if len(self._waiters) >= self.max_queued:
+            worst = max(self._waiters, default=None)
+            if worst is None or worst.lane <= lane:
+                raise self._shed("queue_full", timeout, tool)
+            self._waiters.remove(worst)
+            heapq.heapify(self._waiters)
+            worst.future.set_exception(self._shed("queue_full", timeout, worst.tool))
+        waiter = _Waiter(lane, next(self._seq), tool, asyncio.get_running_loop().create_future())
+        heapq.heappush(self._waiters, waiter)
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter.future), timeout)
+        except asyncio.TimeoutError:
+            if waiter.future.done():
+                return waiter.future.result()  # handed a slot (or shed) just as the wait timed out
+            self._forget(waiter)
+            raise self._shed("queue_timeout", timeout, tool)
+        except asyncio.CancelledError:
+            if waiter.future.done() and not waiter.future.cancelled() and waiter.future.exception() is None:
+                self.release()  # pass on the slot we were just handed
+            else:
+                self._forget(waiter)
+            raise
+
+    def _forget(self, waiter: _Waiter) -> None:
+        waiter.future.cancel()
+        if waiter in self._waiters:
+            self._waiters.remove(waiter)
+            heapq.heapify(self._waiters)
+
+    def release(self) -> None:
+        """Hand the slot to the best waiter, or free it."""
+        while self._waiters:
+            waiter = heapq.heappop(self._waiters)
+            if not waiter.future.done():
+                waiter.future.set_result(None)
+                return
+        self.in_flight -= 1
+
+    @asynccontextmanager
+    async def admit(self, user_text: str, client: str = LOCAL_CLIENT) -> AsyncIterator[Admission]:
+        """Hold an in-flight slot for the request; raises Shed when it is not admitted."""
+        tool = classify_tool(user_text)
+        self.check_rates(client, tool)
+        try:
+            await self.acquire(tool)
+        except Shed:
+            self.refund_rates(client, tool)
+            raise
+        self.admitted += 1
+        admission = Admission(client, tool)
+        try:
+            yield admission
+        finally:
+            pending = admission.pending
+            if pending is None or pending.done():
+                self.release()
+            else:
+                # A timed-out request's executor job keeps running; the slot is freed when it ends.
+                loop = asyncio.get_running_loop()
+                pending.add_done_callback(lambda _: _call_soon(loop, self.release))
+
+    def stats(self) -> dict:
+        queued: dict[int, int] = {}
+        for waiter in self._waiters:
+            queued[waiter.lane] = queued.get(waiter.lane, 0) + 1
+        return {
+            "in_flight": self.in_flight,
+            "max_inflight": self.max_inflight,
+            "queued": len(self._waiters),
+            "queued_by_lane": queued,
+            "lanes": {name: LANES[name] for name in sorted(LANES, key=LANES.get)},
+            "admitted": self.admitted,
+            "shed": dict(self.shed),
+            "clients_tracked": len(self.clients),
+            "tool_tokens": {name: round(b.tokens, 2) for name, b in self.tools.items()},
+        }
+
+
+def _call_soon(loop: asyncio.AbstractEventLoop, fn) -> None:
+    with suppress(RuntimeError):  # the loop has shut down
+        loop.call_soon_threadsafe(fn)
+
+
+def shed_response(shed: Shed) -> dict:
+    retry = round(min(shed.retry_after_s, 3600.0), 2)
+    return trusted_dict(
+        AgentResponse,
+        summary=f"We're handling a high volume of requests right now. Please retry in about {max(1, round(retry))} seconds.",
+        payload={"type": "shed", "reason": shed.reason, "tool": shed.tool, "retry_after_s": retry},
+        handoff_required=False,
+    )
+
+
+# Created lazily: waiters' futures belong to the serving event loop.
+_controller: AdmissionController | None = None
+
+
+def get_admission_controller() -> AdmissionController:
+    global _controller
+    if _controller is None:
+        _controller = AdmissionController()
+        logger.info("Admission control: %d in flight, tool rates %s", _controller.max_inflight, _controller.tool_rates)
+    return _controller
+
+
+def admission_stats() -> dict:
+    return get_admission_controller().stats()
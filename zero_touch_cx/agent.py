@@ -1,31 +1,62 @@
 from __future__ import annotations
 
+import asyncio
+from contextlib import suppress
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from datetime import date, timedelta
+from typing import AsyncIterator, Iterable, Iterator
+
 from dotenv import load_dotenv
 load_dotenv()
 
 from google.adk.agents.llm_agent import Agent
 
 from zero_touch_cx.agents.reporting_agent import reporting_agent
-from zero_touch_cx.agents.compliance_agent import validate_and_sanitize
+from zero_touch_cx.agents.compliance_agent import (
+    validate_and_sanitize,
+    validate_and_sanitize_batch,
+)
 from zero_touch_cx.agents.billing_agent import billing_agent
+from zero_touch_cx.agents.tools import (
+    iter_wire_status_report_pages,
+    summarize_wire_status,
+)
+from zero_touch_cx.agents.report_cards import (
+    WIRE_STATUS_REPORT_ID,
+    build_wire_status_card,
+    wants_chart,
+    wants_rows,
+    wire_status_kpis,
+)
 from zero_touch_cx.agents.upgrade_agent import upgrade_agent
 from zero_touch_cx.agents.root_orchestration_agent import root_orchestrator_agent
+from zero_touch_cx.agents.fast_path import fast_path_callbacks
 from zero_touch_cx.agents.intent_tools import (
+    DOMAIN_INTENTS,
     classify_intent,
+    classify_intents,
     extract_customer_id,
     extract_days,
 )
 from zero_touch_cx.tools.dlp_tools import mask_pii
+from zero_touch_cx.tools.billing_tools import prepare_upgrade
 from zero_touch_cx.schemas import AgentResponse
-from zero_touch_cx.observability import setup_logging, setup_tracing
+from zero_touch_cx.serialization import trusted_dict
+from zero_touch_cx.observability import logger, setup_observability
+from zero_touch_cx.profiling import profiled
+from zero_touch_cx.scheduler import cached_report_card
+from zero_touch_cx.sessions import session_state
+from zero_touch_cx.executors import submit_blocking
+from zero_touch_cx.tools.query_builder import QueryBudgetExceeded
+from zero_touch_cx.admission import LOCAL_CLIENT, Admission, Shed, get_admission_controller, shed_response
 from zero_touch_cx.config import settings
 
 # ---------------------------------------------------------------------
-# Observability
+# Observability (runs once per process; deferred to first request in lazy mode)
 # ---------------------------------------------------------------------
 
-setup_logging()
-setup_tracing(settings.project)
+if not settings.lazy_init:
+    setup_observability(settings.project)
 
 # ---------------------------------------------------------------------
 # Agent Instructions
@@ -47,105 +78,285 @@ COMPLIANCE_INSTRUCTION = (
 # Root Orchestrator Logic (Business Routing)
 # ---------------------------------------------------------------------
 
-def root_handle(user_text: str) -> dict:
-    masked_text = mask_pii(user_text).get("masked_text", user_text)
-
-    intent_info = classify_intent(user_text)
-    intent = intent_info.get("intent")
-    confidence = float(intent_info.get("confidence", 0.0))
-
-    if confidence < 0.80 or intent in ("ambiguous", "other"):
-        return AgentResponse(
-            summary="I need a bit more detail to help you.",
-            payload={
-                "detected_intent": intent,
-                "confidence": confidence,
-                "masked_user_text": masked_text,
-            },
-            handoff_required=confidence < 0.50,
-            handoff_reason="Low confidence intent classification"
-            if confidence < 0.50
-            else None,
-        ).model_dump()
-
-    customer_id = extract_customer_id(user_text).get("customer_id", "cust_001")
-
-    # ---------------- Billing ----------------
-    if intent == "billing_inquiry":
-        payload = billing_agent.tools[-1](customer_id, user_text)
-        return AgentResponse(
-            summary=f"Here’s the billing information for customer {customer_id}.",
-            payload=payload,
-        ).model_dump()
-
-    # ---------------- Reporting ----------------
+def _needs_clarification(intent: str | None, confidence: float) -> bool:
+    return confidence < 0.80 or intent in ("ambiguous", "other")
+
+def _clarification(intent: str | None, confidence: float, masked_text: str) -> dict:
+    return trusted_dict(
+        AgentResponse,
+        summary="I need a bit more detail to help you.",
+        payload={
+            "detected_intent": intent,
+            "confidence": confidence,
+            "masked_user_text": masked_text,
+        },
+        handoff_required=confidence < 0.50,
+        handoff_reason="Low confidence intent classification"
+        if confidence < 0.50
+        else None,
+    )
+
+def _route_args(intent: str, user_text: str) -> tuple[str, object]:
+    """Customer and the per-intent argument (days / requested plan) for a domain call."""
+    found = extract_customer_id(user_text)
+    customer_id = found.get("customer_id", "cust_001")
     if intent == "report_request":
-        days = int(extract_days(user_text).get("days", 30))
-        payload = reporting_agent.tools[-1](customer_id, days)
-        return AgentResponse(
-            summary=f"Your wire transfer report for the last {days} days is ready.",
-            payload=payload,
-        ).model_dump()
-
-    # ---------------- Upgrade ----------------
+        return customer_id, int(extract_days(user_text).get("days", 30))
     if intent == "plan_upgrade":
+        # A follow-up such as "CONFIRM UPGRADE" refers to the plan quoted earlier in the session.
+        session = session_state(customer_id if found.get("found") else None) or {}
+        quoted = (session.get("upgrade_quote") or {}).get("requested_plan")
         requested_plan = next(
             (
                 p.capitalize()
                 for p in ["basic", "starter", "pro", "max"]
                 if p in user_text.lower()
             ),
-            "Pro",
+            quoted or "Pro",
         )
-        payload = upgrade_agent.tools[-1](
-            customer_id, requested_plan, user_text
+        return session.get("customer_id", customer_id), requested_plan
+    return customer_id, None
+
+def _fetch_payload(intent: str, customer_id: str, arg, user_text: str) -> dict:
+    """The blocking domain call (BigQuery / billing / upgrade tools)."""
+    if intent == "billing_inquiry":
+        return billing_agent.tools[-1](customer_id, user_text)
+    if intent == "report_request":
+        end = date.today()
+        start_date, end_date = (end - timedelta(days=arg)).isoformat(), end.isoformat()
+        include_rows = wants_rows(user_text)
+        # Scheduled reports are precomputed (scheduler.py); live queries only when stale.
+        card = None if include_rows else cached_report_card(customer_id, WIRE_STATUS_REPORT_ID, start_date, end_date)
+        return card or build_wire_status_card(
+            customer_id, start_date, end_date, include_rows=include_rows, with_chart=wants_chart(user_text)
         )
-        return AgentResponse(
-            summary=f"I’ve prepared your upgrade to the {requested_plan} plan.",
-            payload=payload,
-        ).model_dump()
+    # Only enqueues (after CONFIRM UPGRADE); the billing write is done by the upgrade queue worker.
+    return prepare_upgrade(customer_id, arg, user_text)
 
-    return AgentResponse(
+def _domain_response(intent: str, customer_id: str, arg, payload: dict) -> dict:
+    if intent == "billing_inquiry":
+        summary = f"Here’s the billing information for customer {customer_id}."
+    elif intent == "report_request":
+        summary = f"Your wire transfer report for the last {arg} days is ready."
+    elif payload.get("upgrade", {}).get("status") == "success":
+        summary = f"Your upgrade to the {arg} plan is submitted (ticket {payload['upgrade']['ticket_id']})."
+    else:
+        summary = f"I’ve prepared your upgrade to the {arg} plan."
+    return trusted_dict(AgentResponse, summary=summary, payload=payload)
+
+@profiled("root_handle")
+def root_handle(user_text: str, intent_info: dict | None = None) -> dict:
+    """``intent_info`` skips classification when the caller already classified ``user_text``."""
+    setup_observability(settings.project)
+    masked_text = mask_pii(user_text).get("masked_text", user_text)
+
+    intent_info = intent_info or classify_intent(user_text)
+    intent = intent_info.get("intent")
+    confidence = float(intent_info.get("confidence", 0.0))
+
+    if _needs_clarification(intent, confidence):
+        return _clarification(intent, confidence, masked_text)
+
+    # ---------------- Billing / Reporting / Upgrade ----------------
+    if intent in DOMAIN_INTENTS:
+        customer_id, arg = _route_args(intent, user_text)
+        payload = _fetch_payload(intent, customer_id, arg, user_text)
+        return _domain_response(intent, customer_id, arg, payload)
+
+    return trusted_dict(
+        AgentResponse,
         summary="I’m not able to support this request yet.",
         payload={"masked_user_text": masked_text},
-    ).model_dump()
+    )
 
 # ---------------------------------------------------------------------
 # Compliance Gate (Runs ONCE)
 # ---------------------------------------------------------------------
 
+def _compliance_block(decision: dict) -> dict:
+    return trusted_dict(
+        AgentResponse,
+        summary="I can’t process this request yet.",
+        payload={
+            "type": "compliance_block",
+            "reason": decision.get("reason"),
+            "risk_score": decision.get("risk_score"),
+            "pii_masked": decision.get("pii_masked"),
+        },
+        handoff_required=decision.get("risk_score", 0) >= 0.85,
+        handoff_reason="Sensitive data detected"
+        if decision.get("risk_score", 0) >= 0.85
+        else None,
+    )
+
+def _attach_compliance(response: dict, decision: dict) -> dict:
+    response["payload"] = response.get("payload") or {}
+    response["payload"]["compliance"] = {
+        "allow": True,
+        "risk_score": decision.get("risk_score"),
+        "pii_masked": decision.get("pii_masked"),
+    }
+    return response
+
+@profiled("compliance_gate")
 def compliance_gate(user_text: str) -> dict:
+    setup_observability(settings.project)
     decision = validate_and_sanitize(user_text)
 
     # ❌ Blocked
     if not decision.get("allow", False):
-        return AgentResponse(
-            summary="I can’t process this request yet.",
-            payload={
-                "type": "compliance_block",
-                "reason": decision.get("reason"),
-                "risk_score": decision.get("risk_score"),
-                "pii_masked": decision.get("pii_masked"),
-            },
-            handoff_required=decision.get("risk_score", 0) >= 0.85,
-            handoff_reason="Sensitive data detected"
-            if decision.get("risk_score", 0) >= 0.85
-            else None,
-        ).model_dump()
+        return _compliance_block(decision)
 
     # ✅ Allowed → call orchestrator directly
     sanitized_text = decision.get("sanitized_text", user_text)
     response = root_handle(sanitized_text)
 
     # Attach compliance metadata
-    response.setdefault("payload", {})
-    response["payload"]["compliance"] = {
-        "allow": True,
-        "risk_score": decision.get("risk_score"),
-        "pii_masked": decision.get("pii_masked"),
-    }
+    return _attach_compliance(response, decision)
 
-    return response
+# ---------------------------------------------------------------------
+# Async Compliance Gate (API path)
+# ---------------------------------------------------------------------
+
+def _timeout_response(timeout_s: float) -> dict:
+    return trusted_dict(
+        AgentResponse,
+        summary="This is taking longer than expected. Please try again shortly.",
+        payload={"type": "timeout", "timeout_s": timeout_s},
+        handoff_required=True,
+        handoff_reason="Request timed out",
+    )
+
+async def compliance_gate_async(user_text: str, client: str = LOCAL_CLIENT) -> dict:
+    """
+    Non-blocking variant of compliance_gate for the API.
+    Admission control (per-client and per-tool rates, MAX_INFLIGHT_CHATS with
+    priority lanes; see admission.py) runs first and sheds with an AgentResponse.
+    Compliance then runs on the event loop (regex only); the blocking
+    orchestration runs on the bounded BigQuery executor, each request capped
+    by REQUEST_TIMEOUT_S.
+    """
+    setup_observability(settings.project)
+    try:
+        async with get_admission_controller().admit(user_text, client) as admission:
+            return await _admitted_gate(user_text, admission)
+    except Shed as shed:
+        return shed_response(shed)
+
+async def _admitted_gate(
+    user_text: str, admission: Admission, decision: dict | None = None, intent_info: dict | None = None
+) -> dict:
+    decision = decision or validate_and_sanitize(user_text)
+    if not decision.get("allow", False):
+        return _compliance_block(decision)
+
+    sanitized_text = decision.get("sanitized_text", user_text)
+    job = submit_blocking("bigquery", root_handle, sanitized_text, intent_info)
+    # On timeout the job keeps its worker; the in-flight slot stays taken until it finishes.
+    admission.hold_until(job)
+    try:
+        response = await asyncio.wait_for(asyncio.wrap_future(job), timeout=settings.request_timeout_s)
+    except asyncio.TimeoutError:
+        return _timeout_response(settings.request_timeout_s)
+    return _attach_compliance(response, decision)
+
+# ---------------------------------------------------------------------
+# Streaming Gate (long reports, server-sent events)
+# ---------------------------------------------------------------------
+
+async def stream_chat(user_text: str, client: str = LOCAL_CLIENT) -> AsyncIterator[tuple[str, dict]]:
+    """
+    Streaming variant of compliance_gate_async.
+    For wire status reports it yields ("summary", AgentResponse with KPIs) as soon as the
+    aggregate query returns, then ("rows", chunk) per BigQuery page, then ("done", totals).
+    Any other request yields its complete response as the summary event. A failure
+    part-way yields ("error", AgentResponse) instead of ending the stream silently;
+    "done" always comes last.
+    """
+    setup_observability(settings.project)
+    try:
+        # The stream holds its in-flight slot until the last page is sent.
+        async with get_admission_controller().admit(user_text, client) as admission:
+            decision = validate_and_sanitize(user_text)
+            sanitized_text = decision.get("sanitized_text", user_text)
+            # Classified once here; the non-streaming path reuses the result.
+            intent_info = classify_intent(sanitized_text) if decision.get("allow", False) else {}
+            intent = intent_info.get("intent")
+            if intent != "report_request" or _needs_clarification(intent, float(intent_info.get("confidence", 0.0))):
+                yield "summary", await _admitted_gate(user_text, admission, decision, intent_info or None)
+                yield "done", {"row_count": 0}
+                return
+            async for event in _stream_wire_report(admission, decision, intent, sanitized_text):
+                yield event
+    except Shed as shed:
+        yield "summary", shed_response(shed)
+        yield "done", {"row_count": 0}
+
+def _stream_error(error: Exception) -> dict:
+    if isinstance(error, asyncio.TimeoutError):
+        return _timeout_response(settings.request_timeout_s)
+    if isinstance(error, QueryBudgetExceeded):
+        summary, reason = "This report covers too much data. Please narrow the date range.", str(error)
+    else:
+        summary, reason = "Your report could not be completed. Please try again shortly.", f"BigQuery execution failed: {error}"
+    return trusted_dict(
+        AgentResponse,
+        summary=summary,
+        payload={"type": "error", "reason": reason},
+        handoff_required=not isinstance(error, QueryBudgetExceeded),
+        handoff_reason=None if isinstance(error, QueryBudgetExceeded) else "Report failed",
+    )
+
+async def _stream_wire_report(
+    admission: Admission, decision: dict, intent: str, sanitized_text: str
+) -> AsyncIterator[tuple[str, dict]]:
+    customer_id, days = _route_args(intent, sanitized_text)
+    end = date.today()
+    start_date, end_date = (end - timedelta(days=days)).isoformat(), end.isoformat()
+    timeout = settings.request_timeout_s
+
+    try:
+        counts = await asyncio.wait_for(summarize_wire_status.aio(customer_id, start_date, end_date), timeout=timeout)
+    except Exception as e:
+        logger.warning("Wire report stream failed before the summary: %s", e)
+        yield "error", _stream_error(e)
+        yield "done", {"row_count": 0}
+        return
+    response = trusted_dict(
+        AgentResponse,
+        summary=f"Your wire transfer report for the last {days} days is ready.",
+        payload={
+            "customer_id": customer_id,
+            "date_range": f"{start_date} to {end_date}",
+            "report_count": counts.get("total_count", 0),
+            "kpis": [k.model_dump() for k in wire_status_kpis(counts)],
+            "data_source": counts.get("source"),
+            "streaming": True,
+        },
+    )
+    yield "summary", _attach_compliance(response, decision)
+
+    pages = iter_wire_status_report_pages(customer_id, start_date, end_date, settings.stream_page_size)
+    sent = 0
+    try:
+        while True:
+            job = submit_blocking("bigquery", next, pages, None)
+            admission.hold_until(job)
+            try:
+                page = await asyncio.wait_for(asyncio.wrap_future(job), timeout=timeout)
+            except Exception as e:
+                logger.warning("Wire report stream failed after %d rows: %s", sent, e)
+                yield "error", _stream_error(e)
+                break
+            if page is None:
+                break
+            yield "rows", {"offset": sent, "rows": page}
+            sent += len(page)
+    finally:
+        # A timed-out page fetch may still be running in its worker thread.
+        with suppress(ValueError):
+            pages.close()
+    yield "done", {"row_count": sent}
 
 # ---------------------------------------------------------------------
 # Human-Friendly Renderer (Presentation Layer)
@@ -164,7 +375,7 @@ def render_human_response(agent_response: dict) -> str:
         )
 
     # Reporting
-    if "report" in payload:
+    if payload.get("kind") == "report_card" or "report" in payload:
         return (
             "📄 **Wire Transfer Report Ready**\n\n"
             f"{summary}"
@@ -178,7 +389,7 @@ def render_human_response(agent_response: dict) -> str:
         )
 
     # Upgrade
-    if "upgrade" in payload:
+    if payload.get("kind") == "upgrade_decision" or "upgrade" in payload:
         return (
             "🚀 **Plan Upgrade**\n\n"
             f"{summary}"
@@ -187,6 +398,11 @@ def render_human_response(agent_response: dict) -> str:
     return summary
 
 
+# High-confidence, well-formed requests skip the model entirely (see agents/fast_path.py)
+_fast_path_before_model, _fast_path_after_model = fast_path_callbacks(
+    compliance_gate, render_human_response
+)
+
 # ✅ Only root agent ADK should load
 root_agent = Agent(
     model="gemini-2.0-flash",
@@ -195,6 +411,8 @@ root_agent = Agent(
     instruction=COMPLIANCE_INSTRUCTION,
     tools=[compliance_gate],
     sub_agents=[root_orchestrator_agent],
+    before_model_callback=_fast_path_before_model,
+    after_model_callback=_fast_path_after_model,
 )
 
 # ---------------------------------------------------------------------
@@ -210,4 +428,80 @@ def handle_user_input(user_text: str) -> dict:
     return {
         "message": render_human_response(raw_response),
         "data": raw_response,  # structured, auditable output
-    }
\ No newline at end of file
+    }
+
+# ---------------------------------------------------------------------
+# Batch Entry Point (bulk ticket processing)
+# ---------------------------------------------------------------------
+
+def compliance_gate_batch(user_texts: Iterable[str]) -> Iterator[dict]:
+    """
+    Batch form of compliance_gate. Yields one AgentResponse dict per input, in input order.
+    Compliance and intent classification run as one pass over the batch; domain calls are
+    grouped by (intent, customer, argument) so each group hits BigQuery once, and groups
+    run concurrently on the BigQuery executor.
+    """
+    setup_observability(settings.project)
+    texts = list(user_texts)
+    decisions = validate_and_sanitize_batch(texts)
+    sanitized = [d.get("sanitized_text", t) for d, t in zip(decisions, texts)]
+    allowed = [i for i, d in enumerate(decisions) if d.get("allow", False)]
+    intents = dict(zip(allowed, classify_intents([sanitized[i] for i in allowed])))
+
+    groups: dict[tuple, list[int]] = {}
+    routes: dict[int, tuple] = {}
+    for i in allowed:
+        intent = intents[i].get("intent")
+        if _needs_clarification(intent, float(intents[i].get("confidence", 0.0))) or intent not in DOMAIN_INTENTS:
+            continue
+        customer_id, arg = _route_args(intent, sanitized[i])
+        # Upgrades act on the exact wording (e.g. CONFIRM UPGRADE), so they are never shared;
+        # reports are shared only between messages asking for the same rows and chart.
+        if intent == "plan_upgrade":
+            variant = sanitized[i]
+        elif intent == "report_request":
+            variant = (wants_rows(sanitized[i]), wants_chart(sanitized[i]))
+        else:
+            variant = None
+        key = (intent, customer_id, arg, variant)
+        groups.setdefault(key, []).append(i)
+        routes[i] = key
+
+    futures = {
+        key: submit_blocking("bigquery", _fetch_payload, key[0], key[1], key[2], sanitized[members[0]])
+        for key, members in groups.items()
+    }
+
+    for i, decision in enumerate(decisions):
+        if not decision.get("allow", False):
+            yield _compliance_block(decision)
+            continue
+        if i not in routes:
+            # Clarification / unsupported: no I/O, answer exactly like root_handle would.
+            yield _attach_compliance(root_handle(sanitized[i]), decision)
+            continue
+        intent, customer_id, arg, _ = key = routes[i]
+        try:
+            payload = futures[key].result(timeout=settings.request_timeout_s)
+        except FutureTimeoutError:
+            yield _timeout_response(settings.request_timeout_s)
+            continue
+        except Exception as e:
+            yield trusted_dict(
+                AgentResponse,
+                summary="I couldn’t complete this request.",
+                payload={"type": "error", "error": str(e)},
+                handoff_required=True,
+                handoff_reason="Domain tool failed",
+            )
+            continue
+        response = _domain_response(intent, customer_id, arg, dict(payload or {}))
+        yield _attach_compliance(response, decision)
+
+def handle_user_inputs(user_texts: Iterable[str]) -> Iterator[dict]:
+    """Batch form of handle_user_input; yields results in input order."""
+    for raw_response in compliance_gate_batch(user_texts):
+        yield {
+            "message": render_human_response(raw_response),
+            "data": raw_response,
+        }
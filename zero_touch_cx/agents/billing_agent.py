@@ -1,9 +1,9 @@
 from __future__ import annotations
 from google.adk.agents.llm_agent import Agent
-#from ..tools.bigquery_tools import get_billing_history
+from ..tools.billing_data import billing_history
 from ..schemas import AgentResponse
+from ..serialization import trusted_dict
 from ..observability import span
-import json
 from datetime import datetime
 
 INSTRUCTION = (
@@ -12,8 +12,12 @@ INSTRUCTION = (
     "Return ONLY AgentResponse in human readbale conversation format."
 )
 
-def get_billing_history(customer_id, start_of_month, end_of_month):
-    return {}
+def get_billing_history(customer_id: str, start_of_month: str, end_of_month: str) -> dict:
+    """
+    Billing line items (one per plan period, prorated by day) and the total for a
+    customer between two dates of the same month, in YYYY-MM-DD format.
+    """
+    return billing_history(customer_id, start_of_month, end_of_month)
 
 def get_customer_billing_summary(customer_id: str, user_text: str) -> dict:
     with span("get_customer_billing_summary", customer_id=customer_id):
@@ -24,7 +28,7 @@ def get_customer_billing_summary(customer_id: str, user_text: str) -> dict:
         billing_data = get_billing_history(customer_id, start_of_month, end_of_month)
 
         if billing_data and billing_data.get("status") == "success":
-            total_amount = sum(item.get("amount", 0) for item in billing_data.get("history", []))
+            total_amount = billing_data.get("total_amount", 0.0)
             summary_message = (
                 f"Here is the billing summary for customer ID {customer_id} "
                 f"from {start_of_month} to {end_of_month}: "
@@ -54,13 +58,13 @@ def get_customer_billing_summary(customer_id: str, user_text: str) -> dict:
             handoff_required = True
             handoff_reason = "Failed to retrieve billing data or no data for the current month."
 
-        resp = AgentResponse(
+        return trusted_dict(
+            AgentResponse,
             summary=summary_message,
             payload=payload,
             handoff_required=handoff_required,
             handoff_reason=handoff_reason,
         )
-        return json.loads(resp.model_dump_json())
 
 billing_agent = Agent(
     model="gemini-2.0-flash",
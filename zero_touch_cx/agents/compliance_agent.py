@@ -22,7 +22,8 @@ import re
 from dataclasses import dataclass
 from typing import Any, Dict, List, Optional, Tuple
 
-from zero_touch_cx.tools.dlp_tools import mask_pii
+from zero_touch_cx.observability import span
+from zero_touch_cx.tools.dlp_tools import mask_pii, mask_pii_batch
 
 
 # -----------------------------
@@ -110,6 +111,17 @@ def validate_and_sanitize(user_text: str) -> Dict[str, Any]:
 
     # 1) Mask PII using existing DLP helper (works locally; can be swapped for Cloud DLP)
     masked_out = mask_pii(user_text)
+    return _decide(user_text, masked_out)
+
+
+def validate_and_sanitize_batch(user_texts: List[str]) -> List[Dict[str, Any]]:
+    """Batch form of validate_and_sanitize: PII masking runs as one pass over all texts."""
+    texts = [t or "" for t in user_texts]
+    with span("validate_and_sanitize_batch", size=len(texts)):
+        return [_decide(t, m) for t, m in zip(texts, mask_pii_batch(texts))]
+
+
+def _decide(user_text: str, masked_out: Dict[str, Any]) -> Dict[str, Any]:
     sanitized = masked_out.get("masked_text", user_text)
 
     violations = []
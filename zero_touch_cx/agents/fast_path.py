@@ -0,0 +1,120 @@
+"""Deterministic fast-path router in front of the LLM.
+
+Every ADK turn normally spends a model round trip just to decide to call the
+gateway tool, and another to phrase its result. For well-formed requests that
+classify_intent already recognises with high confidence (a domain intent at or above
+FAST_PATH_MIN_CONFIDENCE, with an explicit customer id), the before-model callback
+runs the handler on the "bigquery" executor (it is blocking) and returns its
+rendered answer as the model response. Ambiguous requests fall through to the LLM
+unchanged.
+
+Each routing decision is logged and counted; router_stats() reports the counts, the
+measured model latency (EMA) and the estimated latency saved.
+"""
+
+from __future__ import annotations
+
+import re
+import threading
+import time
+from typing import Callable
+
+from google.adk.models.llm_response import LlmResponse
+from google.genai import types
+
+from ..cache import TTLCache
+from ..config import settings
+from ..executors import run_blocking
+from ..observability import logger, span
+from .intent_tools import DOMAIN_INTENTS, classify_intent
+
+_CUSTOMER_RE = re.compile(r"\bcust_\d{3}\b", re.IGNORECASE)
+# A skipped turn avoids the tool-selection call and the answer-phrasing call.
+MODEL_CALLS_SAVED_PER_TURN = 2
+
+_stats = {"fast_path": 0, "llm": 0, "saved_ms": 0.0, "model_ms_ema": None}
+_stats_lock = threading.Lock()
+# Start time per invocation; entries whose after-callback never runs (model error, cancellation) expire.
+_model_started = TTLCache(maxsize=4096, ttl_s=600)
+
+
+def router_stats() -> dict:
+    with _stats_lock:
+        return dict(_stats)
+
+
+def route_decision(user_text: str) -> tuple[bool, str]:
+    """(take_fast_path, reason) for a user message."""
+    if not settings.fast_path_enabled:
+        return False, "disabled"
+    info = classify_intent(user_text)
+    intent, confidence = info.get("intent"), float(info.get("confidence", 0.0))
+    if intent not in DOMAIN_INTENTS:
+        return False, f"intent={intent}"
+    if confidence < settings.fast_path_min_confidence:
+        return False, "low_confidence"
+    if not _CUSTOMER_RE.search(user_text):
+        return False, "missing_customer_id"
+    return True, f"intent={intent}"
+
+
+def _latest_user_text(llm_request) -> str | None:
+    """The new user message, or None when the model is being asked about tool output."""
+    if not llm_request.contents:
+        return None
+    last = llm_request.contents[-1]
+    if last.role != "user" or not last.parts:
+        return None
+    if any(p.function_response for p in last.parts):
+        return None
+    text = "".join(p.text or "" for p in last.parts).strip()
+    return text or None
+
+
+def _estimated_model_ms() -> float:
+    ema = _stats["model_ms_ema"]
+    return ema if ema is not None else settings.fast_path_assumed_model_ms
+
+
+def fast_path_callbacks(handler: Callable[[str], dict], render: Callable[[dict], str]):
+    """(before_model_callback, after_model_callback) for an ADK Agent.
+
+    ``handler`` is the deterministic pipeline (e.g. compliance_gate) and ``render``
+    turns its AgentResponse dict into the user-facing text.
+    """
+
+    async def before_model(callback_context, llm_request):
+        text = _latest_user_text(llm_request)
+        take, reason = route_decision(text) if text is not None else (False, "tool_output")
+        if not take:
+            with _stats_lock:
+                if text is not None:
+                    _stats["llm"] += 1
+            _model_started.set(callback_context.invocation_id, time.perf_counter())
+            logger.info("router: llm (%s)", reason)
+            return None
+
+        with span("fast_path", reason=reason):
+            started = time.perf_counter()
+            result = await run_blocking("bigquery", handler, text)
+            handler_ms = (time.perf_counter() - started) * 1000
+        with _stats_lock:
+            saved = max(0.0, MODEL_CALLS_SAVED_PER_TURN * _estimated_model_ms() - handler_ms)
+            _stats["fast_path"] += 1
+            _stats["saved_ms"] += saved
+        logger.info("router: fast_path (%s), handler %.1fms, ~%.0fms saved", reason, handler_ms, saved)
+        return LlmResponse(
+            content=types.Content(role="model", parts=[types.Part(text=render(result))]),
+            custom_metadata={"route": "fast_path", "reason": reason},
+        )
+
+    def after_model(callback_context, llm_response):
+        started = _model_started.pop(callback_context.invocation_id, None)
+        if started is not None:
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            with _stats_lock:
+                ema = _stats["model_ms_ema"]
+                _stats["model_ms_ema"] = elapsed_ms if ema is None else 0.8 * ema + 0.2 * elapsed_ms
+        return None
+
+    return before_model, after_model
@@ -0,0 +1,164 @@
+"""Hashed n-gram linear intent model for bulk classification.
+
+Messages are tokenised into word unigrams and bigrams, hashed into a fixed number of
+buckets (no vocabulary to store) and scored by a multinomial logistic regression.
+Scoring a batch is vectorised with NumPy: all (message, bucket) pairs of the batch
+are gathered into flat index arrays and reduced per class with ``np.bincount``.
+
+Training happens offline from labeled samples (``data/intent_samples.csv``):
+
+    python -m zero_touch_cx.agents.intent_model train data/intent_samples.csv artifacts/intent_model.npz
+
+``load_intent_model()`` reads INTENT_MODEL_PATH; when no trained file exists it trains
+from the bundled samples once per process.
+"""
+
+from __future__ import annotations
+
+import csv
+import re
+import sys
+import threading
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+from ..config import settings
+from ..observability import logger, span
+
+ROOT = Path(__file__).resolve().parents[2]
+SAMPLES_PATH = ROOT / "data" / "intent_samples.csv"
+N_FEATURES = 2 ** 16
+
+_TOKEN_RE = re.compile(r"[a-z0-9_]+")
+
+
+def _tokens(text: str) -> list[str]:
+    words = _TOKEN_RE.findall(text.lower())
+    return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+
+def featurize(texts: list[str], n_features: int = N_FEATURES) -> tuple[np.ndarray, np.ndarray]:
+    """Flat (row, bucket) index arrays for a batch; duplicates count as repeated features."""
+    rows: list[int] = []
+    cols: list[int] = []
+    for i, text in enumerate(texts):
+        buckets = [zlib.crc32(tok.encode("utf-8")) % n_features for tok in _tokens(text)]
+        rows.extend([i] * len(buckets))
+        cols.extend(buckets)
+    return np.asarray(rows, dtype=np.int64), np.asarray(cols, dtype=np.int64)
+
+
+@dataclass
+class IntentModel:
+    classes: np.ndarray  # (C,) intent names
+    weights: np.ndarray  # (n_features, C)
+    bias: np.ndarray  # (C,)
+
+    @property
+    def n_features(self) -> int:
+        return self.weights.shape[0]
+
+    def _scores(self, rows: np.ndarray, cols: np.ndarray, n: int) -> np.ndarray:
+        gathered = self.weights[cols]
+        scores = np.empty((n, len(self.classes)), dtype=np.float64)
+        for c in range(len(self.classes)):
+            scores[:, c] = np.bincount(rows, weights=gathered[:, c], minlength=n)
+        return scores + self.bias
+
+    def predict_proba(self, texts: list[str]) -> np.ndarray:
+        rows, cols = featurize(texts, self.n_features)
+        return _softmax(self._scores(rows, cols, len(texts)))
+
+    def predict(self, texts: list[str]) -> list[dict]:
+        """Same contract as classify_intent: [{"intent", "confidence"}, ...]."""
+        proba = self.predict_proba(texts)
+        best = proba.argmax(axis=1)
+        confidence = np.round(proba[np.arange(len(texts)), best], 2)
+        return [
+            {"intent": str(self.classes[b]), "confidence": float(p)}
+            for b, p in zip(best, confidence)
+        ]
+
+    def save(self, path: str | Path) -> None:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        np.savez_compressed(path, classes=self.classes, weights=self.weights, bias=self.bias)
+
+    @classmethod
+    def load(cls, path: str | Path) -> "IntentModel":
+        with np.load(path, allow_pickle=False) as data:
+            return cls(classes=data["classes"], weights=data["weights"], bias=data["bias"])
+
+
+def _softmax(scores: np.ndarray) -> np.ndarray:
+    scores = scores - scores.max(axis=1, keepdims=True)
+    exp = np.exp(scores)
+    return exp / exp.sum(axis=1, keepdims=True)
+
+
+def train(
+    texts: list[str],
+    labels: list[str],
+    n_features: int = N_FEATURES,
+    epochs: int = 300,
+    lr: float = 0.5,
+    l2: float = 1e-4,
+) -> IntentModel:
+    """Full-batch gradient descent on the softmax cross-entropy loss."""
+    classes = np.array(sorted(set(labels)))
+    y = np.searchsorted(classes, np.array(labels))
+    n, n_classes = len(texts), len(classes)
+    rows, cols = featurize(texts, n_features)
+    onehot = np.eye(n_classes)[y]
+    model = IntentModel(classes, np.zeros((n_features, n_classes)), np.zeros(n_classes))
+    for _ in range(epochs):
+        error = (_softmax(model._scores(rows, cols, n)) - onehot) / n
+        grad = np.zeros_like(model.weights)
+        np.add.at(grad, cols, error[rows])
+        model.weights -= lr * (grad + l2 * model.weights)
+        model.bias -= lr * error.sum(axis=0)
+    return model
+
+
+def load_samples(path: str | Path = SAMPLES_PATH) -> tuple[list[str], list[str]]:
+    with open(path, newline="", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    return [r["text"] for r in rows], [r["intent"] for r in rows]
+
+
+_model: IntentModel | None = None
+_model_lock = threading.Lock()
+
+
+def load_intent_model() -> IntentModel:
+    global _model
+    if _model is None:
+        with _model_lock:
+            if _model is None:
+                path = Path(settings.intent_model_path)
+                if path.exists():
+                    _model = IntentModel.load(path)
+                else:
+                    logger.warning("No intent model at %s; training from %s", path, SAMPLES_PATH)
+                    with span("train_intent_model"):
+                        _model = train(*load_samples())
+    return _model
+
+
+def main(argv: list[str]) -> int:
+    if len(argv) != 3 or argv[0] != "train":
+        print("usage: python -m zero_touch_cx.agents.intent_model train SAMPLES.csv OUT.npz")
+        return 2
+    texts, labels = load_samples(argv[1])
+    model = train(texts, labels)
+    accuracy = np.mean([p["intent"] == l for p, l in zip(model.predict(texts), labels)])
+    model.save(argv[2])
+    print(f"trained on {len(texts)} samples, train accuracy {accuracy:.3f} -> {argv[2]}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
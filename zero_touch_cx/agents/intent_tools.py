@@ -5,26 +5,70 @@ import re
 
 Intent = Literal["report_request","plan_upgrade","ambiguous","other", "billing_inquiry"]
 
+# Intents that route to a domain agent/tool.
+DOMAIN_INTENTS = ("billing_inquiry", "report_request", "plan_upgrade")
+
+_REPORT_RE = re.compile(r"\breport\b|status report|wire status")
+_UPGRADE_RE = re.compile(r"\bupgrade\b|\bpro\b|plan\b")
+_BILLING_RE = re.compile(r"\bbilling\b")
+
+def _intent_from_text(t: str) -> dict:
+    report = bool(_REPORT_RE.search(t))
+    upgrade = bool(_UPGRADE_RE.search(t))
+    billing = bool(_BILLING_RE.search(t))
+    if billing:
+        return {"intent":"billing_inquiry","confidence":0.85}
+    if report and upgrade:
+        return {"intent":"ambiguous","confidence":0.55}
+    if report:
+        return {"intent":"report_request","confidence":0.85}
+    if upgrade:
+        return {"intent":"plan_upgrade","confidence":0.85}
+    return {"intent":"other","confidence":0.6}
+
 def classify_intent(user_text: str) -> dict:
     with span("classify_intent"):
-        t = user_text.lower()
-        report = bool(re.search(r"\breport\b|status report|wire status", t))
-        upgrade = bool(re.search(r"\bupgrade\b|\bpro\b|plan\b", t))
-        billing = bool(re.search(r"\bbilling\b", t))
-        if billing:
-            return {"intent":"billing_inquiry","confidence":0.85}
-        if report and upgrade:
-            return {"intent":"ambiguous","confidence":0.55}
-        if report:
-            return {"intent":"report_request","confidence":0.85}
-        if upgrade:
-            return {"intent":"plan_upgrade","confidence":0.85}
-        return {"intent":"other","confidence":0.6}
+        return _intent_from_text(user_text.lower())
+
+def _rule_hits(rx: re.Pattern, blob: str, starts) -> "np.ndarray":
+    """Boolean per message: does ``rx`` match inside it? One scan over the joined batch."""
+    import numpy as np
+    positions = np.fromiter((m.start() for m in rx.finditer(blob)), dtype=np.int64)
+    hits = np.zeros(len(starts), dtype=bool)
+    hits[np.searchsorted(starts, positions, side="right") - 1] = True
+    return hits
+
+def _classify_rules_batch(user_texts: list[str]) -> list[dict]:
+    """Vectorised _intent_from_text: each rule regex runs once over the whole batch."""
+    import numpy as np
+    lowered = [t.lower() for t in user_texts]
+    # Messages are joined with "\n"; no rule pattern can match across it.
+    starts = np.cumsum([0] + [len(t) + 1 for t in lowered[:-1]])
+    blob = "\n".join(lowered)
+    report, upgrade, billing = (_rule_hits(rx, blob, starts) for rx in (_REPORT_RE, _UPGRADE_RE, _BILLING_RE))
+    conditions = [billing, report & upgrade, report, upgrade]
+    intents = np.select(conditions, ["billing_inquiry", "ambiguous", "report_request", "plan_upgrade"], "other")
+    confidence = np.select(conditions, [0.85, 0.55, 0.85, 0.85], 0.6)
+    return [{"intent": str(i), "confidence": float(c)} for i, c in zip(intents, confidence)]
+
+def classify_intents(user_texts: list[str], method: Literal["rules", "model"] = "rules") -> list[dict]:
+    """Batch form of classify_intent for bulk triage.
+
+    method="rules" gives exactly the classify_intent results; method="model" scores
+    with the hashed n-gram model from intent_model.py (trained offline).
+    """
+    with span("classify_intents", size=len(user_texts), method=method):
+        if not user_texts:
+            return []
+        if method == "model":
+            from .intent_model import load_intent_model
+            return load_intent_model().predict(user_texts)
+        return _classify_rules_batch(user_texts)
 
 def extract_customer_id(user_text: str) -> dict:
     with span("extract_customer_id"):
         m = re.search(r"(cust_\d{3})", user_text.lower())
-        return {"status":"success","customer_id": (m.group(1) if m else "cust_001")}
+        return {"status":"success","customer_id": (m.group(1) if m else "cust_001"), "found": m is not None}
 
 def extract_days(user_text: str) -> dict:
     with span("extract_days"):
@@ -0,0 +1,33 @@
+"""Offline stand-in for Gemini.
+
+LocalStubLlm plugs into any ADK Agent (``Agent(model=LocalStubLlm(), ...)``) so agent
+flows, callbacks and routing can be exercised without network or credentials.
+It answers every request with a fixed text after an optional simulated latency and
+counts how often it was called.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from typing import AsyncGenerator
+
+from google.adk.models.base_llm import BaseLlm
+from google.adk.models.llm_response import LlmResponse
+from google.genai import types
+
+
+class LocalStubLlm(BaseLlm):
+    model: str = "local-stub"
+    reply: str = "This is a local stub response."
+    latency_s: float = 0.0
+    calls: int = 0
+
+    async def generate_content_async(
+        self, llm_request, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        self.calls += 1
+        if self.latency_s:
+            await asyncio.sleep(self.latency_s)
+        yield LlmResponse(
+            content=types.Content(role="model", parts=[types.Part(text=self.reply)])
+        )
@@ -0,0 +1,121 @@
+"""Result cache around model invocation.
+
+Identical turns (the same plan question from many users on the same tier) should not
+each pay a Gemini round trip. The before/after model callbacks built here key each
+call on a hash of the model, system instruction, conversation (including tool
+outputs), available tools and session state, and serve repeats from a TTL/LRU cache.
+
+Tuning: MODEL_CACHE_ENABLED, MODEL_CACHE_TTL_S, MODEL_CACHE_MAX_ENTRIES, and
+MODEL_CACHE_DISABLED_AGENTS (comma-separated agent names that opt out).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+import time
+from typing import Any
+
+from ..cache import TTLCache
+from ..config import settings
+from ..observability import logger
+
+# Function-call ids are generated per call; they must not make identical turns differ.
+# Only the id of the call/response part itself is dropped, never ids inside tool data.
+_CALL_PARTS = {"function_call", "function_response"}
+
+_cache = TTLCache(maxsize=settings.model_cache_max_entries, ttl_s=settings.model_cache_ttl_s)
+# (key, start) per invocation; entries whose after-callback never runs (model error, cancellation) expire.
+_pending = TTLCache(maxsize=4096, ttl_s=600)
+_saved_ms = 0.0
+_saved_lock = threading.Lock()
+
+
+def _jsonable(value: Any, call_part: bool = False) -> Any:
+    if hasattr(value, "model_dump"):
+        value = value.model_dump(mode="json", exclude_none=True)
+    if isinstance(value, dict):
+        return {
+            k: _jsonable(v, k in _CALL_PARTS)
+            for k, v in value.items()
+            if not (call_part and k == "id")
+        }
+    if isinstance(value, (list, tuple)):
+        return [_jsonable(v) for v in value]
+    return value
+
+
+def cache_key(agent_name: str, llm_request, state: dict | None = None) -> str:
+    config = llm_request.config
+    material = {
+        "agent": agent_name,
+        "model": llm_request.model,
+        "instruction": _jsonable(getattr(config, "system_instruction", None)),
+        "contents": _jsonable(llm_request.contents),
+        "tools": sorted(getattr(llm_request, "tools_dict", {}) or {}),
+        "state": _jsonable(state or {}),
+    }
+    blob = json.dumps(material, sort_keys=True, default=str)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+def model_cache_stats() -> dict:
+    with _saved_lock:
+        return {**_cache.stats(), "saved_ms": round(_saved_ms, 1)}
+
+
+def clear_model_cache() -> None:
+    _cache.clear()
+
+
+def _enabled_for(agent_name: str) -> bool:
+    disabled = {a.strip() for a in settings.model_cache_disabled_agents.split(",") if a.strip()}
+    return settings.model_cache_enabled and agent_name not in disabled
+
+
+def _state_of(callback_context) -> dict:
+    state = getattr(callback_context, "state", None)
+    return state.to_dict() if hasattr(state, "to_dict") else {}
+
+
+def _cacheable(llm_response) -> bool:
+    return (
+        llm_response.content is not None
+        and not llm_response.partial
+        and not llm_response.error_code
+    )
+
+
+def model_cache_callbacks(agent_name: str):
+    """(before_model_callback, after_model_callback) that cache ``agent_name``'s model calls."""
+
+    def before_model(callback_context, llm_request):
+        global _saved_ms
+        if not _enabled_for(agent_name):
+            return None
+        key = cache_key(agent_name, llm_request, _state_of(callback_context))
+        hit = _cache.get(key)
+        if hit is not None:
+            response, latency_ms = hit
+            with _saved_lock:
+                _saved_ms += latency_ms
+            logger.info("model cache hit for %s (~%.0fms saved)", agent_name, latency_ms)
+            return response.model_copy(deep=True)
+        _pending.set(callback_context.invocation_id, (key, time.perf_counter()))
+        return None
+
+    def after_model(callback_context, llm_response):
+        pending = _pending.pop(callback_context.invocation_id, None)
+        if pending is None or not _cacheable(llm_response):
+            return None
+        key, started = pending
+        stored = llm_response.model_copy(deep=True)
+        # Let ADK assign fresh function-call ids when the response is replayed.
+        for part in stored.content.parts or []:
+            if part.function_call is not None:
+                part.function_call.id = None
+        _cache.set(key, (stored, (time.perf_counter() - started) * 1000))
+        return None
+
+    return before_model, after_model
@@ -0,0 +1,231 @@
+"""ReportCard builders for the T-1004 Wire Status Report and T-2001 Usage Summary.
+
+A card carries the KPIs (pending_count, completion_rate, failed_count) computed by
+one aggregate query (summarize_wire_status: COUNTIFs in BigQuery, vectorised
+pandas in mock mode), a status chart and the data source, instead of every raw
+event row. Rows are only fetched, page by page, when the caller asks for them,
+which keeps payloads and model context small.
+
+Charts render on the single-worker "charts" executor, so the chat path only asks
+for one when the user does (wants_chart), and rendered chart links are reused per
+(customer, window, counts) for REPORT_CACHE_MAX_AGE_S.
+"""
+
+from __future__ import annotations
+
+import re
+from datetime import date, timedelta
+from typing import Any, Dict, Optional
+
+from ..cache import TTLCache
+from ..config import settings
+from ..executors import submit_blocking
+from ..observability import logger, span
+from ..schemas import KPI, ReportCard
+from .tools import iter_wire_status_report_pages, summarize_wire_status
+
+WIRE_STATUS_REPORT_ID = "T-1004"
+USAGE_SUMMARY_REPORT_ID = "T-2001"
+
+_ROWS_RE = re.compile(r"\b(raw|rows|row-level|line items|all (?:the )?events|every (?:event|transfer))\b")
+_CHART_RE = re.compile(r"\b(charts?|graphs?|plots?|visuali[sz](?:e|ation))\b")
+
+_chart_uris = TTLCache(maxsize=1024, ttl_s=settings.report_cache_max_age_s)
+
+
+def wants_rows(user_text: str) -> bool:
+    """Raw rows are only included when the user explicitly asks for them."""
+    return bool(_ROWS_RE.search(user_text.lower()))
+
+
+def wants_chart(user_text: str) -> bool:
+    """Chat answers only render a chart when the user asks for one."""
+    return bool(_CHART_RE.search(user_text.lower()))
+
+
+def wire_status_kpis(counts: dict) -> list[KPI]:
+    total = counts.get("total_count") or 0
+    completed = counts.get("completed_count") or 0
+    return [
+        KPI(name="pending_count", value=int(counts.get("pending_count") or 0)),
+        KPI(name="completion_rate", value=round(100.0 * completed / total, 1) if total else 0.0, unit="%"),
+        KPI(name="failed_count", value=int(counts.get("failed_count") or 0)),
+    ]
+
+
+def _chart_values(counts: dict) -> list[int]:
+    return [int(counts.get(k) or 0) for k in ("pending_count", "completed_count", "failed_count")]
+
+
+def _render_chart(customer_id: str, start_date: str, end_date: str, counts: dict) -> Optional[str]:
+    from ..tools.charts import bar_chart
+    from ..tools.gcs_tools import upload_artifact
+
+    filename = f"charts/{customer_id}_{WIRE_STATUS_REPORT_ID}_{start_date}_{end_date}.png"
+    path = bar_chart(
+        f"Wire status {customer_id} ({start_date} to {end_date})",
+        ["pending", "completed", "failed"],
+        _chart_values(counts),
+        filename,
+    )
+    if settings.mock_mode or not settings.gcs_bucket:
+        return f"file://{path}"
+    return upload_artifact(path, filename).get("uri")
+
+
+def _next_best_actions(counts: dict) -> list[str]:
+    actions = []
+    if counts.get("failed_count"):
+        actions.append("Review failed wires and resubmit or contact Treasury Ops.")
+    if counts.get("pending_count"):
+        actions.append("Check pending wires again later today.")
+    if not actions:
+        actions.append("No action needed.")
+    return actions
+
+
+def build_wire_status_card(
+    customer_id: str,
+    start_date: str,
+    end_date: str,
+    include_rows: bool = False,
+    with_chart: bool = True,
+) -> Dict[str, Any]:
+    """ReportCard (as a dict) for the wire status report; ``rows`` only when include_rows."""
+    with span("build_wire_status_card", customer_id=customer_id, include_rows=include_rows):
+        counts = summarize_wire_status(customer_id, start_date, end_date)
+        total = int(counts.get("total_count") or 0)
+
+        # The chart renders on the charts executor while rows (if any) are paged in.
+        chart_key = (customer_id, start_date, end_date, *_chart_values(counts))
+        chart_uri = _chart_uris.get(chart_key) if with_chart and total else None
+        chart = None
+        if with_chart and total and chart_uri is None:
+            chart = submit_blocking("charts", _render_chart, customer_id, start_date, end_date, counts)
+        rows = None
+        if include_rows:
+            rows = [r for page in iter_wire_status_report_pages(customer_id, start_date, end_date, settings.stream_page_size) for r in page]
+
+        if chart is not None:
+            try:
+                chart_uri = chart.result(timeout=settings.request_timeout_s)
+                if chart_uri:
+                    _chart_uris.set(chart_key, chart_uri)
+            except Exception as e:
+                logger.warning("Report chart failed for %s: %s", customer_id, e)
+
+        card = ReportCard(
+            customer_id=customer_id,
+            report_id=WIRE_STATUS_REPORT_ID,
+            title="Wire Status Report",
+            date_range=f"{start_date} to {end_date}",
+            kpis=wire_status_kpis(counts),
+            chart_uri=chart_uri,
+            data_source=counts.get("source", "mock"),
+            rationale=f"Computed from {total} wire status events in the date range.",
+            next_best_actions=_next_best_actions(counts),
+            confidence=0.9 if total else 0.6,
+        ).model_dump(exclude_none=True)
+        # Rows come from our own query: attach them as-is rather than validating and copying each one.
+        if rows is not None:
+            card["rows"] = rows
+        return card
+
+
+def build_usage_card(customer_id: str, start_date: str, end_date: str) -> Dict[str, Any]:
+    """ReportCard (as a dict) for the Usage Summary, answered from the usage rollups."""
+    from ..tools.usage_rollups import get_usage_summary
+
+    with span("build_usage_card", customer_id=customer_id):
+        summary = get_usage_summary(customer_id, start_date, end_date)
+        if summary.get("status") != "success":
+            raise RuntimeError(summary.get("error", "usage summary failed"))
+        total = sum(f["events"] for f in summary["by_feature"].values())
+        return ReportCard(
+            customer_id=customer_id,
+            report_id=USAGE_SUMMARY_REPORT_ID,
+            title="Usage Summary",
+            date_range=summary["date_range"],
+            kpis=[KPI(**k) for k in summary["kpis"]],
+            data_source=summary["data_source"],
+            rationale=f"Computed from {total} usage events in the date range.",
+            next_best_actions=[] if total else ["No usage recorded in this window."],
+            confidence=0.9 if total else 0.6,
+        ).model_dump(exclude_none=True)
+
+
+# Report ID -> builder(customer_id, start_date, end_date), used by the scheduler.
+REPORT_BUILDERS = {
+    WIRE_STATUS_REPORT_ID: build_wire_status_card,
+    USAGE_SUMMARY_REPORT_ID: build_usage_card,
+}
+
+
+def _window(start_date: Optional[str], end_date: Optional[str], days: int = 30) -> tuple[str, str]:
+    end = date.fromisoformat(end_date) if end_date else date.today()
+    start = date.fromisoformat(start_date) if start_date else end - timedelta(days=days)
+    return start.isoformat(), end.isoformat()
+
+
+def report_card(
+    report_id: str,
+    customer_id: str,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    include_rows: bool = False,
+) -> Dict[str, Any]:
+    """Any report's card (default: last 30 days), from the scheduled-report cache when fresh."""
+    from ..scheduler import cached_report_card
+
+    if report_id not in REPORT_BUILDERS:
+        raise KeyError(report_id)
+    start_date, end_date = _window(start_date, end_date)
+    if include_rows and report_id == WIRE_STATUS_REPORT_ID:
+        return build_wire_status_card(customer_id, start_date, end_date, include_rows=True)
+    return (
+        cached_report_card(customer_id, report_id, start_date, end_date)
+        or REPORT_BUILDERS[report_id](customer_id, start_date, end_date)
+    )
+
+
+def get_wire_status_report_card(
+    customer_id: str,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    include_rows: bool = False,
+) -> Dict[str, Any]:
+    """
+    Wire status report as a summary card: pending_count, completion_rate and
+    failed_count KPIs, a chart link and the data source. Defaults to the last 30 days.
+    Set include_rows only when the user explicitly asks for the raw rows.
+
+    Args:
+        customer_id: The ID of the customer to report on (e.g., cust_001).
+        start_date: Start date in YYYY-MM-DD format (optional).
+        end_date: End date in YYYY-MM-DD format (optional).
+        include_rows: Also return every wire status row (large).
+    """
+    try:
+        return report_card(WIRE_STATUS_REPORT_ID, customer_id, start_date, end_date, include_rows)
+    except Exception as e:
+        return {"error": f"Report generation failed: {e}", "customer_id": customer_id}
+
+
+def get_usage_summary_card(
+    customer_id: str,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Usage Summary (T-2001) as a summary card: top_feature and total_events KPIs and
+    the data source. Defaults to the last 30 days.
+
+    Args:
+        customer_id: The ID of the customer to report on (e.g., cust_001).
+        start_date: Start date in YYYY-MM-DD format (optional).
+        end_date: End date in YYYY-MM-DD format (optional).
+    """
+    try:
+        return report_card(USAGE_SUMMARY_REPORT_ID, customer_id, start_date, end_date)
+    except Exception as e:
+        return {"error": f"Usage summary failed: {e}", "customer_id": customer_id}
@@ -1,10 +1,6 @@
 from __future__ import annotations
 from google.adk import Agent
-from google.adk.tools.bigquery import BigQueryCredentialsConfig
-from google.adk.tools.bigquery import BigQueryToolset
-from google.adk.tools.bigquery.config import BigQueryToolConfig
-from google.adk.tools.bigquery.config import WriteMode
-import google.auth
+from ..config import settings
 # Import all tools from the separate tools.py file
 from .tools import (
     generate_wire_status_report,
@@ -12,24 +8,52 @@ from .tools import (
     get_intraday_balance, 
     retrieve_document_copy, 
     verify_ach_file,
+    verify_ach_bulk_file,
     
     # <<< NEW IMPORTS: The Plan Eligibility Tools >>>
     check_eligibility,
     get_customer_plan,
     suggest_higher_plan_with_benefits
 )
+from .speculative_tools import fetch_if_eligible
+from .report_cards import get_usage_summary_card, get_wire_status_report_card
+from ..tools.usage_rollups import get_usage_summary
+from .model_cache import model_cache_callbacks
 
 # --- BigQuery Toolset Configuration ---
-tool_config = BigQueryToolConfig(write_mode=WriteMode.BLOCKED)
+# Credential discovery and toolset construction are deferred to first use
+# (LAZY_INIT=true, the default) so importing the agent stays cheap on cold start.
+_bigquery_toolset = None
 
-application_default_credentials, _ = google.auth.default()
-credentials_config = BigQueryCredentialsConfig(
-    credentials=application_default_credentials
-)
+def get_bigquery_toolset():
+    global _bigquery_toolset
+    if _bigquery_toolset is None:
+        from google.adk.tools.bigquery import BigQueryCredentialsConfig
+        from google.adk.tools.bigquery import BigQueryToolset
+        from google.adk.tools.bigquery.config import BigQueryToolConfig
+        from google.adk.tools.bigquery.config import WriteMode
+        import google.auth
 
-bigquery_toolset = BigQueryToolset(
-    credentials_config=credentials_config, bigquery_tool_config=tool_config
-)
+        tool_config = BigQueryToolConfig(write_mode=WriteMode.BLOCKED)
+
+        application_default_credentials, _ = google.auth.default()
+        credentials_config = BigQueryCredentialsConfig(
+            credentials=application_default_credentials
+        )
+
+        _bigquery_toolset = BigQueryToolset(
+            credentials_config=credentials_config, bigquery_tool_config=tool_config
+        )
+    return _bigquery_toolset
+
+def __getattr__(name: str):
+    # Keeps `reporting_agent.bigquery_toolset` working without building it at import.
+    if name == "bigquery_toolset":
+        return get_bigquery_toolset()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+if not settings.lazy_init:
+    get_bigquery_toolset()
 
 # -------------------------------------------------------------------
 # Reporting Agent (with Plan Eligibility Gate)
@@ -49,11 +73,19 @@ Rules:
       with the data retrieval. Instead, respond directly to the user with the warning 
       message provided by the `check_eligibility` tool.
 3. **Tool Selection:** Determine which specific data tool is required by the query 
-   (e.g., "live balance" -> get_intraday_balance; "historical report" -> generate_wire_status_report; detailed report -> get_detailed_wire_report).
-4. **Friendly Response:** Use the output of the final successful data tool call to provide a 
+   (e.g., "live balance" -> get_intraday_balance; "historical report" -> get_wire_status_report_card, which returns KPIs and a chart link;
+   only call generate_wire_status_report or set include_rows=True when the user explicitly asks for raw rows; detailed report -> get_detailed_wire_report;
+   usage summary / top feature -> get_usage_summary_card; get_usage_summary only for hour-level windows or per-feature totals).
+4. **Preferred Path:** When you already know the data tool and its arguments, call 
+   `fetch_if_eligible` (user_query, data_tool, tool_args) instead of the two separate calls. 
+   It performs the same mandatory eligibility gate and only returns data when the 
+   feature is "INCLUDED"; otherwise relay its warning message exactly as in rule 2.
+5. **Friendly Response:** Use the output of the final successful data tool call to provide a 
    clear, user-friendly summary.
 """
 
+_cache_before_model, _cache_after_model = model_cache_callbacks("reporting_agent")
+
 reporting_agent = Agent(
     name="reporting_agent",
     model="gemini-2.0-flash",
@@ -64,16 +96,25 @@ reporting_agent = Agent(
     instruction=REPORTING_INSTRUCTION, # <<< NEW INSTRUCTION ADDED
     # Register all the implemented tool functions
     tools=[
+        # Eligibility gate + data retrieval in one step (eligibility checked in parallel)
+        fetch_if_eligible,
+
         # Plan management tools (MUST be used for eligibility check first)
         check_eligibility,
         get_customer_plan,
         suggest_higher_plan_with_benefits,
         
         # Data and operational tools (The actual work)
+        get_wire_status_report_card,
         generate_wire_status_report,
         get_detailed_wire_report,
         get_intraday_balance,
         retrieve_document_copy,
+        get_usage_summary_card,
+        get_usage_summary,
         verify_ach_file,
+        verify_ach_bulk_file,
     ],
+    before_model_callback=_cache_before_model,
+    after_model_callback=_cache_after_model,
 )
\ No newline at end of file
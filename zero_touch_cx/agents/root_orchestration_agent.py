@@ -1,11 +1,14 @@
 from __future__ import annotations
 
+from datetime import date, timedelta
+
 from dotenv import load_dotenv
 load_dotenv()
 
 from google.adk.agents.llm_agent import Agent
 
 from zero_touch_cx.agents.reporting_agent import reporting_agent
+from zero_touch_cx.agents.report_cards import get_wire_status_report_card
 from zero_touch_cx.agents.billing_agent import billing_agent
 from zero_touch_cx.agents.upgrade_agent import upgrade_agent
 from zero_touch_cx.agents.intent_tools import (
@@ -15,15 +18,17 @@ from zero_touch_cx.agents.intent_tools import (
 )
 from zero_touch_cx.tools.dlp_tools import mask_pii
 from zero_touch_cx.schemas import AgentResponse
-from zero_touch_cx.observability import setup_logging, setup_tracing
+from zero_touch_cx.serialization import trusted_dict
+from zero_touch_cx.observability import setup_observability
+from zero_touch_cx.profiling import profiled
 from zero_touch_cx.config import settings
 
 # ---------------------------------------------------------------------
-# Observability
+# Observability (runs once per process; deferred to first request in lazy mode)
 # ---------------------------------------------------------------------
 
-setup_logging()
-setup_tracing(settings.project)
+if not settings.lazy_init:
+    setup_observability(settings.project)
 
 # ---------------------------------------------------------------------
 # Agent Instruction
@@ -40,7 +45,9 @@ ORCHESTRATOR_INSTRUCTION = (
 # Root Orchestrator Logic
 # ---------------------------------------------------------------------
 
+@profiled("root_handle")
 def root_handle(user_text: str) -> dict:
+    setup_observability(settings.project)
     masked_text = mask_pii(user_text).get("masked_text", user_text)
 
     intent_info = classify_intent(user_text)
@@ -49,7 +56,8 @@ def root_handle(user_text: str) -> dict:
 
     # ---------------- Confidence Gating ----------------
     if confidence < 0.80 or intent in ("ambiguous", "other"):
-        return AgentResponse(
+        return trusted_dict(
+            AgentResponse,
             summary="I need more detail to help you.",
             payload={
                 "detected_intent": intent,
@@ -60,27 +68,31 @@ def root_handle(user_text: str) -> dict:
             handoff_reason="Low confidence intent classification"
             if confidence < 0.50
             else None,
-        ).model_dump()
+        )
 
     customer_id = extract_customer_id(user_text).get("customer_id", "cust_001")
 
     # ---------------- Billing ----------------
     if intent == "billing_inquiry":
         payload = billing_agent.tools[-1](customer_id, user_text)
-        return AgentResponse(
+        return trusted_dict(
+            AgentResponse,
             summary=f"Billing details retrieved for customer {customer_id}.",
             payload=payload,
             handoff_required=False,
-        ).model_dump()
+        )
 
     # ---------------- Reporting ----------------
     if intent == "report_request":
         days = int(extract_days(user_text).get("days", 30))
-        payload = reporting_agent.tools[-1](customer_id, days)
-        return AgentResponse(
+        end = date.today()
+        # By name: the position of the report tool in reporting_agent.tools is not fixed.
+        payload = get_wire_status_report_card(customer_id, (end - timedelta(days=days)).isoformat(), end.isoformat())
+        return trusted_dict(
+            AgentResponse,
             summary=f"Wire status report generated for last {days} days.",
             payload=payload,
-        ).model_dump()
+        )
 
     # ---------------- Plan Upgrade ----------------
     if intent == "plan_upgrade":
@@ -95,16 +107,18 @@ def root_handle(user_text: str) -> dict:
         payload = upgrade_agent.tools[-1](
             customer_id, requested_plan, user_text
         )
-        return AgentResponse(
+        return trusted_dict(
+            AgentResponse,
             summary=f"Upgrade prepared → {requested_plan}.",
             payload=payload,
-        ).model_dump()
+        )
 
     # ---------------- Fallback ----------------
-    return AgentResponse(
+    return trusted_dict(
+        AgentResponse,
         summary="Unsupported request.",
         payload={"masked_user_text": masked_text},
-    ).model_dump()
+    )
 
 # ---------------------------------------------------------------------
 # ADK Agent Definition
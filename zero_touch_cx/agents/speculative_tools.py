@@ -0,0 +1,147 @@
+"""Eligibility-gated data retrieval with speculative fan-out.
+
+REPORTING_INSTRUCTION makes the model call check_eligibility and then the data
+tool, so every report pays both latencies back to back. fetch_if_eligible starts
+the likely data fetch on the BigQuery executor while the eligibility check runs,
+and only releases the data when the feature is INCLUDED. For OPTIONAL or
+NOT_AVAILABLE features the speculative fetch is cancelled if it has not started,
+or left to finish with its result thrown away, so no data leaves this module.
+
+The data tool must be one that serves the feature named in the query, and its
+customer_id must be the customer whose eligibility is checked; anything else is
+refused before a fetch is started. Every branch returns the same shape:
+{"eligibility", "data_tool"} plus "data" when released or "error"/"message".
+
+Set SPECULATIVE_FETCH=false to run the same gate sequentially.
+"""
+
+from __future__ import annotations
+
+import threading
+from concurrent.futures import Future
+from typing import Any, Dict, Optional
+
+from ..config import settings
+from ..executors import submit_blocking
+from ..observability import span
+from .report_cards import get_wire_status_report_card
+from .tools import (
+    check_eligibility,
+    extract_customer_id,
+    extract_feature,
+    generate_wire_status_report,
+    get_detailed_wire_report,
+    get_intraday_balance,
+    retrieve_document_copy,
+)
+
+DATA_TOOLS = {
+    "get_wire_status_report_card": get_wire_status_report_card,
+    "generate_wire_status_report": generate_wire_status_report,
+    "get_detailed_wire_report": get_detailed_wire_report,
+    "get_intraday_balance": get_intraday_balance,
+    "retrieve_document_copy": retrieve_document_copy,
+}
+
+# Data tools that serve each canonical feature (see FEATURE_SYNONYMS in tools.py); the first is the default.
+FEATURE_TOOLS = {
+    "Reports": ("get_wire_status_report_card", "generate_wire_status_report"),
+    "Detailed Reports": ("get_detailed_wire_report",),
+    "Intraday Expanded Detail": ("get_intraday_balance",),
+    "Image Basic": ("retrieve_document_copy",),
+    "Image Expanded": ("retrieve_document_copy",),
+}
+
+# Looked up by transaction id / check number rather than by customer.
+UNSCOPED_TOOLS = {"retrieve_document_copy"}
+
+_stats = {"speculated": 0, "released": 0, "discarded": 0, "cancelled": 0}
+_stats_lock = threading.Lock()
+
+
+def _count(key: str) -> None:
+    with _stats_lock:
+        _stats[key] += 1
+
+
+def speculation_stats() -> Dict[str, int]:
+    with _stats_lock:
+        return dict(_stats)
+
+
+def _discard(future: Future) -> None:
+    if future.cancel():
+        _count("cancelled")
+    else:
+        _count("discarded")
+
+
+def _run_data_tool(future_or_fn, tool_args: Dict[str, Any]) -> Dict[str, Any]:
+    try:
+        if isinstance(future_or_fn, Future):
+            return future_or_fn.result(timeout=settings.request_timeout_s)
+        return future_or_fn(**tool_args)
+    except Exception as e:
+        return {"error": f"Data retrieval failed: {e}"}
+
+
+def _refused(user_query: str, data_tool: str, error: str, message: str) -> Dict[str, Any]:
+    return {"eligibility": check_eligibility(user_query), "data_tool": data_tool, "error": error, "message": message}
+
+
+def fetch_if_eligible(
+    user_query: str,
+    data_tool: str = "",
+    tool_args: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """
+    Enforces the plan eligibility gate and runs the data retrieval tool in one step.
+    Data is only returned when check_eligibility reports INCLUDED; otherwise the
+    eligibility response (with its upgrade message) is returned under "eligibility"
+    and no data.
+
+    Args:
+        user_query: The user's request, used for the eligibility check.
+        data_tool: get_wire_status_report_card, generate_wire_status_report, get_detailed_wire_report,
+            get_intraday_balance or retrieve_document_copy; it must serve the requested
+            feature. Inferred from the requested feature when empty.
+        tool_args: Keyword arguments for the data tool, e.g. {"customer_id": "USR-AstroZen"}.
+            customer_id defaults to (and must match) the customer named in the query.
+    """
+    tool_args = dict(tool_args or {})
+    allowed = FEATURE_TOOLS.get(extract_feature(user_query) or "", ())
+    data_tool = data_tool or (allowed[0] if allowed else "")
+    fn = DATA_TOOLS.get(data_tool)
+    with span("fetch_if_eligible", data_tool=data_tool, speculative=settings.speculative_fetch):
+        if fn is None:
+            return _refused(user_query, data_tool, "UNKNOWN_DATA_TOOL", f"Choose one of: {', '.join(DATA_TOOLS)}")
+        if data_tool not in allowed:
+            return _refused(
+                user_query, data_tool, "DATA_TOOL_MISMATCH",
+                f"{data_tool} does not serve the requested feature; use one of: {', '.join(allowed) or 'none'}",
+            )
+        if data_tool not in UNSCOPED_TOOLS:
+            customer_id = extract_customer_id(user_query)
+            if customer_id is None:
+                return {"eligibility": check_eligibility(user_query), "data_tool": data_tool}  # UNKNOWN_CUSTOMER
+            if tool_args.setdefault("customer_id", customer_id) != customer_id:
+                return _refused(
+                    user_query, data_tool, "CUSTOMER_MISMATCH",
+                    "tool_args.customer_id must be the customer named in the query",
+                )
+
+        future = None
+        if settings.speculative_fetch:
+            future = submit_blocking("bigquery", fn, **tool_args)
+            _count("speculated")
+
+        eligibility = check_eligibility(user_query)
+        if eligibility.get("eligibility") != "INCLUDED":
+            if future is not None:
+                _discard(future)
+            return {"eligibility": eligibility, "data_tool": data_tool}
+
+        if future is not None:
+            _count("released")
+        data = _run_data_tool(future or fn, tool_args)
+        return {"eligibility": eligibility, "data_tool": data_tool, "data": data}
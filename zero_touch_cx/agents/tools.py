@@ -1,19 +1,27 @@
-from typing import Any, Dict, List, Optional
-from google.cloud import bigquery
-from google.cloud.bigquery import QueryJobConfig, ScalarQueryParameter
+from __future__ import annotations
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional
 import datetime
 import random
 import time
 
+from ..config import settings
+from ..singleflight import coalesce
+
+if TYPE_CHECKING:
+    from google.cloud import bigquery
+
 # --- BigQuery Client Setup (Reusable) ---
+# google.cloud.bigquery is imported on first use to keep agent import (cold start) cheap.
 def get_bigquery_client() -> bigquery.Client:
     """Get a configured BigQuery client."""
+    from google.cloud import bigquery
     # This project ID must be valid and linked to your ADC credentials
     return bigquery.Client(project="ccibt-hack25ww7-704")
 
 # -------------------------------------------------------------------
 # TOOL 1: Enhanced Historical Reporting (BigQuery)
 # -------------------------------------------------------------------
+@coalesce("wire_status_report")
 def generate_wire_status_report(
     customer_id: str, 
     start_date: Optional[str] = None, 
@@ -35,52 +43,113 @@ def generate_wire_status_report(
         start_date = default_start
         end_date = datetime.date.today().strftime('%Y-%m-%d')
     
-    # Build the base query
-    query = """
-    SELECT
-      CustomerID,
-      report_id,
-      run_ts,
-      status
-    FROM ccibt-hack25ww7-704.client_report_data.report_event
-    WHERE CustomerID = @customer_id
-    """
-    
-    # Add date filtering
-    if start_date:
-        query += " AND DATE(run_ts) >= @start_date"
-    if end_date:
-        query += " AND DATE(run_ts) <= @end_date"
-    
-    # Define parameters (CRITICAL for BigQuery named parameters)
-    query_params = [
-        ScalarQueryParameter("customer_id", "STRING", customer_id),
-    ]
-    if start_date:
-        query_params.append(ScalarQueryParameter("start_date", "DATE", start_date))
-    if end_date:
-        query_params.append(ScalarQueryParameter("end_date", "DATE", end_date))
-
-    job_config = QueryJobConfig(query_parameters=query_params)
+    from ..tools.query_builder import REPORT_EVENT, QueryBudgetExceeded, run_query, select, shrink_window
+
+    query = (
+        select(REPORT_EVENT, "CustomerID", "report_id", "run_ts", "status")
+        .where_equals("CustomerID", "customer_id", "STRING", customer_id)
+        .where_partition_range(start_date, end_date)
+    )
     client = get_bigquery_client()
-    
+
     try:
-        query_job = client.query(query, job_config=job_config)
-        results = [dict(row) for row in query_job.result()]
+        # Over the scan budget, the window is narrowed to the most recent days that fit.
+        rows, ran = run_query(query, client, downgrade=shrink_window)
+        results = [dict(row) for row in rows]
+    except QueryBudgetExceeded as e:
+        return {"error": str(e), "customer_id": customer_id}
     except Exception as e:
         # Return a structured error response
-        return {"error": f"BigQuery execution failed: {e}", "query": query}
+        return {"error": f"BigQuery execution failed: {e}", "query": query.sql()}
 
+    if ran is not query:
+        start_date = ran.param("start_date")
     return {
         "customer_id": customer_id,
         "date_range": f"{start_date or 'N/A'} to {end_date or 'N/A'}",
         "report_count": len(results),
-        "report": results
+        "report": results,
+        "window_narrowed": ran is not query,
     }
 
+# -------------------------------------------------------------------
+# TOOL 1 helpers: aggregate-first + paged rows (streaming API)
+# -------------------------------------------------------------------
+WIRE_STATUS_COMPLETED = ("SUCCESS", "COMPLETED")
+
+@coalesce("wire_status_summary")
+def summarize_wire_status(customer_id: str, start_date: str, end_date: str) -> Dict[str, Any]:
+    """
+    Wire status counts for a customer and date range, computed with one aggregate
+    query (no rows leave BigQuery). Used to answer KPIs before rows are streamed.
+    """
+    if settings.mock_mode:
+        from ..tools.mock_store import DATA_DIR, records_by
+
+        events = records_by(DATA_DIR / "report_events.csv", "customer_id").get(customer_id, [])
+        status = [e["status"] for e in events if start_date <= e["run_ts"][:10] <= end_date]
+        return {
+            "total_count": len(status),
+            "pending_count": status.count("PENDING"),
+            "completed_count": sum(s in WIRE_STATUS_COMPLETED for s in status),
+            "failed_count": status.count("FAILED"),
+            "source": "mock",
+        }
+
+    from ..tools.query_builder import REPORT_EVENT, run_query, select
+
+    query = (
+        select(
+            REPORT_EVENT,
+            "COUNT(*) AS total_count",
+            "COUNTIF(status = 'PENDING') AS pending_count",
+            "COUNTIF(status IN UNNEST(@completed)) AS completed_count",
+            "COUNTIF(status = 'FAILED') AS failed_count",
+        )
+        .bind("completed", "STRING", list(WIRE_STATUS_COMPLETED))
+        .where_equals("CustomerID", "customer_id", "STRING", customer_id)
+        .where_partition_range(start_date, end_date)
+    )
+    # KPIs over a narrowed window would be wrong, so over budget this is refused, not downgraded.
+    rows, _ = run_query(query, get_bigquery_client())
+    row = next(iter(rows))
+    return {**dict(row), "source": "bigquery"}
+
+def iter_wire_status_report_pages(
+    customer_id: str,
+    start_date: str,
+    end_date: str,
+    page_size: int = 500,
+) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Yields the rows of generate_wire_status_report one page at a time, as BigQuery
+    pages arrive, so callers never hold the whole report in memory.
+    """
+    if settings.mock_mode:
+        from ..tools.mock_store import iter_csv
+
+        for chunk in iter_csv("report_events.csv", chunksize=page_size):
+            day = chunk["run_ts"].str[:10]
+            chunk = chunk[(chunk["customer_id"] == customer_id) & (day >= start_date) & (day <= end_date)]
+            if not chunk.empty:
+                yield chunk.to_dict("records")
+        return
+
+    from ..tools.query_builder import REPORT_EVENT, run_query, select
+
+    query = (
+        select(REPORT_EVENT, "CustomerID", "report_id", "run_ts", "status", order_by="run_ts")
+        .where_equals("CustomerID", "customer_id", "STRING", customer_id)
+        .where_partition_range(start_date, end_date)
+    )
+    rows, _ = run_query(query, get_bigquery_client(), page_size=page_size)
+    for page in rows.pages:
+        yield [dict(row) for row in page]
+
 # -------------------------------------------------------------------
 # TOOL 2: Real-Time Balance (BigQuery - Aggregated by CustomerID/UserID)
 # -------------------------------------------------------------------
+@coalesce("intraday_balance")
 def get_intraday_balance(customer_id: str) -> Dict[str, Any]:
     """
     Retrieves the total aggregated Current and Available balance for a specific 
@@ -91,31 +160,24 @@ def get_intraday_balance(customer_id: str) -> Dict[str, Any]:
         customer_id: The ID of the user (e.g., USR-AstroZen) stored in the CustomerID column.
     """
 
-    # The query is now modified to filter ONLY by CustomerID and GROUP BY ONLY CustomerID.
-    query = """
-    SELECT
-      t.CustomerID AS customer_id,
-      SUM(CASE WHEN t.PostedStatus IN ('POSTED', 'SOFT_POSTED') THEN t.Amount ELSE 0 END) AS current_balance,
-      SUM(CASE WHEN t.PostedStatus = 'POSTED' THEN t.Amount ELSE 0 END) AS available_balance,
-      MAX(t.TransactionTS) AS last_update_ts
-    FROM ccibt-hack25ww7-704.client_report_data.AccountBalance AS t
-    WHERE t.CustomerID = @customer_id
-    GROUP BY 1
-    """
-    
-    job_config = QueryJobConfig(
-        query_parameters=[
-            # Pass the customer_id argument to the SQL placeholder @customer_id
-            ScalarQueryParameter("customer_id", "STRING", customer_id),
-        ]
-    )
-
+    # Filter ONLY by CustomerID (the clustering column) and GROUP BY ONLY CustomerID.
+    from ..tools.query_builder import ACCOUNT_BALANCE, QueryBudgetExceeded, run_query, select
+
+    query = select(
+        ACCOUNT_BALANCE,
+        "t.CustomerID AS customer_id",
+        "SUM(CASE WHEN t.PostedStatus IN ('POSTED', 'SOFT_POSTED') THEN t.Amount ELSE 0 END) AS current_balance",
+        "SUM(CASE WHEN t.PostedStatus = 'POSTED' THEN t.Amount ELSE 0 END) AS available_balance",
+        "MAX(t.TransactionTS) AS last_update_ts",
+        alias="t",
+        group_by="1",
+    ).where_equals("CustomerID", "customer_id", "STRING", customer_id)
     client = get_bigquery_client()
-    
+
     try:
-        query_job = client.query(query, job_config=job_config)
-        row = next(query_job.result(), None)
-        
+        rows, _ = run_query(query, client)
+        row = next(iter(rows), None)
+
         if not row or row['current_balance'] is None:
             return {"error": f"No data found or aggregated balance is zero for customer/user {customer_id}.", 
                     "customer_id": customer_id}
@@ -129,11 +191,13 @@ def get_intraday_balance(customer_id: str) -> Dict[str, Any]:
             "status": "SUCCESS"
         }
 
+    except QueryBudgetExceeded as e:
+        return {"error": str(e), "customer_id": customer_id}
     except Exception as e:
         return {"error": f"BigQuery execution failed: {e}", "customer_id": customer_id}
 
 # -------------------------------------------------------------------
-# TOOL 3: Document and Image Retrieval (Simulated DMS Search)
+# TOOL 3: Document and Image Retrieval (local content-addressed archive, tools/doc_store.py)
 # -------------------------------------------------------------------
 def retrieve_document_copy(
     transaction_id: Optional[str] = None, 
@@ -141,18 +205,30 @@ def retrieve_document_copy(
     document_type: str = "TRANSACTION_IMAGE"
 ) -> Dict[str, Any]:
     """
-    Searches the Document Management System (DMS) for an image or PDF copy 
-    of a transaction, check, or payment document. Requires at least one identifier.
-    
-    NOTE: This simulates a call to a Document Management System API.
+    Searches the document archive for an image or PDF copy of a transaction,
+    check, or payment document. Requires at least one identifier.
     """
     if not transaction_id and not check_number:
         return {"error": "Must provide either a transaction_id or a check_number to retrieve a document."}
 
-    # --- SIMULATION ---
+    from ..tools.doc_store import get_doc_store
+
     search_key = check_number or transaction_id
-    
-    if search_key == "891472" or search_key.startswith("760995"):
+    store = get_doc_store()
+    ref = store.lookup(transaction_id, check_number, document_type)
+    if ref is not None:
+        return {
+            "status": "SUCCESS",
+            "document_type": document_type,
+            "id_searched": search_key,
+            "content_type": ref.content_type,
+            "size_bytes": ref.size,
+            "retrieval_link": store.retrieval_link(ref, document_type),
+            "message": f"Successfully retrieved document for ID {search_key}. Link provided to customer via secure channel."
+        }
+
+    # Demo IDs keep working in mock mode when the local archive has not been loaded.
+    if settings.mock_mode and (search_key == "891472" or search_key.startswith("760995")):
         return {
             "status": "SUCCESS",
             "document_type": document_type,
@@ -172,62 +248,75 @@ def verify_ach_file(account_number_suffix: str, transaction_amount: float) -> Di
     Initiates a check/verification on a pending ACH file based on the account suffix 
     and amount. Used to confirm if a file is ready for processing or has been approved.
     
-    NOTE: This simulates a call to a Payment Gateway/Approval Workflow.
+    Entries are looked up in the pending ACH index by (suffix, amount in cents).
     """
-    # --- SIMULATION ---
-    if account_number_suffix == "8294" and transaction_amount == 41527.93:
+    from ..tools.ach import get_pending_index, to_cents
+
+    pending = get_pending_index().match(account_number_suffix, to_cents(transaction_amount))
+    if pending is not None and pending.get("verification_status", "APPROVED") == "APPROVED":
+        settles = pending.get("settlement_date")
+        when = f" ({datetime.date.fromisoformat(settles):%m/%d/%Y})" if settles else ""
         return {
             "verification_status": "APPROVED",
             "account_suffix": account_number_suffix,
             "amount": transaction_amount,
-            "next_action": "File is scheduled for settlement (03/03/2025). No further action needed.",
-            "source": "PaymentGatewayAPI (Simulated)"
+            "next_action": f"File is scheduled for settlement{when}. No further action needed.",
+            "source": "PendingACHIndex"
         }
-    
+
     return {
         "verification_status": "PENDING_REVIEW",
         "account_suffix": account_number_suffix,
         "amount": transaction_amount,
         "next_action": "Could not confirm automated approval. Requires manual review by Treasury Ops.",
-        "source": "PaymentGatewayAPI (Simulated)"
+        "source": "PendingACHIndex"
     }
+
+
+def verify_ach_bulk_file(file_path: str) -> Dict[str, Any]:
+    """
+    Verifies a whole NACHA/ACH file: batch and file control totals, plus which
+    entries match pending ACH entries. Use for Treasury Ops bulk file checks.
+
+    Args:
+        file_path: Name of the ACH file in the ACH inbox (ACH_INBOX_PATH).
+    """
+    from pathlib import Path
+
+    from ..tools.ach import verify_file
+
+    inbox = Path(settings.ach_inbox_path).resolve()
+    path = (inbox / file_path).resolve()
+    if not path.is_relative_to(inbox):
+        return {"status": "REJECTED", "message": f"{file_path} is outside the ACH inbox."}
+    if not path.is_file():
+        return {"status": "NOT_FOUND", "message": f"No ACH file named {file_path} in the ACH inbox."}
+    return verify_file(path)
+
+
 # -------------------------------------------------------------------
 # TOOL 5: Detailed Single Wire Report (BigQuery)
 # -------------------------------------------------------------------
-def get_detailed_wire_report(report_id: str, customer_id: str) -> Dict[str, Any]:
-    # 1. Clean the ID
-    clean_id = customer_id.replace("USR-", "")
-    
-    # 2. Use placeholders (@variable) for BOTH parameters
-    query = """
-    SELECT
-      t.*
-    FROM `ccibt-hack25ww7-704.client_report_data.wire_report` AS t
-    WHERE t.report_id = @report_id 
-      AND t.SenderName = @sender_name
-    LIMIT 1
+@coalesce("detailed_wire_report")
+def get_detailed_wire_report(report_id: str, customer_id: str, view: str = "detail") -> Dict[str, Any]:
     """
-    
-    # 3. Add both parameters to the list
-    query_params = [
-        ScalarQueryParameter("report_id", "STRING", report_id),
-        ScalarQueryParameter("sender_name", "STRING", clean_id),
-    ]
+    Details of one wire report, read from the lookup cache when possible.
+
+    Args:
+        report_id: The wire report ID.
+        customer_id: The sender's customer ID (a leading USR- is ignored).
+        view: "detail" (default) or "summary" for the key fields only.
+    """
+    from ..tools.wire_reports import get_wire_report_lookup
 
-    job_config = QueryJobConfig(query_parameters=query_params)
-    client = get_bigquery_client()
-    
     try:
-        query_job = client.query(query, job_config=job_config)
-        results = query_job.result()
-        row = next(results, None)
-        
-        if not row:
+        record = get_wire_report_lookup().get(report_id, customer_id, view)
+        if not record:
             return {"status": "NOT_FOUND", "message": f"No report found for {report_id}"}
 
         return {
             "status": "SUCCESS",
-            "details": dict(row)
+            "details": record
         }
     except Exception as e:
         return {"status": "ERROR", "message": str(e)}
@@ -5,6 +5,9 @@ from .tools import (
     get_customer_plan,
     suggest_higher_plan_with_benefits
 )
+from .model_cache import model_cache_callbacks
+
+_cache_before_model, _cache_after_model = model_cache_callbacks("upgrade_agent")
 # --------------------------
 # Root Agent
 # --------------------------
@@ -33,5 +36,7 @@ Call suggest_higher_plan_with_benefits if feature is OPTIONAL or NOT_AVAILABLE t
 11. Always prioritize helping the user understand what plan upgrade they would gain and why it is valuable.
 """
 ,
-    tools=[check_eligibility, get_customer_plan,suggest_higher_plan_with_benefits]
+    tools=[check_eligibility, get_customer_plan,suggest_higher_plan_with_benefits],
+    before_model_callback=_cache_before_model,
+    after_model_callback=_cache_after_model,
 )
\ No newline at end of file
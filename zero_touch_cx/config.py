@@ -1,6 +1,13 @@
 from __future__ import annotations
 import os
 from dataclasses import dataclass
+from pathlib import Path
+
+# Repo root; relative data paths resolve from here (like mock_store.DATA_DIR), not the working directory
+ROOT = Path(__file__).resolve().parents[1]
+
+def _path(env: str, default: str) -> str:
+    return str(ROOT / os.getenv(env, default))
 
 @dataclass(frozen=True)
 class Settings:
@@ -21,4 +28,116 @@ class Settings:
 
     enable_dlp: bool = os.getenv("ENABLE_DLP", "false").lower() == "true"
 
+    # Defer credentials, toolsets, heavy imports and observability setup to first use
+    lazy_init: bool = os.getenv("LAZY_INIT", "true").lower() == "true"
+
+    # Async request path: timeouts, in-flight cap, batch/stream sizes and executor sizes
+    request_timeout_s: float = float(os.getenv("REQUEST_TIMEOUT_S", "30"))
+    max_inflight_chats: int = int(os.getenv("MAX_INFLIGHT_CHATS", "256"))
+    stream_page_size: int = int(os.getenv("STREAM_PAGE_SIZE", "500"))
+    batch_max_messages: int = int(os.getenv("BATCH_MAX_MESSAGES", "5000"))
+    bq_max_workers: int = int(os.getenv("BQ_MAX_WORKERS", "32"))
+    gcs_max_workers: int = int(os.getenv("GCS_MAX_WORKERS", "8"))
+    # matplotlib's pyplot is not thread-safe, so charts render one at a time by default
+    chart_max_workers: int = int(os.getenv("CHART_MAX_WORKERS", "1"))
+
+    # Start the likely data fetch alongside check_eligibility (agents/speculative_tools.py)
+    speculative_fetch: bool = os.getenv("SPECULATIVE_FETCH", "true").lower() == "true"
+
+    # Deterministic router that answers high-confidence intents without the LLM
+    fast_path_enabled: bool = os.getenv("FAST_PATH_ENABLED", "true").lower() == "true"
+    fast_path_min_confidence: float = float(os.getenv("FAST_PATH_MIN_CONFIDENCE", "0.85"))
+    fast_path_assumed_model_ms: float = float(os.getenv("FAST_PATH_ASSUMED_MODEL_MS", "800"))
+
+    # Bulk intent classification (agents/intent_model.py)
+    intent_model_path: str = _path("INTENT_MODEL_PATH", "artifacts/intent_model.npz")
+
+    # Month-to-date billing cache (tools/billing_data.py)
+    billing_cache_ttl_s: float = float(os.getenv("BILLING_CACHE_TTL_S", "3600"))
+    billing_cache_max_entries: int = int(os.getenv("BILLING_CACHE_MAX_ENTRIES", "10000"))
+
+    # Usage rollups (tools/usage_rollups.py): how often new events are ingested
+    usage_refresh_interval_s: float = float(os.getenv("USAGE_REFRESH_INTERVAL_S", "60"))
+
+    # Scheduled ReportCard precompute (scheduler.py) and its local cache
+    report_cache_path: str = _path("REPORT_CACHE_PATH", "artifacts/report_cache.sqlite")
+    report_cache_max_age_s: float = float(os.getenv("REPORT_CACHE_MAX_AGE_S", "3600"))
+    report_scheduler_enabled: bool = os.getenv("REPORT_SCHEDULER_ENABLED", "false").lower() == "true"
+    report_scheduler_interval_s: float = float(os.getenv("REPORT_SCHEDULER_INTERVAL_S", "3600"))
+    report_scheduler_workers: int = int(os.getenv("REPORT_SCHEDULER_WORKERS", "2"))
+    scheduled_report_plans: str = os.getenv("SCHEDULED_REPORT_PLANS", "Pro,Max")
+    scheduled_report_ids: str = os.getenv("SCHEDULED_REPORT_IDS", "T-1004,T-2001")
+    scheduled_report_windows_days: str = os.getenv("SCHEDULED_REPORT_WINDOWS_DAYS", "7,30,90")
+
+    # Upgrade execution queue (tools/upgrade_queue.py) and the eligibility plan cache
+    upgrade_queue_path: str = _path("UPGRADE_QUEUE_PATH", "artifacts/upgrade_queue.sqlite")
+    # Mock-mode billing writes go to a copy of data/billing_history.csv, never the tracked file
+    billing_store_path: str = _path("BILLING_STORE_PATH", "artifacts/billing_history.csv")
+    upgrade_commit_batch_size: int = int(os.getenv("UPGRADE_COMMIT_BATCH_SIZE", "100"))
+    upgrade_commit_interval_s: float = float(os.getenv("UPGRADE_COMMIT_INTERVAL_S", "5"))
+    upgrade_commit_linger_ms: float = float(os.getenv("UPGRADE_COMMIT_LINGER_MS", "50"))
+    upgrade_max_attempts: int = int(os.getenv("UPGRADE_MAX_ATTEMPTS", "5"))
+    upgrade_idempotency_window_s: float = float(os.getenv("UPGRADE_IDEMPOTENCY_WINDOW_S", "86400"))
+    plan_cache_ttl_s: float = float(os.getenv("PLAN_CACHE_TTL_S", "600"))
+
+    # API response compression (serialization.py): gzip/zstd only above this many bytes
+    response_compress_min_bytes: int = int(os.getenv("RESPONSE_COMPRESS_MIN_BYTES", "16384"))
+
+    # BigQuery scan budget (tools/query_builder.py); 0 disables the dry-run check
+    bq_max_bytes_scanned: int = int(os.getenv("BQ_MAX_BYTES_SCANNED", str(10 * 2**30)))
+    bq_dry_run_cache_ttl_s: float = float(os.getenv("BQ_DRY_RUN_CACHE_TTL_S", "600"))
+
+    # Wire report point lookups (tools/wire_reports.py): LRU + local store, bulk warm
+    wire_report_cache_path: str = _path("WIRE_REPORT_CACHE_PATH", "artifacts/wire_reports.sqlite")
+    wire_report_cache_ttl_s: float = float(os.getenv("WIRE_REPORT_CACHE_TTL_S", "3600"))
+    wire_report_cache_max_entries: int = int(os.getenv("WIRE_REPORT_CACHE_MAX_ENTRIES", "20000"))
+    wire_report_warm_days: int = int(os.getenv("WIRE_REPORT_WARM_DAYS", "7"))
+    wire_report_warm_per_customer: int = int(os.getenv("WIRE_REPORT_WARM_PER_CUSTOMER", "50"))
+
+    # Local document archive (tools/doc_store.py) and its signed retrieval links
+    doc_store_path: str = _path("DOC_STORE_PATH", "artifacts/doc_store")
+    doc_link_base_url: str = os.getenv("DOC_LINK_BASE_URL", "/documents")
+    doc_link_ttl_s: float = float(os.getenv("DOC_LINK_TTL_S", "900"))
+    doc_link_secret: str = os.getenv("DOC_LINK_SECRET", "")
+
+    # Bulk NACHA verification (tools/ach.py); 0 workers = one per CPU
+    ach_pending_path: str = os.getenv("ACH_PENDING_PATH", "")
+    ach_inbox_path: str = _path("ACH_INBOX_PATH", "artifacts/ach_inbox")
+    ach_verify_workers: int = int(os.getenv("ACH_VERIFY_WORKERS", "0"))
+    ach_task_min_records: int = int(os.getenv("ACH_TASK_MIN_RECORDS", "2000"))
+    ach_batches_in_flight: int = int(os.getenv("ACH_BATCHES_IN_FLIGHT", "16"))
+
+    # Admission control ahead of the compliance gate (admission.py); tool rates are "tool=per_s/burst"
+    admission_customer_rate_per_s: float = float(os.getenv("ADMISSION_CUSTOMER_RATE_PER_S", "5"))
+    admission_customer_burst: float = float(os.getenv("ADMISSION_CUSTOMER_BURST", "20"))
+    admission_tool_rates: str = os.getenv("ADMISSION_TOOL_RATES", "wire_report=10/20,balance=50/100,ach=1/2")
+    admission_max_queued: int = int(os.getenv("ADMISSION_MAX_QUEUED", "512"))
+    admission_queue_timeout_s: float = float(os.getenv("ADMISSION_QUEUE_TIMEOUT_S", "5"))
+    admission_max_customers: int = int(os.getenv("ADMISSION_MAX_CUSTOMERS", "100000"))
+    admission_bucket_idle_s: float = float(os.getenv("ADMISSION_BUCKET_IDLE_S", "300"))
+
+    # Share one execution between concurrent identical tool calls (singleflight.py)
+    singleflight_enabled: bool = os.getenv("SINGLEFLIGHT_ENABLED", "true").lower() == "true"
+
+    # Multi-turn session state (sessions.py): LRU in front of a local SQLite store
+    session_store_path: str = _path("SESSION_STORE_PATH", "artifacts/sessions.sqlite")
+    session_ttl_s: float = float(os.getenv("SESSION_TTL_S", "1800"))
+    session_max_entries: int = int(os.getenv("SESSION_MAX_ENTRIES", "50000"))
+
+    # Model-call result cache (agents/model_cache.py)
+    model_cache_enabled: bool = os.getenv("MODEL_CACHE_ENABLED", "true").lower() == "true"
+    model_cache_ttl_s: float = float(os.getenv("MODEL_CACHE_TTL_S", "300"))
+    model_cache_max_entries: int = int(os.getenv("MODEL_CACHE_MAX_ENTRIES", "2048"))
+    model_cache_disabled_agents: str = os.getenv("MODEL_CACHE_DISABLED_AGENTS", "")
+
+    # On-demand profiling (zero_touch_cx/profiling.py)
+    profile_enabled: bool = os.getenv("PROFILE_ENABLED", "false").lower() == "true"
+    profile_sample_every: int = int(os.getenv("PROFILE_SAMPLE_EVERY", "0"))
+    profile_mode: str = os.getenv("PROFILE_MODE", "sample")
+    profile_interval_ms: float = float(os.getenv("PROFILE_INTERVAL_MS", "5"))
+    profile_max_seconds: float = float(os.getenv("PROFILE_MAX_SECONDS", "30"))
+    profile_max_concurrent: int = int(os.getenv("PROFILE_MAX_CONCURRENT", "2"))
+    profile_max_files: int = int(os.getenv("PROFILE_MAX_FILES", "50"))
+    profile_max_file_kb: int = int(os.getenv("PROFILE_MAX_FILE_KB", "256"))
+
 settings = Settings()
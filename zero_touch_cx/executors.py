@@ -0,0 +1,58 @@
+"""Bounded executors for blocking I/O on the async request path.
+
+BigQuery, Cloud Storage and chart rendering are blocking calls. The async API runs
+them here instead of on the event loop, one pool per kind of work, so a slow
+dependency can only use up its own workers. Pool sizes come from settings.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import functools
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable
+
+from .config import settings
+
+POOL_SIZES = {
+    "bigquery": settings.bq_max_workers,
+    "gcs": settings.gcs_max_workers,
+    "charts": settings.chart_max_workers,
+}
+
+_pools: dict[str, ThreadPoolExecutor] = {}
+_pools_lock = threading.Lock()
+
+
+def get_executor(kind: str) -> ThreadPoolExecutor:
+    pool = _pools.get(kind)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.get(kind)
+            if pool is None:
+                pool = ThreadPoolExecutor(
+                    max_workers=max(1, POOL_SIZES[kind]),
+                    thread_name_prefix=f"zero-touch-{kind}",
+                )
+                _pools[kind] = pool
+    return pool
+
+
+def submit_blocking(kind: str, fn: Callable[..., Any], *args, **kwargs) -> Future:
+    """Submit from sync code; context variables (tracing, profiling) travel along."""
+    ctx = contextvars.copy_context()
+    return get_executor(kind).submit(ctx.run, functools.partial(fn, *args, **kwargs))
+
+
+async def run_blocking(kind: str, fn: Callable[..., Any], *args, **kwargs) -> Any:
+    """Await a blocking call on the ``kind`` pool without holding the event loop."""
+    return await asyncio.wrap_future(submit_blocking(kind, fn, *args, **kwargs))
+
+
+def shutdown_executors(wait: bool = True) -> None:
+    with _pools_lock:
+        for pool in _pools.values():
+            pool.shutdown(wait=wait, cancel_futures=True)
+        _pools.clear()
@@ -0,0 +1,98 @@
+"""Small persistent key/value store on SQLite (stdlib, no server).
+
+Used for local caches that should survive restarts and be shared by worker
+processes on one instance. Values are JSON; every row records when it was written
+so callers can apply their own freshness rules. Each thread gets its own
+connection; WAL mode lets readers proceed while a batch is being written.
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+
+
+def make_key(*parts: Any) -> str:
+    return "|".join(str(p) for p in parts)
+
+
+class SqliteKV:
+    def __init__(self, path: str | Path, table: str = "kv"):
+        if not table.isidentifier():
+            raise ValueError(f"invalid table name {table!r}")
+        self.path = Path(path)
+        self.table = table
+        self._local = threading.local()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {self.table} "
+                "(key TEXT PRIMARY KEY, value TEXT NOT NULL, updated_at REAL NOT NULL)"
+            )
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str) -> tuple[Any, float] | None:
+        """(value, updated_at) or None."""
+        row = self._conn().execute(
+            f"SELECT value, updated_at FROM {self.table} WHERE key = ?", (key,)
+        ).fetchone()
+        return (json.loads(row[0]), row[1]) if row else None
+
+    def get_many(self, keys: list[str]) -> dict[str, tuple[Any, float]]:
+        out: dict[str, tuple[Any, float]] = {}
+        for i in range(0, len(keys), 500):
+            chunk = keys[i:i + 500]
+            rows = self._conn().execute(
+                f"SELECT key, value, updated_at FROM {self.table} WHERE key IN ({','.join('?' * len(chunk))})",
+                chunk,
+            )
+            out.update({k: (json.loads(v), t) for k, v, t in rows})
+        return out
+
+    def set(self, key: str, value: Any, updated_at: float | None = None) -> None:
+        self.set_many([(key, value)], updated_at)
+
+    def set_many(self, items: Iterable[tuple[str, Any]], updated_at: float | None = None) -> int:
+        """Write all items in one transaction; returns how many."""
+        now = time.time() if updated_at is None else updated_at
+        rows = [(k, json.dumps(v, default=str), now) for k, v in items]
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany(
+                f"INSERT INTO {self.table} (key, value, updated_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET value = excluded.value, updated_at = excluded.updated_at",
+                rows,
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return len(rows)
+
+    def delete(self, key: str) -> None:
+        self._conn().execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+
+    def keys(self, prefix: str = "") -> Iterator[str]:
+        rows = self._conn().execute(
+            f"SELECT key FROM {self.table} WHERE key >= ? AND key < ? ORDER BY key",
+            (prefix, prefix + "\U0010ffff"),
+        )
+        return (r[0] for r in rows.fetchall())
+
+    def close(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
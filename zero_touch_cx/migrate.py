@@ -0,0 +1,68 @@
+"""Apply the BigQuery DDL in migrations/ in file-name order.
+
+Applied scripts are recorded in `<dataset>._schema_migrations`, so each runs once.
+
+    python -m zero_touch_cx.migrate              # apply pending migrations
+    python -m zero_touch_cx.migrate --dry-run    # list pending ones and validate the SQL
+"""
+
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+from typing import Optional
+
+from .tools.query_builder import DATASET_ID, PROJECT_ID
+
+MIGRATIONS_DIR = Path(__file__).resolve().parents[1] / "migrations"
+LEDGER = f"{PROJECT_ID}.{DATASET_ID}._schema_migrations"
+
+
+def pending(client, directory: Path = MIGRATIONS_DIR) -> list[Path]:
+    client.query(
+        f"CREATE TABLE IF NOT EXISTS `{LEDGER}` (name STRING NOT NULL, applied_at TIMESTAMP NOT NULL)"
+    ).result()
+    applied = {row["name"] for row in client.query(f"SELECT name FROM `{LEDGER}`").result()}
+    return [p for p in sorted(directory.glob("*.sql")) if p.name not in applied]
+
+
+def apply(client, dry_run: bool = False, directory: Path = MIGRATIONS_DIR) -> list[str]:
+    from google.cloud.bigquery import QueryJobConfig
+
+    done = []
+    for path in pending(client, directory):
+        sql = path.read_text(encoding="utf-8")
+        if dry_run:
+            # Only the first statement can be validated: later ones depend on its result.
+            first = sql.split(";")[0]
+            client.query(first, job_config=QueryJobConfig(dry_run=True))  # raises if invalid
+        else:
+            client.query(sql).result()
+            client.query(
+                f"INSERT INTO `{LEDGER}` (name, applied_at) VALUES (@name, CURRENT_TIMESTAMP())",
+                job_config=_name_param(path.name),
+            ).result()
+        done.append(path.name)
+    return done
+
+
+def _name_param(name: str):
+    from google.cloud.bigquery import QueryJobConfig, ScalarQueryParameter
+
+    return QueryJobConfig(query_parameters=[ScalarQueryParameter("name", "STRING", name)])
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Apply BigQuery migrations")
+    parser.add_argument("--dry-run", action="store_true", help="validate pending migrations without applying")
+    args = parser.parse_args(argv)
+
+    from .tools.bigquery_tools import _get_client
+
+    names = apply(_get_client(), dry_run=args.dry_run)
+    print(("would apply: " if args.dry_run else "applied: ") + (", ".join(names) or "nothing"))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,23 +1,20 @@
 from __future__ import annotations
-import logging, os, time
+import logging, os, threading, time
 from contextlib import contextmanager
-from google.cloud import logging as cloud_logging
 
 from opentelemetry import trace
 from opentelemetry.sdk.trace import TracerProvider
 from opentelemetry.sdk.trace.export import BatchSpanProcessor
 
-try:
-    from opentelemetry.exporter.cloud_trace import CloudTraceSpanExporter
-    HAS_GCP_TRACE = True
-except Exception:
-    HAS_GCP_TRACE = False
-
 logger = logging.getLogger("zero_touch_cx")
 
+_setup_lock = threading.Lock()
+_setup_done = False
+
 def setup_logging() -> None:
     logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO"))
     try:
+        from google.cloud import logging as cloud_logging
         client = cloud_logging.Client()
         client.setup_logging()
         logger.info("Cloud Logging is configured.")
@@ -26,11 +23,32 @@ def setup_logging() -> None:
 
 def setup_tracing(project_id: str | None) -> None:
     provider = TracerProvider()
-    if project_id and HAS_GCP_TRACE:
-        exporter = CloudTraceSpanExporter(project_id=project_id)
-        provider.add_span_processor(BatchSpanProcessor(exporter))
+    if project_id:
+        # The Cloud Trace exporter pulls in the gRPC stack; only load it when exporting.
+        try:
+            from opentelemetry.exporter.cloud_trace import CloudTraceSpanExporter
+        except Exception:
+            CloudTraceSpanExporter = None
+        if CloudTraceSpanExporter is not None:
+            try:
+                exporter = CloudTraceSpanExporter(project_id=project_id)
+                provider.add_span_processor(BatchSpanProcessor(exporter))
+            except Exception:
+                logger.info("Cloud Trace not configured (local run or missing credentials).")
     trace.set_tracer_provider(provider)
 
+def setup_observability(project_id: str | None) -> None:
+    """Configure logging and tracing once per process, however many modules ask."""
+    global _setup_done
+    if _setup_done:
+        return
+    with _setup_lock:
+        if _setup_done:
+            return
+        setup_logging()
+        setup_tracing(project_id)
+        _setup_done = True
+
 @contextmanager
 def span(name: str, **attrs):
     tracer = trace.get_tracer("zero_touch_cx")
@@ -0,0 +1,208 @@
+"""On-demand request profiling.
+
+Profiling is opt-in and can be triggered three ways:
+- per request, with ``force=True`` or ``profile_requested()`` (the API maps the
+  ``X-Profile`` header to it)
+- for every request, with ``PROFILE_ENABLED=true``
+- for one in N requests, with ``PROFILE_SAMPLE_EVERY=N``
+
+Two profilers are available via ``PROFILE_MODE``:
+- ``sample`` (default): a low-overhead stack sampler that writes collapsed
+  stacks (``*.folded``), ready for flamegraph.pl / speedscope.
+- ``cprofile``: the deterministic stdlib profiler, written as ``*.prof``.
+
+Profiles are written to ``artifacts/profiles`` and named after the trace/span id
+of the ``profile`` span. Overhead and disk use are capped by settings: a minimum
+sampling interval, a maximum profiling duration, a limit on concurrent profiles,
+a per-file size cap and a maximum number of files kept on disk.
+"""
+
+from __future__ import annotations
+
+import cProfile
+import functools
+import itertools
+import sys
+import threading
+import uuid
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Iterator
+
+from .config import settings
+from .observability import logger, span
+
+PROFILE_DIR = Path(__file__).resolve().parents[1] / "artifacts" / "profiles"
+
+# Set once the outermost profiled entry point has made its decision, so nested
+# entry points (compliance_gate -> root_handle) neither re-sample nor re-profile.
+_decided: ContextVar[bool] = ContextVar("zero_touch_cx_profile_decided", default=False)
+# Set by the API layer (X-Profile header). Context variables are copied into executor
+# threads, so the profile is taken where the pipeline actually runs.
+_requested: ContextVar[bool] = ContextVar("zero_touch_cx_profile_requested", default=False)
+_request_counter = itertools.count(1)
+_slots = threading.BoundedSemaphore(max(1, settings.profile_max_concurrent))
+# cProfile can only have one active profiler per interpreter.
+_cprofile_lock = threading.Lock()
+
+
+def should_profile(force: bool = False) -> bool:
+    if force or _requested.get() or settings.profile_enabled:
+        return True
+    every = settings.profile_sample_every
+    return every > 0 and next(_request_counter) % every == 0
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})"
+
+
+class _StackSampler:
+    """Samples one thread's stack on a timer and counts collapsed stacks."""
+
+    def __init__(self, thread_id: int, interval_s: float, max_seconds: float):
+        self.thread_id = thread_id
+        self.interval_s = interval_s
+        self.max_samples = max(1, int(max_seconds / interval_s))
+        self.stacks: Counter[str] = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="zero-touch-profiler", daemon=True)
+
+    def _run(self) -> None:
+        for _ in range(self.max_samples):
+            if self._stop.wait(self.interval_s):
+                return
+            frame = sys._current_frames().get(self.thread_id)
+            labels = []
+            while frame is not None:
+                labels.append(_frame_label(frame))
+                frame = frame.f_back
+            if labels:
+                self.stacks[";".join(reversed(labels))] += 1
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def write(self, base: Path) -> Path:
+        path = base.with_suffix(".folded")
+        budget = settings.profile_max_file_kb * 1024
+        lines, size = [], 0
+        # Heaviest stacks first; whatever does not fit the size cap is dropped.
+        for stack, count in self.stacks.most_common():
+            line = f"{stack} {count}\n"
+            size += len(line.encode("utf-8"))
+            if size > budget:
+                break
+            lines.append(line)
+        path.write_text("".join(lines), encoding="utf-8")
+        return path
+
+
+class _DeterministicProfiler:
+    def __init__(self):
+        self.profiler = cProfile.Profile()
+
+    def start(self) -> None:
+        self.profiler.enable()
+
+    def stop(self) -> None:
+        self.profiler.disable()
+
+    def write(self, base: Path) -> Path:
+        path = base.with_suffix(".prof")
+        self.profiler.dump_stats(str(path))
+        if path.stat().st_size > settings.profile_max_file_kb * 1024:
+            path.unlink()
+            raise RuntimeError("profile exceeded PROFILE_MAX_FILE_KB and was discarded")
+        return path
+
+
+def _prune() -> None:
+    files = sorted(
+        (p for p in PROFILE_DIR.glob("*") if p.suffix in (".folded", ".prof")),
+        key=lambda p: p.stat().st_mtime,
+    )
+    for stale in files[: max(0, len(files) - settings.profile_max_files)]:
+        stale.unlink(missing_ok=True)
+
+
+def _make_profiler():
+    if settings.profile_mode == "cprofile":
+        if not _cprofile_lock.acquire(blocking=False):
+            return None
+        return _DeterministicProfiler()
+    interval_s = max(settings.profile_interval_ms, 1.0) / 1000.0
+    return _StackSampler(threading.get_ident(), interval_s, settings.profile_max_seconds)
+
+
+@contextmanager
+def profile_requested(requested: bool = True) -> Iterator[None]:
+    """Ask the next profiled entry point in this context to profile."""
+    token = _requested.set(requested)
+    try:
+        yield
+    finally:
+        _requested.reset(token)
+
+
+@contextmanager
+def maybe_profile(name: str, force: bool = False) -> Iterator[str | None]:
+    """Profile the enclosed block if this request is selected.
+
+    Yields the profile tag (``<trace_id>-<span_id>``) or None when not profiling.
+    """
+    if _decided.get():
+        yield None
+        return
+    decided_token = _decided.set(True)
+    try:
+        if not should_profile(force) or not _slots.acquire(blocking=False):
+            yield None
+            return
+        try:
+            profiler = _make_profiler()
+            if profiler is None:
+                yield None
+                return
+            with span("profile", target=name, mode=settings.profile_mode) as sp:
+                ctx = sp.get_span_context()
+                tag = f"{ctx.trace_id:032x}-{ctx.span_id:016x}" if ctx.is_valid else uuid.uuid4().hex
+                profiler.start()
+                try:
+                    yield tag
+                finally:
+                    profiler.stop()
+                    if isinstance(profiler, _DeterministicProfiler):
+                        _cprofile_lock.release()
+                    try:
+                        PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+                        path = profiler.write(PROFILE_DIR / f"{tag}-{name}")
+                        sp.set_attribute("profile.path", str(path))
+                        _prune()
+                    except Exception as e:
+                        logger.warning("Could not write profile %s: %s", tag, e)
+        finally:
+            _slots.release()
+    finally:
+        _decided.reset(decided_token)
+
+
+def profiled(name: str):
+    """Decorator form of ``maybe_profile`` for pipeline entry points."""
+
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with maybe_profile(name):
+                return fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,236 @@
+"""Scheduled ReportCard precompute (Pro/Max "scheduled reports").
+
+Every REPORT_SCHEDULER_INTERVAL_S the scheduler builds ReportCards for each
+customer on a SCHEDULED_REPORT_PLANS plan, for each report in SCHEDULED_REPORT_IDS
+and each trailing window in SCHEDULED_REPORT_WINDOWS_DAYS (ending today). The
+builds run in a process pool (REPORT_SCHEDULER_WORKERS) so chart rendering and
+pandas work do not compete with the API for the GIL. The parent process writes
+the results in batches to a local SQLite cache (REPORT_CACHE_PATH) keyed by
+(customer, report, window).
+
+The chat path calls cached_report_card() first and only runs the live queries
+when there is no entry or it is older than REPORT_CACHE_MAX_AGE_S.
+
+    python -m zero_touch_cx.scheduler --once        # one precompute pass
+"""
+
+from __future__ import annotations
+
+import argparse
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, Iterable, Optional
+
+from .config import settings
+from .kvstore import SqliteKV, make_key
+from .observability import logger, span
+
+STORE_BATCH_SIZE = 200
+
+
+def _csv(value: str) -> list[str]:
+    return [v.strip() for v in value.split(",") if v.strip()]
+
+
+def report_window(days: int, today: Optional[date] = None) -> tuple[str, str]:
+    end = today or date.today()
+    return (end - timedelta(days=days)).isoformat(), end.isoformat()
+
+
+# ---------------------------------------------------------------------
+# Report cache
+# ---------------------------------------------------------------------
+
+_cache: SqliteKV | None = None
+_cache_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0, "stale": 0}
+_stats_lock = threading.Lock()
+
+
+def report_cache() -> SqliteKV:
+    global _cache
+    with _cache_lock:
+        if _cache is None or _cache.path != Path(settings.report_cache_path):
+            _cache = SqliteKV(settings.report_cache_path, table="report_cards")
+        return _cache
+
+
+def _count(key: str) -> None:
+    with _stats_lock:
+        _stats[key] += 1
+
+
+def report_cache_stats() -> dict:
+    with _stats_lock:
+        return dict(_stats)
+
+
+def cached_report_card(
+    customer_id: str,
+    report_id: str,
+    start_date: str,
+    end_date: str,
+    max_age_s: Optional[float] = None,
+) -> Optional[dict]:
+    """A precomputed card for exactly this window, or None if missing or stale."""
+    if not Path(settings.report_cache_path).exists():
+        _count("misses")
+        return None
+    entry = report_cache().get(make_key(customer_id, report_id, start_date, end_date))
+    if entry is None:
+        _count("misses")
+        return None
+    card, updated_at = entry
+    if time.time() - updated_at > (settings.report_cache_max_age_s if max_age_s is None else max_age_s):
+        _count("stale")
+        return None
+    _count("hits")
+    return card
+
+
+def store_report_cards(results: Iterable[tuple[str, str, str, str, dict]]) -> int:
+    items = [(make_key(c, r, s, e), card) for c, r, s, e, card in results]
+    stored = 0
+    for i in range(0, len(items), STORE_BATCH_SIZE):
+        stored += report_cache().set_many(items[i:i + STORE_BATCH_SIZE])
+    return stored
+
+
+# ---------------------------------------------------------------------
+# Precompute
+# ---------------------------------------------------------------------
+
+def eligible_customers(plans: Optional[list[str]] = None) -> list[str]:
+    """Customers whose current plan is one of ``plans`` (default SCHEDULED_REPORT_PLANS)."""
+    plans = plans or _csv(settings.scheduled_report_plans)
+    if settings.mock_mode:
+        from .tools.mock_store import load_csv
+
+        df = load_csv("billing_history.csv").sort_values("start_date")
+        latest = df.groupby("customer_id")["plan"].last()
+        return sorted(latest[latest.isin(plans)].index)
+
+    from google.cloud.bigquery import ArrayQueryParameter, QueryJobConfig
+
+    from .tools.bigquery_tools import _get_client
+
+    table = f"{settings.bq_dataset}.{settings.bq_billing_table}"
+    if settings.project:
+        table = f"{settings.project}.{table}"
+    query = f"""
+    SELECT customer_id
+    FROM `{table}`
+    WHERE TRUE
+    QUALIFY ROW_NUMBER() OVER (PARTITION BY customer_id ORDER BY start_date DESC) = 1
+      AND plan IN UNNEST(@plans)
+    ORDER BY customer_id
+    """
+    job_config = QueryJobConfig(query_parameters=[ArrayQueryParameter("plans", "STRING", plans)])
+    return [row["customer_id"] for row in _get_client().query(query, job_config=job_config).result()]
+
+
+def _build(task: tuple[str, str, str, str]) -> tuple[tuple[str, str, str, str], Optional[dict], Optional[str]]:
+    """Runs in a worker process."""
+    from .agents.report_cards import REPORT_BUILDERS
+
+    customer_id, report_id, start_date, end_date = task
+    try:
+        return task, REPORT_BUILDERS[report_id](customer_id, start_date, end_date), None
+    except Exception as e:
+        return task, None, f"{type(e).__name__}: {e}"
+
+
+def precompute_report_cards(
+    customers: Optional[list[str]] = None,
+    report_ids: Optional[list[str]] = None,
+    windows_days: Optional[list[int]] = None,
+    workers: Optional[int] = None,
+    today: Optional[date] = None,
+) -> dict[str, Any]:
+    """One precompute pass; returns counts of built, stored and failed cards."""
+    started = time.perf_counter()
+    customers = eligible_customers() if customers is None else customers
+    report_ids = report_ids or _csv(settings.scheduled_report_ids)
+    windows_days = windows_days or [int(d) for d in _csv(settings.scheduled_report_windows_days)]
+    tasks = [
+        (c, r, *report_window(d, today))
+        for c in customers for r in report_ids for d in windows_days
+    ]
+    stats = {"tasks": len(tasks), "stored": 0, "failed": 0}
+    if not tasks:
+        return {**stats, "seconds": 0.0}
+
+    with span("precompute_report_cards", tasks=len(tasks)):
+        workers = max(1, workers or settings.report_scheduler_workers)
+        pending: list[tuple[str, str, str, str, dict]] = []
+        # spawn: the API process has live threads (executors, exporters) that fork would copy mid-state.
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+            for task, card, error in pool.map(_build, tasks, chunksize=max(1, len(tasks) // (workers * 4))):
+                if error:
+                    stats["failed"] += 1
+                    logger.warning("Scheduled report %s failed: %s", task, error)
+                    continue
+                pending.append((*task, card))
+                if len(pending) >= STORE_BATCH_SIZE:
+                    stats["stored"] += store_report_cards(pending)
+                    pending = []
+        stats["stored"] += store_report_cards(pending)
+    return {**stats, "seconds": round(time.perf_counter() - started, 2)}
+
+
+class ReportScheduler:
+    """Background thread that runs precompute_report_cards every ``interval_s``."""
+
+    def __init__(self, interval_s: Optional[float] = None):
+        self.interval_s = interval_s or settings.report_scheduler_interval_s
+        self.last_run: Optional[dict] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._loop, name="zero-touch-report-scheduler", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.last_run = precompute_report_cards()
+                logger.info("Scheduled reports: %s", self.last_run)
+            except Exception:
+                logger.exception("Scheduled report pass failed")
+            self._stop.wait(self.interval_s)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Precompute scheduled ReportCards")
+    parser.add_argument("--once", action="store_true", help="run one pass and exit")
+    parser.add_argument("--customers", help="with --once: comma-separated customer IDs (default: eligible plans)")
+    args = parser.parse_args(argv)
+
+    customers = _csv(args.customers) if args.customers else None
+    if args.once:
+        print(precompute_report_cards(customers=customers))
+        return 0
+    scheduler = ReportScheduler()
+    scheduler.start()
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        scheduler.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
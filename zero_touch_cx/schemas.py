@@ -19,6 +19,7 @@ class ReportCard(BaseModel):
     rationale: str
     next_best_actions: list[str] = Field(default_factory=list)
     confidence: float = Field(ge=0, le=1)
+    rows: list[dict[str, Any]] | None = None  # raw rows, only when explicitly requested
 
 class UpgradeDecision(BaseModel):
     kind: Literal["upgrade_decision"] = "upgrade_decision"
@@ -0,0 +1,178 @@
+"""One validation, one encode: helpers for building and writing API payloads.
+
+Internal payloads (AgentResponse envelopes around data our own tools produced)
+are built with ``trusted_dict``, which skips pydantic validation and the deep
+copy of ``model_dump``; request and model-produced data still go through the
+normal constructors. Responses are encoded once with ``dumps`` (orjson when it
+is installed, stdlib json otherwise); app/main.py returns them as
+``FastJSONResponse`` so FastAPI does not run its own jsonable_encoder pass.
+
+``encode_response`` adds content negotiation for bulk consumers: MessagePack
+(``msgpack``) and Arrow IPC streams (``pyarrow``) are offered when those packages
+are installed, and bodies above RESPONSE_COMPRESS_MIN_BYTES are gzip- or
+zstd-compressed (``zstandard``) per Accept-Encoding. In the Arrow format the
+report rows are the record batches and the rest of the response travels as JSON
+in the schema metadata under ``zero_touch_cx.response``.
+"""
+
+from __future__ import annotations
+
+import gzip
+import importlib
+import io
+import json
+from functools import cache
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, TypeVar
+
+from pydantic import BaseModel
+
+from .config import settings
+
+try:  # optional: ~5-10x faster than json.dumps on large payloads
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+JSON = "application/json"
+MSGPACK = "application/x-msgpack"
+ARROW_STREAM = "application/vnd.apache.arrow.stream"
+_ALIASES = {"application/msgpack": MSGPACK, "application/vnd.msgpack": MSGPACK}
+ARROW_METADATA_KEY = b"zero_touch_cx.response"
+
+M = TypeVar("M", bound=BaseModel)
+
+
+def trusted_dict(model: type[M], **fields: Any) -> dict[str, Any]:
+    """``model(**fields).model_dump()`` without validation or copying, for fields we built ourselves."""
+    return dict(model.model_construct(**fields))
+
+
+def _default(obj: Any) -> Any:
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="json")
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    if hasattr(obj, "tolist"):  # numpy / pandas scalars and arrays
+        return obj.tolist()
+    return str(obj)
+
+
+def dumps(obj: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj, default=_default, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(obj, default=_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def dumps_str(obj: Any) -> str:
+    return dumps(obj).decode("utf-8")
+
+
+# ---------------------------------------------------------------------
+# Content negotiation and binary formats
+# ---------------------------------------------------------------------
+
+@cache
+def _optional(module: str):
+    """msgpack / pyarrow / zstandard, imported on first use; None when not installed."""
+    try:
+        return importlib.import_module(module)
+    except ImportError:
+        return None
+
+
+def available_formats() -> list[str]:
+    formats = [JSON]
+    if _optional("msgpack"):
+        formats.append(MSGPACK)
+    if _optional("pyarrow.ipc"):
+        formats.append(ARROW_STREAM)
+    return formats
+
+
+def _parse_header(value: str | None) -> list[str]:
+    """Tokens of an Accept / Accept-Encoding header by descending q, dropping q=0."""
+    items = []
+    for position, part in enumerate((value or "").split(",")):
+        token, *params = [p.strip() for p in part.split(";")]
+        q = 1.0
+        for param in params:
+            if param.startswith("q="):
+                try:
+                    q = float(param[2:])
+                except ValueError:
+                    q = 0.0
+        if token and q > 0:
+            items.append((-q, position, token.lower()))
+    return [token for _, _, token in sorted(items)]
+
+
+def negotiate(accept: str | None) -> str | None:
+    """Best available media type for an Accept header; None if nothing acceptable."""
+    if not accept:
+        return JSON
+    formats = available_formats()
+    for token in _parse_header(accept):
+        if token in ("*/*", "application/*"):
+            return JSON
+        token = _ALIASES.get(token, token)
+        if token in formats:
+            return token
+    return None
+
+
+def _split_rows(obj: Any) -> tuple[list[dict], Any]:
+    """(rows, response without rows): rows live on a card or on the response payload."""
+    if isinstance(obj, dict):
+        if isinstance(obj.get("rows"), list):
+            return obj["rows"], {k: v for k, v in obj.items() if k != "rows"}
+        payload = obj.get("payload")
+        if isinstance(payload, dict) and isinstance(payload.get("rows"), list):
+            return payload["rows"], {**obj, "payload": {k: v for k, v in payload.items() if k != "rows"}}
+    return [], obj
+
+
+def arrow_stream(obj: Any) -> bytes:
+    pyarrow, ipc = _optional("pyarrow"), _optional("pyarrow.ipc")
+    rows, rest = _split_rows(obj)
+    table = pyarrow.Table.from_pylist(rows) if rows else pyarrow.table({})
+    table = table.replace_schema_metadata({ARROW_METADATA_KEY: dumps(rest)})
+    sink = io.BytesIO()
+    with ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue()
+
+
+def encode(obj: Any, media_type: str = JSON) -> bytes:
+    if media_type == MSGPACK:
+        return _optional("msgpack").packb(obj, default=_default, use_bin_type=True)
+    if media_type == ARROW_STREAM:
+        return arrow_stream(obj)
+    return dumps(obj)
+
+
+def compress(body: bytes, accept_encoding: str | None, min_bytes: int | None = None) -> tuple[bytes, str | None]:
+    """(body, content-encoding); small bodies and unknown encodings pass through unchanged."""
+    if len(body) < (settings.response_compress_min_bytes if min_bytes is None else min_bytes):
+        return body, None
+    for token in _parse_header(accept_encoding):
+        if token == "zstd" and _optional("zstandard"):
+            return _optional("zstandard").ZstdCompressor(level=3).compress(body), "zstd"
+        if token == "gzip":
+            return gzip.compress(body, compresslevel=5), "gzip"
+    return body, None
+
+
+def encode_response(obj: Any, accept: str | None, accept_encoding: str | None) -> tuple[bytes, str, dict[str, str]]:
+    """(body, media type, extra headers) for a negotiated response; raises ValueError if not acceptable."""
+    media_type = negotiate(accept)
+    if media_type is None:
+        raise ValueError(f"Not acceptable; available: {', '.join(available_formats())}")
+    body, encoding = compress(encode(obj, media_type), accept_encoding)
+    headers = {"Vary": "Accept, Accept-Encoding"}
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    return body, media_type, headers
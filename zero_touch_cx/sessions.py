@@ -0,0 +1,133 @@
+"""Per-session conversation state for multi-turn flows.
+
+Upgrades take two turns: the first resolves the customer, current plan,
+eligibility, price and policy, and the second ("CONFIRM UPGRADE") applies the
+change. The first turn's results are kept here, keyed by (session, customer), so
+the confirmation is a cheap state transition instead of a second round of
+lookups and policy search. A per-session pointer remembers the last customer, so
+a bare "CONFIRM UPGRADE" resolves to the customer being quoted.
+
+State sits in an in-process LRU (TTLCache) in front of a local SQLite store
+(SESSION_STORE_PATH), so it survives restarts and is shared by workers on one
+instance. Entries expire SESSION_TTL_S after they were last written.
+
+The API layer sets the session for a request with ``session_scope``. The id is a
+context variable, so it reaches the executor threads that run the tools.
+Without a session id, nothing is remembered.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Iterator, Optional
+
+from .cache import TTLCache
+from .config import settings
+from .kvstore import SqliteKV, make_key
+
+_session_id: ContextVar[Optional[str]] = ContextVar("zero_touch_cx_session_id", default=None)
+_LAST_CUSTOMER = "*"
+
+
+@contextmanager
+def session_scope(session_id: Optional[str]) -> Iterator[None]:
+    token = _session_id.set(session_id.strip() if session_id and session_id.strip() else None)
+    try:
+        yield
+    finally:
+        _session_id.reset(token)
+
+
+def current_session_id() -> Optional[str]:
+    return _session_id.get()
+
+
+class SessionStore:
+    def __init__(self, path: Optional[str] = None, ttl_s: Optional[float] = None):
+        self.ttl_s = settings.session_ttl_s if ttl_s is None else ttl_s
+        self.lru = TTLCache(maxsize=settings.session_max_entries, ttl_s=self.ttl_s)
+        self.store = SqliteKV(path or settings.session_store_path, table="sessions")
+        self._stats_lock = threading.Lock()
+        self.stats = {"lru_hits": 0, "store_hits": 0, "misses": 0, "writes": 0}
+
+    def _count(self, key: str) -> None:
+        with self._stats_lock:
+            self.stats[key] += 1
+
+    def _read(self, key: str) -> Optional[dict]:
+        value = self.lru.get(key)
+        if value is not None:
+            self._count("lru_hits")
+            return value
+        entry = self.store.get(key)
+        if entry is not None:
+            value, updated_at = entry
+            remaining = self.ttl_s - (time.time() - updated_at)
+            if remaining > 0:
+                self._count("store_hits")
+                self.lru.set(key, value, ttl_s=remaining)
+                return value
+            self.store.delete(key)
+        self._count("misses")
+        return None
+
+    def get(self, session_id: str, customer_id: Optional[str] = None) -> Optional[dict]:
+        """State for (session, customer); without a customer, for the session's last customer."""
+        if customer_id is None:
+            pointer = self._read(make_key(session_id, _LAST_CUSTOMER))
+            if pointer is None:
+                return None
+            customer_id = pointer["customer_id"]
+        state = self._read(make_key(session_id, customer_id))
+        return None if state is None else {**state, "customer_id": customer_id}
+
+    def put(self, session_id: str, customer_id: str, state: dict[str, Any]) -> None:
+        items = [
+            (make_key(session_id, customer_id), {k: v for k, v in state.items() if k != "customer_id"}),
+            (make_key(session_id, _LAST_CUSTOMER), {"customer_id": customer_id}),
+        ]
+        self.store.set_many(items)
+        for key, value in items:
+            self.lru.set(key, value)
+        self._count("writes")
+
+    def update(self, session_id: str, customer_id: str, **changes: Any) -> dict:
+        state = {**(self.get(session_id, customer_id) or {}), **changes}
+        self.put(session_id, customer_id, state)
+        return state
+
+    def snapshot(self) -> dict:
+        with self._stats_lock:
+            stats = dict(self.stats)
+        return {**stats, "lru": self.lru.stats()}
+
+
+_store: SessionStore | None = None
+_store_lock = threading.Lock()
+
+
+def get_session_store() -> SessionStore:
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = SessionStore()
+        return _store
+
+
+def session_state(customer_id: Optional[str] = None) -> Optional[dict]:
+    """State of the current request's session (None outside a session)."""
+    session_id = current_session_id()
+    return get_session_store().get(session_id, customer_id) if session_id else None
+
+
+def update_session(customer_id: str, **changes: Any) -> None:
+    session_id = current_session_id()
+    if session_id:
+        get_session_store().update(session_id, customer_id, **changes)
+
+
+def session_stats() -> dict:
+    return get_session_store().snapshot()
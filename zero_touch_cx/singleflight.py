@@ -0,0 +1,144 @@
+"""Singleflight: concurrent identical calls share one execution.
+
+After a market event hundreds of requests ask for the same balance or report at
+once. ``@coalesce("name")`` makes a tool call with the same normalized arguments
+(bound to the signature, defaults applied, strings stripped) join the call that
+is already in flight instead of starting another BigQuery job; every caller gets
+its result (or its exception). Nothing is cached: once the leader returns, the
+next call runs again.
+
+Threads wait on the flight directly. Asyncio tasks use ``tool.aio(...)``, which
+runs the same call on the "bigquery" executor and joins there, so threads and
+tasks asking for the same thing share one flight. A flight is only registered
+by a thread that runs it: pool jobs that call a tool synchronously never wait on
+a leader still queued behind them. Followers get a shallow copy of a dict
+result; nested values are shared and must not be mutated.
+
+Disable with SINGLEFLIGHT_ENABLED=false. singleflight_stats() is served at /metrics.
+"""
+
+from __future__ import annotations
+
+import datetime
+import functools
+import inspect
+import threading
+from typing import Any, Callable, Hashable, TypeVar
+
+from .config import settings
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+def _normalize(value: Any) -> Hashable:
+    if isinstance(value, str):
+        return value.strip()
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.isoformat()
+    if isinstance(value, (list, tuple)):
+        return tuple(_normalize(v) for v in value)
+    if isinstance(value, dict):
+        return tuple(sorted((k, _normalize(v)) for k, v in value.items()))
+    return value
+
+
+def _share(result: Any) -> Any:
+    return dict(result) if isinstance(result, dict) else result
+
+
+class _Flight:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight:
+    def __init__(self, name: str):
+        self.name = name
+        self._flights: dict[Hashable, _Flight] = {}
+        self._lock = threading.Lock()
+        self.stats = {"calls": 0, "executions": 0, "coalesced": 0, "errors": 0}
+
+    def _join(self, key: Hashable) -> tuple[_Flight, bool]:
+        """(flight, is_leader)"""
+        with self._lock:
+            self.stats["calls"] += 1
+            flight = self._flights.get(key)
+            if flight is not None:
+                self.stats["coalesced"] += 1
+                return flight, False
+            flight = self._flights[key] = _Flight()
+            self.stats["executions"] += 1
+            return flight, True
+
+    def _finish(self, key: Hashable, flight: _Flight, result: Any, error: BaseException | None) -> None:
+        with self._lock:
+            del self._flights[key]
+            if error is not None:
+                self.stats["errors"] += 1
+            flight.result, flight.error = result, error
+            flight.done.set()
+
+    def _run(self, key: Hashable, flight: _Flight, fn: Callable, args: tuple, kwargs: dict) -> Any:
+        try:
+            result = fn(*args, **kwargs)
+        except BaseException as e:
+            self._finish(key, flight, None, e)
+            raise
+        self._finish(key, flight, result, None)
+        return result
+
+    def do(self, key: Hashable, fn: Callable, *args: Any, **kwargs: Any) -> Any:
+        flight, leader = self._join(key)
+        if leader:
+            return self._run(key, flight, fn, args, kwargs)
+        flight.done.wait()
+        if flight.error is not None:
+            raise flight.error
+        return _share(flight.result)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {**self.stats, "in_flight": len(self._flights)}
+
+
+_groups: dict[str, SingleFlight] = {}
+
+
+def coalesce(name: str) -> Callable[[F], F]:
+    """Decorator: concurrent calls with equal normalized arguments share one execution."""
+
+    def decorate(fn: F) -> F:
+        group = _groups.setdefault(name, SingleFlight(name))
+        signature = inspect.signature(fn)
+
+        def key(args: tuple, kwargs: dict) -> Hashable:
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            return tuple((k, _normalize(v)) for k, v in bound.arguments.items())
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not settings.singleflight_enabled:
+                return fn(*args, **kwargs)
+            return group.do(key(args, kwargs), fn, *args, **kwargs)
+
+        async def aio(*args, **kwargs):
+            from .executors import run_blocking
+
+            # Joined on the worker: a leader registered from the event loop could wait
+            # behind pool jobs that follow it.
+            return await run_blocking("bigquery", wrapper, *args, **kwargs)
+
+        wrapper.aio = aio
+        wrapper.singleflight = group
+        return wrapper  # type: ignore[return-value]
+
+    return decorate
+
+
+def singleflight_stats() -> dict:
+    return {name: group.snapshot() for name, group in sorted(_groups.items())}
@@ -0,0 +1,351 @@
+"""Streaming NACHA (ACH) file verification.
+
+A NACHA file is a sequence of 94-character records: one file header (1), batches
+of batch header (5), entries (6) with optional addenda (7) and batch control (8),
+then the file control (9) and "9999..." block fill. Files are read record by
+record, so memory stays flat for files with tens of thousands of entries, whether
+records are newline-separated or blocked into one long line.
+
+Each completed batch (grouped until ACH_TASK_MIN_RECORDS records to keep IPC
+cheap) is checked in a process pool of ACH_VERIFY_WORKERS: entry and addenda
+count, entry hash (sum of receiving DFI routing numbers, rightmost 10 digits) and
+debit/credit totals against the batch control. The parent streams the next
+batches while workers run, keeps at most ACH_BATCHES_IN_FLIGHT tasks
+outstanding, rolls the batch results up against the file control, and matches
+every entry against the pending index by (account suffix, amount in cents).
+
+    python -m zero_touch_cx.tools.ach verify incoming.ach
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import multiprocessing
+import os
+import threading
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, Iterable, Iterator, Optional
+
+from ..config import settings
+from ..observability import span
+
+DATA_DIR = Path(__file__).resolve().parents[2] / "data"  # as in mock_store, without pandas
+RECORD_SIZE = 94
+# Second digit of the transaction code: 1-4 are credits (1 = return/NOC, 2 = live, 3 = prenote,
+# 4 = zero dollar), 6-9 the same for debits.
+CREDIT_DIGITS = frozenset("1234")
+DEBIT_DIGITS = frozenset("6789")
+MAX_ERRORS = 100
+SAMPLE_SIZE = 20
+
+
+def to_cents(amount: float | str | Decimal) -> int:
+    return int((Decimal(str(amount)) * 100).quantize(Decimal(1)))
+
+
+def iter_records(path: str | Path) -> Iterator[str]:
+    """94-character records of a file, skipping blank lines and block fill."""
+    with open(path, "r", encoding="ascii", errors="replace", newline=None) as f:
+        for line in f:
+            line = line.rstrip("\r\n")
+            if not line.strip():
+                continue
+            parts = (
+                [line[i:i + RECORD_SIZE] for i in range(0, len(line), RECORD_SIZE)]
+                if len(line) > RECORD_SIZE else [line.ljust(RECORD_SIZE)]
+            )
+            for record in parts:
+                if record != "9" * RECORD_SIZE:
+                    yield record
+
+
+# ---------------------------------------------------------------------
+# Batch checks (run in worker processes)
+# ---------------------------------------------------------------------
+
+@dataclass
+class BatchResult:
+    batch_number: str
+    company_name: str
+    entries: int = 0
+    addenda: int = 0
+    entry_hash: int = 0
+    debit_cents: int = 0
+    credit_cents: int = 0
+    errors: list[str] = field(default_factory=list)
+    items: list[tuple[str, int, str]] = field(default_factory=list)  # (account suffix, cents, trace number)
+
+
+def _int(field_: str) -> Optional[int]:
+    field_ = field_.strip()
+    return int(field_) if field_.isdigit() else None
+
+
+def _batch_number(record: str) -> str:
+    return record[87:94].strip().lstrip("0") or "0"
+
+
+def check_batch(records: list[str]) -> BatchResult:
+    """Totals of one batch (5, 6/7..., 8) compared with its batch control."""
+    header, *body, control = records
+    result = BatchResult(batch_number=_batch_number(header), company_name=header[4:20].strip())
+    label = f"batch {result.batch_number}"
+    for record in body:
+        if record[0] == "7":
+            result.addenda += 1
+            continue
+        result.entries += 1
+        code, routing, amount = record[1:3], _int(record[3:11]), _int(record[29:39])
+        if routing is None or amount is None:
+            result.errors.append(f"{label}: malformed entry {record[79:94].strip() or '?'}")
+            continue
+        result.entry_hash += routing
+        if code[1:] in DEBIT_DIGITS:
+            result.debit_cents += amount
+        elif code[1:] in CREDIT_DIGITS:
+            result.credit_cents += amount
+        else:
+            result.errors.append(f"{label}: unknown transaction code {code!r}")
+        result.items.append((record[12:29].strip()[-4:], amount, record[79:94].strip()))
+
+    result.entry_hash %= 10**10
+    expected = {
+        "entry/addenda count": (_int(control[4:10]), result.entries + result.addenda),
+        "entry hash": (_int(control[10:20]), result.entry_hash),
+        "total debit": (_int(control[20:32]), result.debit_cents),
+        "total credit": (_int(control[32:44]), result.credit_cents),
+    }
+    for name, (declared, actual) in expected.items():
+        if declared != actual:
+            result.errors.append(f"{label}: {name} is {declared}, entries add up to {actual}")
+    if control[1:4] != header[1:4]:
+        result.errors.append(f"{label}: service class {control[1:4]} in control, {header[1:4]} in header")
+    if _batch_number(control) != result.batch_number:
+        result.errors.append(f"{label}: control is for batch {_batch_number(control)}")
+    return result
+
+
+def check_batches(batches: list[list[str]]) -> list[BatchResult]:
+    return [check_batch(records) for records in batches]
+
+
+# ---------------------------------------------------------------------
+# Pending entries
+# ---------------------------------------------------------------------
+
+class PendingAchIndex:
+    """Pending ACH entries keyed by (account suffix, amount in cents)."""
+
+    def __init__(self, rows: Iterable[dict[str, Any]] = ()):
+        self._entries: dict[tuple[str, int], dict[str, Any]] = {}
+        for row in rows:
+            self.add(**row)
+
+    def add(self, account_suffix: str, amount: float | str, **info: Any) -> None:
+        self._entries[(str(account_suffix).strip()[-4:], to_cents(amount))] = {
+            "account_suffix": str(account_suffix).strip()[-4:], "amount": float(amount), **info,
+        }
+
+    def match(self, account_suffix: str, amount_cents: int) -> Optional[dict[str, Any]]:
+        return self._entries.get((account_suffix[-4:], amount_cents))
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @classmethod
+    def from_csv(cls, path: str | Path) -> "PendingAchIndex":
+        with open(path, newline="", encoding="utf-8") as f:
+            return cls(csv.DictReader(f))
+
+
+_index: PendingAchIndex | None = None
+_index_lock = threading.Lock()
+
+
+def get_pending_index() -> PendingAchIndex:
+    global _index
+    with _index_lock:
+        if _index is None:
+            path = Path(settings.ach_pending_path or DATA_DIR / "pending_ach.csv")
+            _index = PendingAchIndex.from_csv(path) if path.exists() else PendingAchIndex()
+        return _index
+
+
+# ---------------------------------------------------------------------
+# File verification
+# ---------------------------------------------------------------------
+
+_pool: ProcessPoolExecutor | None = None
+_pool_lock = threading.Lock()
+
+
+def _workers() -> int:
+    return settings.ach_verify_workers or os.cpu_count() or 1
+
+
+def get_pool() -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # spawn, as in scheduler.py: forking the threaded API process can copy held locks.
+            _pool = ProcessPoolExecutor(max_workers=_workers(), mp_context=multiprocessing.get_context("spawn"))
+        return _pool
+
+
+def shutdown_ach_pool() -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+
+
+class _Batches:
+    """Splits the record stream into batches and remembers the file-level records."""
+
+    def __init__(self, records: Iterator[str]):
+        self.records = records
+        self.count = 0
+        self.header: Optional[str] = None
+        self.control: Optional[str] = None
+        self.errors: list[str] = []
+
+    def __iter__(self) -> Iterator[list[str]]:
+        batch: Optional[list[str]] = None
+        for record in self.records:
+            self.count += 1
+            kind = record[0]
+            if kind == "1":
+                self.header = record
+            elif kind == "5":
+                if batch is not None:
+                    self.errors.append(f"batch {_batch_number(batch[0])}: no batch control")
+                batch = [record]
+            elif kind in "67" and batch is not None:
+                batch.append(record)
+            elif kind == "8" and batch is not None:
+                batch.append(record)
+                yield batch
+                batch = None
+            elif kind == "9":
+                self.control = record
+            else:
+                self.errors.append(f"record {self.count}: unexpected type {kind!r} outside a batch")
+        if batch is not None:
+            self.errors.append(f"batch {_batch_number(batch[0])}: no batch control")
+
+
+def _tasks(batches: Iterable[list[str]], min_records: int) -> Iterator[list[list[str]]]:
+    group, size = [], 0
+    for batch in batches:
+        group.append(batch)
+        size += len(batch)
+        if size >= min_records:
+            yield group
+            group, size = [], 0
+    if group:
+        yield group
+
+
+def _results(tasks: Iterator[list[list[str]]], workers: int) -> Iterator[BatchResult]:
+    """Batch results in file order; tasks go to the process pool unless there is one worker."""
+    if workers <= 1:
+        for task in tasks:
+            yield from check_batches(task)
+        return
+    pool, pending = get_pool(), deque[Future]()
+    for task in tasks:
+        pending.append(pool.submit(check_batches, task))
+        if len(pending) >= settings.ach_batches_in_flight:
+            yield from pending.popleft().result()
+    while pending:
+        yield from pending.popleft().result()
+
+
+def verify_file(
+    path: str | Path,
+    index: Optional[PendingAchIndex] = None,
+    workers: Optional[int] = None,
+) -> dict[str, Any]:
+    """Control-total check of a whole NACHA file plus its matches in the pending index."""
+    index = get_pending_index() if index is None else index
+    workers = _workers() if workers is None else workers
+    batches = _Batches(iter_records(path))
+    errors: list[str] = []
+    totals = {"batches": 0, "entries": 0, "addenda": 0, "entry_hash": 0, "debit_cents": 0, "credit_cents": 0}
+    matched, unmatched, unmatched_sample = [], 0, []
+
+    with span("verify_ach_file", file=Path(path).name, workers=workers):
+        for result in _results(_tasks(batches, settings.ach_task_min_records), workers):
+            totals["batches"] += 1
+            for key in ("entries", "addenda", "entry_hash", "debit_cents", "credit_cents"):
+                totals[key] += getattr(result, key)
+            errors.extend(result.errors)
+            for suffix, cents, trace in result.items:
+                pending = index.match(suffix, cents)
+                if pending is not None:
+                    matched.append({**pending, "trace_number": trace, "batch_number": result.batch_number})
+                else:
+                    unmatched += 1
+                    if len(unmatched_sample) < SAMPLE_SIZE:
+                        unmatched_sample.append({"account_suffix": suffix, "amount": cents / 100, "trace_number": trace})
+
+    errors = batches.errors + errors
+    if batches.header is None:
+        errors.append("no file header record")
+    control = batches.control
+    if control is None:
+        errors.append("no file control record")
+    else:
+        expected = {
+            "batch count": (_int(control[1:7]), totals["batches"]),
+            "entry/addenda count": (_int(control[13:21]), totals["entries"] + totals["addenda"]),
+            "entry hash": (_int(control[21:31]), totals["entry_hash"] % 10**10),
+            "total debit": (_int(control[31:43]), totals["debit_cents"]),
+            "total credit": (_int(control[43:55]), totals["credit_cents"]),
+        }
+        for name, (declared, actual) in expected.items():
+            if declared != actual:
+                errors.append(f"file control: {name} is {declared}, batches add up to {actual}")
+        blocks = -(-batches.count // 10)  # fill records were skipped, so this is a lower bound
+        if (_int(control[7:13]) or 0) < blocks:
+            errors.append(f"file control: block count is {_int(control[7:13])}, file has at least {blocks}")
+
+    return {
+        "status": "VALID" if not errors else "INVALID",
+        "file": Path(path).name,
+        "batches": totals["batches"],
+        "entries": totals["entries"],
+        "total_debit": totals["debit_cents"] / 100,
+        "total_credit": totals["credit_cents"] / 100,
+        "errors": errors[:MAX_ERRORS],
+        "error_count": len(errors),
+        "matched_pending": matched,
+        "unmatched_entries": unmatched,
+        "unmatched_sample": unmatched_sample,
+    }
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Verify NACHA files")
+    sub = parser.add_subparsers(dest="command", required=True)
+    verify = sub.add_parser("verify", help="check control totals and match pending entries")
+    verify.add_argument("file", type=Path)
+    verify.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    from ..serialization import dumps_str
+
+    report = verify_file(args.file, workers=args.workers)
+    print(dumps_str(report))
+    shutdown_ach_pool()
+    return 0 if report["status"] == "VALID" else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,5 +1,6 @@
 # zero_touch_cx/tools/bigquery_tools.py
 
+from datetime import date, timedelta
 from typing import List, Dict, Any
 from google.cloud import bigquery
 
@@ -35,40 +36,24 @@ def fetch_wire_status_report(
     days: int = 30
 ) -> List[Dict[str, Any]]:
     """
-    Fetch wire status events for a customer
-    from BigQuery dataset `reporting_agent`.
+    Fetch wire status events for a customer from the last ``days`` days
+    of `report_event` (newest first, at most 500).
 
     - Secure (parameterized query)
-    - Read-only
+    - Read-only; filters on the run_ts partition column so only those days are scanned
     - Works with ADK Web locally
     """
-
-    query = f"""
-        SELECT
-            customer_id
-        FROM `{WIRE_EVENTS_FQN}`
-        WHERE customer_id = @customer_id
-          AND event_ts >= TIMESTAMP_SUB(
-                CURRENT_TIMESTAMP(),
-                INTERVAL @days DAY
-          )
-        ORDER BY event_ts DESC
-        LIMIT 500
-    """
-
-    job_config = bigquery.QueryJobConfig(
-        query_parameters=[
-            bigquery.ScalarQueryParameter(
-                "customer_id", "STRING", customer_id
-            ),
-            bigquery.ScalarQueryParameter(
-                "days", "INT64", days
-            ),
-        ]
+    from .query_builder import REPORT_EVENT, run_query, select
+
+    end = date.today()
+    query = (
+        select(
+            REPORT_EVENT, "CustomerID AS customer_id", "report_id", "run_ts", "status",
+            order_by="run_ts DESC", limit=500,
+        )
+        .where_equals("CustomerID", "customer_id", "STRING", customer_id)
+        .where_partition_range((end - timedelta(days=days)).isoformat(), end.isoformat())
     )
-
-    client = _get_client()
-    query_job = client.query(query, job_config=job_config)
-    rows = query_job.result()
+    rows, _ = run_query(query, _get_client())
 
     return [dict(row) for row in rows]
@@ -0,0 +1,308 @@
+"""Billing data source: month-to-date charges from the billing table.
+
+The billing table (``settings.bq_billing_table``) holds plan periods
+(customer_id, plan, start_date, mrr_usd). A period is charged ``mrr_usd`` per
+month, prorated by day, until the customer's next period starts. Line items and
+totals for a date range are computed by the source (SQL in BigQuery, vectorised
+pandas for the local CSV used in mock mode and tests), never by summing rows in
+the agent.
+
+Month-to-date results are cached per (customer, month) up to the last complete
+day, so later calls in the same month only query the days after it (plus today,
+which is never cached because the plan can still change). A request ending before
+the cached day is answered by cutting the cached lines back to its last day.
+Tuning: BILLING_CACHE_TTL_S, BILLING_CACHE_MAX_ENTRIES.
+"""
+
+from __future__ import annotations
+
+import calendar
+import shutil
+import threading
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, Protocol
+
+from ..cache import TTLCache
+from ..config import settings
+from ..observability import span
+
+
+class BillingSource(Protocol):
+    name: str
+
+    def line_items(self, customer_id: str, start: date, end: date) -> list[dict[str, Any]]:
+        """Charges per plan period for the days start..end (inclusive, one calendar month)."""
+
+
+def _days_in_month(day: date) -> int:
+    return calendar.monthrange(day.year, day.month)[1]
+
+
+class BigQueryBillingSource:
+    name = "bigquery"
+
+    QUERY = """
+    WITH periods AS (
+      SELECT
+        plan,
+        DATE(start_date) AS period_start,
+        mrr_usd,
+        LEAD(DATE(start_date)) OVER (ORDER BY start_date) AS next_start
+      FROM `{table}`
+      WHERE customer_id = @customer_id
+    ),
+    windows AS (
+      SELECT
+        plan,
+        period_start,
+        mrr_usd,
+        GREATEST(period_start, @start_date) AS from_date,
+        LEAST(IFNULL(DATE_SUB(next_start, INTERVAL 1 DAY), @end_date), @end_date) AS to_date
+      FROM periods
+      WHERE period_start <= @end_date
+        AND (next_start IS NULL OR next_start > @start_date)
+    )
+    SELECT
+      plan,
+      period_start,
+      from_date,
+      to_date,
+      DATE_DIFF(to_date, from_date, DAY) + 1 AS days,
+      mrr_usd * (DATE_DIFF(to_date, from_date, DAY) + 1) / @days_in_month AS amount
+    FROM windows
+    ORDER BY period_start
+    """
+
+    def __init__(self, table: str | None = None):
+        dataset_table = f"{settings.bq_dataset}.{settings.bq_billing_table}"
+        self.table = table or (f"{settings.project}.{dataset_table}" if settings.project else dataset_table)
+
+    def line_items(self, customer_id: str, start: date, end: date) -> list[dict[str, Any]]:
+        from google.cloud.bigquery import QueryJobConfig, ScalarQueryParameter
+
+        from .bigquery_tools import _get_client
+
+        job_config = QueryJobConfig(query_parameters=[
+            ScalarQueryParameter("customer_id", "STRING", customer_id),
+            ScalarQueryParameter("start_date", "DATE", start),
+            ScalarQueryParameter("end_date", "DATE", end),
+            ScalarQueryParameter("days_in_month", "INT64", _days_in_month(start)),
+        ])
+        rows = _get_client().query(self.QUERY.format(table=self.table), job_config=job_config).result()
+        return [dict(row) for row in rows]
+
+
+class CsvBillingSource:
+    """Same contract as BigQueryBillingSource over a local billing_history.csv.
+
+    Defaults to the mock billing store once an upgrade was committed there, else
+    the tracked data.
+    """
+
+    name = "mock"
+
+    def __init__(self, path: str | Path | None = None):
+        self._path = Path(path) if path else None
+
+    @property
+    def path(self) -> Path:
+        from .mock_store import billing_history_path
+
+        return self._path or billing_history_path()
+
+    def line_items(self, customer_id: str, start: date, end: date) -> list[dict[str, Any]]:
+        from .mock_store import records_by
+
+        # A customer has a handful of plan periods; plain Python beats per-call pandas here.
+        rows = records_by(self.path, "customer_id", parse_dates=["start_date"]).get(customer_id, [])
+        periods = sorted((r["start_date"].date(), r["plan"], float(r["mrr_usd"])) for r in rows)
+        month_days = _days_in_month(start)
+        out = []
+        for i, (period_start, plan, mrr) in enumerate(periods):
+            from_date = max(period_start, start)
+            to_date = min(periods[i + 1][0] - timedelta(days=1), end) if i + 1 < len(periods) else end
+            days = (to_date - from_date).days + 1
+            if days > 0:
+                out.append({
+                    "plan": plan,
+                    "period_start": period_start,
+                    "from_date": from_date,
+                    "to_date": to_date,
+                    "days": days,
+                    "amount": mrr * days / month_days,
+                })
+        return out
+
+
+def get_billing_source() -> BillingSource:
+    return CsvBillingSource() if settings.mock_mode else BigQueryBillingSource()
+
+
+# ---------------------------------------------------------------------
+# Billing store (writes): new plan periods, applied in batches
+# ---------------------------------------------------------------------
+
+class BigQueryBillingStore:
+    """Appends plan periods to the billing table, one streaming insert per batch."""
+
+    def __init__(self, table: str | None = None):
+        self.table = table or BigQueryBillingSource().table
+
+    def append_periods(self, periods: list[dict[str, Any]]) -> None:
+        from .bigquery_tools import _get_client
+
+        errors = _get_client().insert_rows_json(self.table, [
+            {**p, "start_date": str(p["start_date"])} for p in periods
+        ])
+        if errors:
+            raise RuntimeError(f"BigQuery insert failed: {errors[:3]}")
+
+
+class CsvBillingStore:
+    """Appends plan periods to a local billing_history.csv, one write per batch.
+
+    Defaults to BILLING_STORE_PATH, a copy of the mock billing_history.csv made on
+    first write, so confirmed demo upgrades never rewrite the tracked data.
+    """
+
+    COLUMNS = ("customer_id", "plan", "start_date", "mrr_usd")
+
+    def __init__(self, path: str | Path | None = None):
+        self.path = Path(path or settings.billing_store_path)
+        self._lock = threading.Lock()
+
+    def append_periods(self, periods: list[dict[str, Any]]) -> None:
+        from .mock_store import DATA_DIR
+
+        lines = "".join(",".join(str(p[c]) for c in self.COLUMNS) + "\n" for p in periods)
+        with self._lock:
+            if not self.path.exists():
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                shutil.copyfile(DATA_DIR / "billing_history.csv", self.path)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(lines)
+
+
+def get_billing_store():
+    return CsvBillingStore() if settings.mock_mode else BigQueryBillingStore()
+
+
+def _merge(lines: dict[date, dict], new_lines: list[dict]) -> None:
+    """Fold line items for later days into ``lines`` (keyed by period start)."""
+    for item in new_lines:
+        cur = lines.get(item["period_start"])
+        if cur is None:
+            lines[item["period_start"]] = dict(item)
+            continue
+        cur["to_date"] = max(cur["to_date"], item["to_date"])
+        cur["from_date"] = min(cur["from_date"], item["from_date"])
+        cur["days"] += item["days"]
+        cur["amount"] += item["amount"]
+
+
+def _cut(lines: dict[date, dict], end: date) -> dict[date, dict]:
+    """Copies of ``lines`` covering only days up to ``end`` (a period accrues evenly per day)."""
+    out = {}
+    for period_start, item in lines.items():
+        if item["from_date"] > end:
+            continue
+        item = dict(item)
+        if item["to_date"] > end:
+            days = (end - item["from_date"]).days + 1
+            item["amount"] = item["amount"] * days / item["days"]
+            item["to_date"], item["days"] = end, days
+        out[period_start] = item
+    return out
+
+
+class MonthToDateCache:
+    """Per (customer, month) line items through the last complete day, extended incrementally."""
+
+    def __init__(self, source: BillingSource | None = None, maxsize: int | None = None, ttl_s: float | None = None):
+        self.source = source
+        self._cache = TTLCache(
+            maxsize=maxsize or settings.billing_cache_max_entries,
+            ttl_s=ttl_s if ttl_s is not None else settings.billing_cache_ttl_s,
+        )
+        # Striped: a bounded set of locks, one per hash bucket of (source, customer, month).
+        self._locks = tuple(threading.Lock() for _ in range(64))
+        self.queried_days = 0
+
+    def _lock(self, key: tuple) -> threading.Lock:
+        return self._locks[hash(key) % len(self._locks)]
+
+    def _query(self, source: BillingSource, customer_id: str, start: date, end: date) -> list[dict]:
+        self.queried_days += (end - start).days + 1
+        return source.line_items(customer_id, start, end)
+
+    def month_to_date(self, customer_id: str, end: date, today: date | None = None) -> dict[str, Any]:
+        source = self.source or get_billing_source()
+        month_start = end.replace(day=1)
+        # Days before today are final; today's charges are always read fresh.
+        final_through = min(end, (today or date.today()) - timedelta(days=1))
+        key = (source.name, customer_id, month_start)
+
+        with self._lock(key):
+            entry = self._cache.get(key) or {"through": month_start - timedelta(days=1), "lines": {}}
+            if entry["through"] < final_through:
+                fresh = self._query(source, customer_id, entry["through"] + timedelta(days=1), final_through)
+                entry = {"through": final_through, "lines": {k: dict(v) for k, v in entry["lines"].items()}}
+                _merge(entry["lines"], fresh)
+                self._cache.set(key, entry)
+
+        # A cached entry may run past ``end`` (an earlier, longer request this month).
+        lines = _cut(entry["lines"], end)
+        if final_through < end:
+            _merge(lines, self._query(source, customer_id, max(final_through + timedelta(days=1), month_start), end))
+        return {"lines": sorted(lines.values(), key=lambda l: l["period_start"]), "source": source.name}
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+    def stats(self) -> dict:
+        return {**self._cache.stats(), "queried_days": self.queried_days}
+
+
+_mtd_cache = MonthToDateCache()
+
+
+def _line_json(item: dict) -> dict:
+    return {
+        "plan": item["plan"],
+        "from_date": str(item["from_date"]),
+        "to_date": str(item["to_date"]),
+        "days": int(item["days"]),
+        "amount": round(float(item["amount"]), 2),
+    }
+
+
+def billing_history(customer_id: str, start_date: str, end_date: str) -> dict:
+    """Line items and total for start_date..end_date (YYYY-MM-DD, within one month)."""
+    with span("billing_history", customer_id=customer_id):
+        try:
+            start, end = date.fromisoformat(start_date), date.fromisoformat(end_date)
+            if start > end or (start.year, start.month) != (end.year, end.month):
+                return {"status": "error", "error": "Date range must fall within a single month."}
+            if start.day == 1:
+                result = _mtd_cache.month_to_date(customer_id, end)
+            else:
+                source = get_billing_source()
+                result = {"lines": source.line_items(customer_id, start, end), "source": source.name}
+        except Exception as e:
+            return {"status": "error", "error": f"Billing lookup failed: {e}"}
+
+        history = [_line_json(item) for item in result["lines"]]
+        return {
+            "status": "success",
+            "customer_id": customer_id,
+            "start_date": start_date,
+            "end_date": end_date,
+            "total_amount": round(sum(float(item["amount"]) for item in result["lines"]), 2),
+            "history": history,
+            "source": result["source"],
+        }
+
+
+def billing_cache_stats() -> dict:
+    return _mtd_cache.stats()
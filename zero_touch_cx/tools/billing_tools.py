@@ -1,9 +1,27 @@
 from __future__ import annotations
+from ..cache import TTLCache
+from ..config import settings
 from ..observability import span
-from .mock_store import current_plan
+from .policy_tools import policy_check
 
 PLAN_PRICING = {"Basic":0.0,"Starter":19.0,"Pro":49.0,"Max":199.0}
 
+# Customer -> current plan. Queued upgrades are written here first (write-behind,
+# see upgrade_queue.py) so eligibility checks see the new plan before it is committed.
+_plan_cache = TTLCache(maxsize=settings.billing_cache_max_entries, ttl_s=settings.plan_cache_ttl_s)
+
+def cached_current_plan(customer_id: str) -> str:
+    plan = _plan_cache.get(customer_id)
+    if plan is None:
+        from .mock_store import current_plan  # pandas; kept off the agent import path
+
+        plan = current_plan(customer_id)
+        _plan_cache.set(customer_id, plan)
+    return plan
+
+def forget_cached_plan(customer_id: str, requested_plan: str | None = None) -> None:
+    _plan_cache.pop(customer_id)
+
 def simulate_pricing(customer_id: str, requested_plan: str) -> dict:
     with span("simulate_pricing", customer_id=customer_id, requested_plan=requested_plan):
         price = PLAN_PRICING.get(requested_plan)
@@ -13,9 +31,12 @@ def simulate_pricing(customer_id: str, requested_plan: str) -> dict:
 
 def check_upgrade_eligibility(customer_id: str, requested_plan: str) -> dict:
     with span("check_upgrade_eligibility", customer_id=customer_id, requested_plan=requested_plan):
-        cur = current_plan(customer_id)
+        cur = cached_current_plan(customer_id)
         eligible = True
         reasons = []
+        if requested_plan == cur:
+            eligible = False
+            reasons.append(f"Already on the {cur} plan.")
         if requested_plan in ("Pro","Max"):
             payment_on_file = (customer_id != "cust_002")  # demo
             if not payment_on_file:
@@ -23,6 +44,71 @@ def check_upgrade_eligibility(customer_id: str, requested_plan: str) -> dict:
                 reasons.append("No valid payment method on file.")
         return {"status":"success","current_plan":cur,"eligible":eligible,"reasons":reasons}
 
-def execute_upgrade(customer_id: str, requested_plan: str) -> dict:
+def execute_upgrade(customer_id: str, requested_plan: str, current_plan: str | None = None) -> dict:
+    """Queues the plan change and returns the ticket; the billing write happens in the background."""
+    from .upgrade_queue import get_upgrade_queue
+
     with span("execute_upgrade", customer_id=customer_id, requested_plan=requested_plan):
-        return {"status":"success","message":f"Upgrade to {requested_plan} submitted.", "ticket_id":f"chg_{customer_id}"}
+        if requested_plan not in PLAN_PRICING:
+            return {"status":"error","error":"Unknown plan"}
+        current_plan = current_plan or cached_current_plan(customer_id)
+        ticket = get_upgrade_queue().enqueue(customer_id, requested_plan, current_plan)
+        _plan_cache.set(customer_id, requested_plan)
+        message = (f"Upgrade to {requested_plan} was already submitted." if ticket["duplicate"]
+                   else f"Upgrade to {requested_plan} submitted.")
+        return {"status":"success","message":message, **ticket}
+
+def _upgrade_quote(customer_id: str, requested_plan: str, user_text: str) -> dict:
+    """Eligibility, price and policy for an upgrade, reusing this session's earlier quote."""
+    from ..sessions import session_state
+
+    state = session_state(customer_id) or {}
+    quote = state.get("upgrade_quote")
+    if quote and quote["requested_plan"] == requested_plan:
+        # The only policy gate on a quoted upgrade is the confirmation phrase.
+        return {**quote, "policy_allows": "confirm upgrade" in user_text.lower(), "from_session": True}
+    elig = check_upgrade_eligibility(customer_id, requested_plan)
+    policy = policy_check("upgrade_plan", user_text)
+    return {
+        "requested_plan": requested_plan,
+        "current_plan": elig["current_plan"],
+        "eligible": elig["eligible"],
+        "reasons": elig["reasons"],
+        "price": simulate_pricing(customer_id, requested_plan).get("monthly_price_usd"),
+        "policy_allows": policy["status"] == "allow",
+        "from_session": False,
+    }
+
+def prepare_upgrade(customer_id: str, requested_plan: str, user_text: str) -> dict:
+    """UpgradeDecision for the chat path; queues the upgrade only once the user has confirmed.
+
+    The quote is kept in the session (sessions.py), so the CONFIRM UPGRADE turn does
+    not repeat the plan lookup, eligibility, pricing and policy search.
+    """
+    from ..schemas import UpgradeDecision
+    from ..sessions import update_session
+
+    with span("prepare_upgrade", customer_id=customer_id, requested_plan=requested_plan):
+        quote = _upgrade_quote(customer_id, requested_plan, user_text)
+        confirmed = quote["policy_allows"] and "confirm upgrade" in user_text.lower()
+        decision = UpgradeDecision(
+            customer_id=customer_id,
+            current_plan=quote["current_plan"],
+            requested_plan=requested_plan,
+            eligible=quote["eligible"],
+            reasons=quote["reasons"],
+            simulated_monthly_price_usd=quote["price"],
+            requires_confirmation=not confirmed,
+            next_best_actions=(
+                [] if not quote["eligible"] or confirmed
+                else ["Reply with CONFIRM UPGRADE to apply the change."]
+            ),
+            confidence=0.9,
+        ).model_dump()
+        if quote["eligible"] and confirmed:
+            decision["upgrade"] = execute_upgrade(customer_id, requested_plan, quote["current_plan"])
+            update_session(customer_id, upgrade_quote=None, upgrade_ticket=decision["upgrade"].get("ticket_id"))
+        else:
+            saved = {k: v for k, v in quote.items() if k not in ("policy_allows", "from_session")}
+            update_session(customer_id, upgrade_quote=saved)
+        return decision
@@ -0,0 +1,329 @@
+"""Local content-addressed document archive for retrieve_document_copy.
+
+Layout under DOC_STORE_PATH:
+
+    blobs/ab/cd/abcd...   one file per document, named by the SHA-256 of its bytes
+                          (identical scans are stored once)
+    index.bin             memory-mapped open-addressing hash table
+    .link_secret          HMAC key for retrieval links when DOC_LINK_SECRET is unset
+
+The index maps (identifier kind, identifier, document type) to a blob. The
+identifier kind is transaction_id or check_number. Each slot is 64 bytes:
+
+    key digest (16, BLAKE2b of the key; all zero = empty) | blob sha256 (32) | size (8) | content type (1)
+
+Lookups hash the key, then probe linearly through the mmap. This is O(1) on
+average, never lists a directory, and only touches the pages it probes. The
+table doubles (rebuilt into a new file and atomically renamed) above 70% load.
+Readers in other processes notice the new inode and remap.
+
+Blobs are read by byte range (read_range / iter_range) so large PDFs and
+images can be served in pieces. Retrieval links are HMAC-signed, expire after
+DOC_LINK_TTL_S, and are cached per document for half that time.
+
+    python -m zero_touch_cx.tools.doc_store ingest scan.pdf --check-number 891472 --type CHECK_IMAGE
+"""
+
+from __future__ import annotations
+
+import argparse
+import fcntl
+import hashlib
+import hmac
+import mmap
+import os
+import secrets
+import struct
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator, Optional
+from urllib.parse import urlencode
+
+from ..cache import TTLCache
+from ..config import settings
+
+MAGIC = b"ZTDOCIX1"
+HEADER = struct.Struct("<8sQQ40x")  # magic, capacity, count
+SLOT = struct.Struct("<16s32sQB7x")  # key digest, blob digest, size, content type
+EMPTY = bytes(16)
+INITIAL_CAPACITY = 1 << 16
+MAX_LOAD = 0.7
+
+CONTENT_TYPES = ["application/octet-stream", "application/pdf", "image/png", "image/jpeg", "image/tiff"]
+_SIGNATURES = [(b"%PDF", 1), (b"\x89PNG", 2), (b"\xff\xd8\xff", 3), (b"II*\x00", 4), (b"MM\x00*", 4)]
+
+
+@dataclass(frozen=True)
+class DocRef:
+    digest: str
+    size: int
+    content_type: str
+
+
+def _key(kind: str, identifier: str, document_type: str) -> bytes:
+    raw = f"{kind}\0{identifier.strip()}\0{document_type.upper()}".encode("utf-8")
+    return hashlib.blake2b(raw, digest_size=16).digest()
+
+
+def sniff_content_type(head: bytes) -> int:
+    return next((code for sig, code in _SIGNATURES if head.startswith(sig)), 0)
+
+
+class _Index:
+    """The mmap'd hash table. Callers hold DocStore._lock (a grow remaps the file)."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._mm: Optional[mmap.mmap] = None
+        self._ino: Optional[int] = None
+        if not path.exists():
+            self._create(path, INITIAL_CAPACITY)
+
+    @staticmethod
+    def _create(path: Path, capacity: int) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(HEADER.pack(MAGIC, capacity, 0))
+            f.truncate(HEADER.size + capacity * SLOT.size)
+
+    def _map(self) -> mmap.mmap:
+        ino = os.stat(self.path).st_ino
+        if self._mm is None or ino != self._ino:
+            if self._mm is not None:
+                self._mm.close()
+            with open(self.path, "r+b") as f:
+                self._mm = mmap.mmap(f.fileno(), 0)
+            self._ino = ino
+            magic, _, _ = HEADER.unpack_from(self._mm, 0)
+            if magic != MAGIC:
+                raise ValueError(f"{self.path} is not a document index")
+        return self._mm
+
+    def header(self) -> tuple[int, int]:
+        _, capacity, count = HEADER.unpack_from(self._map(), 0)
+        return capacity, count
+
+    def _probe(self, mm: mmap.mmap, capacity: int, key: bytes) -> tuple[int, bool]:
+        """(slot offset, found) for ``key``: its slot, or the empty slot where it would go."""
+        mask = capacity - 1
+        slot = int.from_bytes(key[:8], "little") & mask
+        for _ in range(capacity):
+            offset = HEADER.size + slot * SLOT.size
+            current = mm[offset:offset + 16]
+            if current == key:
+                return offset, True
+            if current == EMPTY:
+                return offset, False
+            slot = (slot + 1) & mask
+        raise RuntimeError("document index is full")
+
+    def get(self, key: bytes) -> Optional[tuple[bytes, int, int]]:
+        mm = self._map()
+        capacity, _ = self.header()
+        offset, found = self._probe(mm, capacity, key)
+        if not found:
+            return None
+        _, digest, size, ctype = SLOT.unpack_from(mm, offset)
+        return digest, size, ctype
+
+    def put(self, key: bytes, digest: bytes, size: int, ctype: int) -> None:
+        mm = self._map()
+        capacity, count = self.header()
+        offset, found = self._probe(mm, capacity, key)
+        SLOT.pack_into(mm, offset, key, digest, size, ctype)
+        if not found:
+            count += 1
+            HEADER.pack_into(mm, 0, MAGIC, capacity, count)
+            if count > capacity * MAX_LOAD:
+                self._grow(capacity * 2)
+
+    def _grow(self, capacity: int) -> None:
+        old = self._map()
+        tmp = self.path.with_suffix(".grow")
+        self._create(tmp, capacity)
+        with open(tmp, "r+b") as f, mmap.mmap(f.fileno(), 0) as new:
+            _, old_capacity, count = HEADER.unpack_from(old, 0)
+            for i in range(old_capacity):
+                entry = old[HEADER.size + i * SLOT.size:HEADER.size + (i + 1) * SLOT.size]
+                if entry[:16] != EMPTY:
+                    offset, _ = self._probe(new, capacity, entry[:16])
+                    new[offset:offset + SLOT.size] = entry
+            HEADER.pack_into(new, 0, MAGIC, capacity, count)
+            new.flush()
+        os.replace(tmp, self.path)
+
+    def flush(self) -> None:
+        if self._mm is not None:
+            self._mm.flush()
+
+
+class DocStore:
+    def __init__(self, root: str | Path):
+        self.root = Path(root)
+        self.blobs = self.root / "blobs"
+        self.index = _Index(self.root / "index.bin")
+        self._lock = threading.Lock()
+        self._links = TTLCache(maxsize=100_000, ttl_s=settings.doc_link_ttl_s / 2)
+
+    # -- blobs -----------------------------------------------------------
+
+    def blob_path(self, digest: str) -> Path:
+        return self.blobs / digest[:2] / digest[2:4] / digest
+
+    def _write_blob(self, data: bytes) -> str:
+        digest = hashlib.sha256(data).hexdigest()
+        path = self.blob_path(digest)
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_name(f".{digest}.{os.getpid()}.{threading.get_ident()}")
+            tmp.write_bytes(data)
+            os.replace(tmp, path)
+        return digest
+
+    def read_range(self, digest: str, start: int = 0, length: Optional[int] = None) -> bytes:
+        with open(self.blob_path(digest), "rb") as f:
+            if length is None:
+                length = os.fstat(f.fileno()).st_size - start
+            return os.pread(f.fileno(), max(0, length), start)
+
+    def content_type(self, digest: str) -> str:
+        return CONTENT_TYPES[sniff_content_type(self.read_range(digest, 0, 8))]
+
+    def iter_range(self, digest: str, start: int, end: int, chunk_size: int = 1 << 20) -> Iterator[bytes]:
+        """Bytes start..end inclusive, in chunks, for streaming responses."""
+        with open(self.blob_path(digest), "rb") as f:
+            position = start
+            while position <= end:
+                chunk = os.pread(f.fileno(), min(chunk_size, end - position + 1), position)
+                if not chunk:
+                    return
+                position += len(chunk)
+                yield chunk
+
+    # -- index -----------------------------------------------------------
+
+    def put(
+        self,
+        data: bytes,
+        transaction_id: Optional[str] = None,
+        check_number: Optional[str] = None,
+        document_type: str = "TRANSACTION_IMAGE",
+    ) -> DocRef:
+        if not transaction_id and not check_number:
+            raise ValueError("a document needs a transaction_id or a check_number")
+        digest = self._write_blob(data)
+        ctype = sniff_content_type(data[:8])
+        keys = [_key(kind, ident, document_type)
+                for kind, ident in (("transaction_id", transaction_id), ("check_number", check_number)) if ident]
+        lock_path = self.root / "index.lock"
+        with self._lock, open(lock_path, "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)  # writers in other processes
+            try:
+                for key in keys:
+                    self.index.put(key, bytes.fromhex(digest), len(data), ctype)
+                self.index.flush()
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+        return DocRef(digest, len(data), CONTENT_TYPES[ctype])
+
+    def lookup(
+        self,
+        transaction_id: Optional[str] = None,
+        check_number: Optional[str] = None,
+        document_type: str = "TRANSACTION_IMAGE",
+    ) -> Optional[DocRef]:
+        for kind, ident in (("check_number", check_number), ("transaction_id", transaction_id)):
+            if ident:
+                with self._lock:
+                    entry = self.index.get(_key(kind, ident, document_type))
+                if entry is not None:
+                    digest, size, ctype = entry
+                    return DocRef(digest.hex(), size, CONTENT_TYPES[ctype])
+        return None
+
+    def stats(self) -> dict:
+        with self._lock:
+            capacity, count = self.index.header()
+        return {"documents": count, "capacity": capacity, "load": round(count / capacity, 4), "links": self._links.stats()}
+
+    # -- retrieval links ---------------------------------------------------
+
+    def _secret(self) -> bytes:
+        if settings.doc_link_secret:
+            return settings.doc_link_secret.encode("utf-8")
+        path = self.root / ".link_secret"
+        if not path.exists():
+            # Written in full, then linked into place: readers never see a partial key and
+            # when workers race, the first link wins and everyone re-reads it.
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_name(f".link_secret.{os.getpid()}.{threading.get_ident()}")
+            fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "w") as f:
+                f.write(secrets.token_hex(32))
+            try:
+                os.link(tmp, path)
+            except FileExistsError:
+                pass  # already created by another worker
+            finally:
+                os.unlink(tmp)
+        return path.read_text().strip().encode("utf-8")
+
+    def _signature(self, digest: str, document_type: str, expires: int) -> str:
+        message = f"{digest}:{document_type}:{expires}".encode("utf-8")
+        return hmac.new(self._secret(), message, hashlib.sha256).hexdigest()[:32]
+
+    def retrieval_link(self, ref: DocRef, document_type: str) -> str:
+        key = (ref.digest, document_type)
+        link = self._links.get(key)
+        if link is None:
+            expires = int(time.time() + settings.doc_link_ttl_s)
+            query = urlencode({
+                "document_type": document_type, "expires": expires,
+                "sig": self._signature(ref.digest, document_type, expires),
+            })
+            link = f"{settings.doc_link_base_url.rstrip('/')}/{ref.digest}?{query}"
+            self._links.set(key, link)
+        return link
+
+    def verify_link(self, digest: str, document_type: str, expires: int, sig: str) -> bool:
+        if expires < time.time():
+            return False
+        return hmac.compare_digest(sig, self._signature(digest, document_type, expires))
+
+
+_store: DocStore | None = None
+_store_lock = threading.Lock()
+
+
+def get_doc_store() -> DocStore:
+    global _store
+    with _store_lock:
+        if _store is None or _store.root != Path(settings.doc_store_path):
+            _store = DocStore(settings.doc_store_path)
+        return _store
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Local document archive")
+    sub = parser.add_subparsers(dest="command", required=True)
+    ingest = sub.add_parser("ingest", help="add a document")
+    ingest.add_argument("file", type=Path)
+    ingest.add_argument("--transaction-id")
+    ingest.add_argument("--check-number")
+    ingest.add_argument("--type", default="TRANSACTION_IMAGE")
+    sub.add_parser("stats", help="index size and load")
+    args = parser.parse_args(argv)
+
+    store = get_doc_store()
+    if args.command == "ingest":
+        ref = store.put(args.file.read_bytes(), args.transaction_id, args.check_number, args.type)
+        print({"digest": ref.digest, "size": ref.size, "content_type": ref.content_type})
+    else:
+        print(store.stats())
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
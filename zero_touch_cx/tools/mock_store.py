@@ -1,14 +1,65 @@
 from __future__ import annotations
+import threading
 import pandas as pd
 from pathlib import Path
 
 DATA_DIR = Path(__file__).resolve().parents[2] / "data"
 
+# Parsed frames by (path, read options), kept while the file's mtime and size are unchanged,
+# and their rows grouped by a column (rebuilt when the frame is).
+_frames: dict[tuple, tuple[tuple[int, int], pd.DataFrame]] = {}
+_groups: dict[tuple, tuple[pd.DataFrame, dict]] = {}
+_frames_lock = threading.Lock()
+
+def _options_key(options: dict) -> tuple:
+    return tuple(sorted((k, tuple(v) if isinstance(v, list) else v) for k, v in options.items()))
+
+def read_csv(path: str | Path, **options) -> pd.DataFrame:
+    """pd.read_csv, parsed once per file version. The frame is shared: filter or copy it, never mutate it."""
+    path = Path(path)
+    stat = path.stat()
+    version = (stat.st_mtime_ns, stat.st_size)
+    key = (path, _options_key(options))
+    with _frames_lock:
+        cached = _frames.get(key)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+    frame = pd.read_csv(path, **options)
+    with _frames_lock:
+        _frames[key] = (version, frame)
+    return frame
+
+def records_by(path: str | Path, column: str, **options) -> dict:
+    """Rows of a CSV as dicts grouped by ``column``, so per-customer lookups skip pandas. Shared; do not mutate."""
+    frame = read_csv(path, **options)
+    key = (Path(path), column, _options_key(options))
+    with _frames_lock:
+        cached = _groups.get(key)
+    if cached is not None and cached[0] is frame:
+        return cached[1]
+    groups: dict = {}
+    for row in frame.to_dict("records"):
+        groups.setdefault(row[column], []).append(row)
+    with _frames_lock:
+        _groups[key] = (frame, groups)
+    return groups
+
 def load_csv(name: str) -> pd.DataFrame:
-    return pd.read_csv(DATA_DIR / name)
+    return read_csv(DATA_DIR / name)
+
+def iter_csv(name: str, chunksize: int):
+    """Read a mock table in fixed-size chunks (bounded memory, like BigQuery pages)."""
+    yield from pd.read_csv(DATA_DIR / name, chunksize=chunksize)
+
+def billing_history_path() -> Path:
+    """The mock billing store (upgrades land there), or the tracked seed before the first upgrade."""
+    from ..config import settings
+
+    store = Path(settings.billing_store_path)
+    return store if store.exists() else DATA_DIR / "billing_history.csv"
 
 def current_plan(customer_id: str) -> str:
-    df = load_csv("billing_history.csv")
+    df = read_csv(billing_history_path())
     df = df[df["customer_id"] == customer_id].copy()
     if df.empty:
         return "Basic"
@@ -0,0 +1,216 @@
+"""Partition-aware SELECT builder with dry-run byte budgets for BigQuery.
+
+Report tables are partitioned by day on their event timestamp and clustered by
+customer (see migrations/). BigQuery only prunes partitions when the filter
+compares the partitioning column itself with constant expressions, so date
+ranges are emitted as a half-open range on the raw column:
+
+    run_ts >= TIMESTAMP(@start_date) AND run_ts < TIMESTAMP(DATE_ADD(@end_date, INTERVAL 1 DAY))
+
+rather than ``DATE(run_ts) BETWEEN ...``. Equality filters on the clustering
+columns come first so the blocks for one customer are read.
+
+Before running, run_query() dry-runs the statement (cached per SQL and parameter
+values for BQ_DRY_RUN_CACHE_TTL_S) and compares the estimate with
+BQ_MAX_BYTES_SCANNED. Over budget, a caller-supplied downgrade (e.g.
+shrink_window, which narrows the date range) is tried once; otherwise the query
+is refused with QueryBudgetExceeded. The budget is also set as
+maximum_bytes_billed on the real job. Dry-run estimates ignore cluster pruning,
+so they are an upper bound.
+"""
+
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass, field, replace
+from datetime import date, timedelta
+from typing import TYPE_CHECKING, Any, Callable, Optional
+
+from ..cache import TTLCache
+from ..config import settings
+from ..observability import logger, span
+
+if TYPE_CHECKING:
+    from google.cloud import bigquery
+
+PROJECT_ID = "ccibt-hack25ww7-704"
+DATASET_ID = "client_report_data"
+
+
+@dataclass(frozen=True)
+class TableSpec:
+    fqn: str
+    partition_column: Optional[str] = None
+    partition_type: str = "TIMESTAMP"  # TIMESTAMP, DATETIME or DATE; partitions are by DAY
+    cluster_columns: tuple[str, ...] = ()
+
+
+REPORT_EVENT = TableSpec(f"{PROJECT_ID}.{DATASET_ID}.report_event", "run_ts", "TIMESTAMP", ("CustomerID", "status"))
+ACCOUNT_BALANCE = TableSpec(f"{PROJECT_ID}.{DATASET_ID}.AccountBalance", "TransactionTS", "TIMESTAMP", ("CustomerID",))
+
+
+class QueryBudgetExceeded(RuntimeError):
+    def __init__(self, estimated_bytes: int, budget_bytes: int):
+        super().__init__(
+            f"Query would scan {estimated_bytes / 2**30:.2f} GiB, over the "
+            f"{budget_bytes / 2**30:.2f} GiB budget (BQ_MAX_BYTES_SCANNED); narrow the date range."
+        )
+        self.estimated_bytes = estimated_bytes
+        self.budget_bytes = budget_bytes
+
+
+@dataclass(frozen=True)
+class Select:
+    """An immutable SELECT; each ``where_*`` returns a new Select."""
+
+    table: TableSpec
+    columns: tuple[str, ...]
+    where: tuple[str, ...] = ()
+    # (name, type, value, is_array); converted to QueryParameters in job_config()
+    params: tuple[tuple[str, str, Any, bool], ...] = ()
+    group_by: Optional[str] = None
+    order_by: Optional[str] = None
+    limit: Optional[int] = None
+    alias: str = field(default="", compare=False)
+
+    def _add(self, predicate: str, *params: tuple[str, str, Any, bool]) -> "Select":
+        return replace(self, where=self.where + (predicate,), params=self.params + params)
+
+    def _col(self, column: str) -> str:
+        return f"{self.alias}.{column}" if self.alias else column
+
+    def bind(self, param: str, type_: str, value: Any) -> "Select":
+        """Parameter used in the select list (not a filter); lists become array parameters."""
+        return replace(self, params=self.params + ((param, type_, value, isinstance(value, list)),))
+
+    def where_equals(self, column: str, param: str, type_: str, value: Any) -> "Select":
+        return self._add(f"{self._col(column)} = @{param}", (param, type_, value, False))
+
+    def where_in(self, column: str, param: str, type_: str, values: list) -> "Select":
+        return self._add(f"{self._col(column)} IN UNNEST(@{param})", (param, type_, list(values), True))
+
+    def where_partition_range(self, start_date: Optional[str], end_date: Optional[str]) -> "Select":
+        """Inclusive date range on the partitioning column, written so partitions are pruned."""
+        col, type_ = self._col(self.table.partition_column), self.table.partition_type
+        query = self
+        if start_date:
+            lower = f"{col} >= @start_date" if type_ == "DATE" else f"{col} >= {type_}(@start_date)"
+            query = query._add(lower, ("start_date", "DATE", start_date, False))
+        if end_date:
+            upper = (
+                f"{col} <= @end_date" if type_ == "DATE"
+                else f"{col} < {type_}(DATE_ADD(@end_date, INTERVAL 1 DAY))"
+            )
+            query = query._add(upper, ("end_date", "DATE", end_date, False))
+        return query
+
+    def param(self, name: str) -> Any:
+        return next((value for n, _, value, _ in self.params if n == name), None)
+
+    def with_param(self, name: str, value: Any) -> "Select":
+        return replace(self, params=tuple((n, t, value if n == name else v, a) for n, t, v, a in self.params))
+
+    def sql(self) -> str:
+        alias = f" AS {self.alias}" if self.alias else ""
+        lines = [f"SELECT {', '.join(self.columns)}", f"FROM `{self.table.fqn}`{alias}"]
+        if self.where:
+            lines.append("WHERE " + "\n  AND ".join(self.where))
+        if self.group_by:
+            lines.append(f"GROUP BY {self.group_by}")
+        if self.order_by:
+            lines.append(f"ORDER BY {self.order_by}")
+        if self.limit is not None:
+            lines.append(f"LIMIT {int(self.limit)}")
+        return "\n".join(lines)
+
+    def job_config(self, **kwargs: Any) -> "bigquery.QueryJobConfig":
+        from google.cloud.bigquery import ArrayQueryParameter, QueryJobConfig, ScalarQueryParameter
+
+        return QueryJobConfig(
+            query_parameters=[
+                ArrayQueryParameter(n, t, v) if is_array else ScalarQueryParameter(n, t, v)
+                for n, t, v, is_array in self.params
+            ],
+            **kwargs,
+        )
+
+
+def select(
+    table: TableSpec,
+    *columns: str,
+    alias: str = "",
+    group_by: Optional[str] = None,
+    order_by: Optional[str] = None,
+    limit: Optional[int] = None,
+) -> Select:
+    return Select(table=table, columns=columns, alias=alias, group_by=group_by, order_by=order_by, limit=limit)
+
+
+# ---------------------------------------------------------------------
+# Dry-run budget
+# ---------------------------------------------------------------------
+
+_dry_runs = TTLCache(maxsize=4096, ttl_s=settings.bq_dry_run_cache_ttl_s)
+_stats = {"dry_runs": 0, "downgraded": 0, "refused": 0}
+_stats_lock = threading.Lock()
+
+
+def _count(key: str) -> None:
+    with _stats_lock:
+        _stats[key] += 1
+
+
+def query_budget_stats() -> dict:
+    with _stats_lock:
+        return {**_stats, "dry_run_cache": _dry_runs.stats()}
+
+
+def estimate_bytes(query: Select, client: "bigquery.Client") -> int:
+    """Bytes the query would scan, from a (cached) dry run."""
+    key = (query.sql(), tuple((n, repr(v)) for n, _, v, _ in query.params))
+    cached = _dry_runs.get(key)
+    if cached is not None:
+        return cached
+    with span("bq_dry_run", table=query.table.fqn):
+        job = client.query(query.sql(), job_config=query.job_config(dry_run=True, use_query_cache=False))
+    _count("dry_runs")
+    estimate = int(job.total_bytes_processed or 0)
+    _dry_runs.set(key, estimate)
+    return estimate
+
+
+def shrink_window(query: Select, estimated_bytes: int, budget_bytes: int) -> Optional[Select]:
+    """Downgrade: keep the most recent days that fit the budget, assuming bytes scale with days."""
+    start, end = query.param("start_date"), query.param("end_date")
+    if not start or not end:
+        return None
+    start_d, end_d = date.fromisoformat(str(start)), date.fromisoformat(str(end))
+    days = (end_d - start_d).days + 1
+    keep = max(1, int(days * budget_bytes / max(estimated_bytes, 1)))
+    if keep >= days:
+        return None
+    return query.with_param("start_date", (end_d - timedelta(days=keep - 1)).isoformat())
+
+
+def run_query(
+    query: Select,
+    client: "bigquery.Client",
+    downgrade: Optional[Callable[[Select, int, int], Optional[Select]]] = None,
+    page_size: Optional[int] = None,
+) -> tuple[Any, Select]:
+    """(row iterator, query actually run); raises QueryBudgetExceeded when it cannot fit the budget."""
+    budget = settings.bq_max_bytes_scanned
+    if budget:
+        estimate = estimate_bytes(query, client)
+        if estimate > budget and downgrade is not None:
+            smaller = downgrade(query, estimate, budget)
+            if smaller is not None:
+                logger.info("Query on %s downgraded: %d bytes over budget %d", query.table.fqn, estimate, budget)
+                _count("downgraded")
+                query, estimate = smaller, estimate_bytes(smaller, client)
+        if estimate > budget:
+            _count("refused")
+            raise QueryBudgetExceeded(estimate, budget)
+    job = client.query(query.sql(), job_config=query.job_config(maximum_bytes_billed=budget or None))
+    rows = job.result(page_size=page_size) if page_size else job.result()
+    return rows, query
@@ -1,13 +1,16 @@
 from __future__ import annotations
+import pathlib
 from ..config import settings
 from ..observability import span
 
+DOCS_DIR = pathlib.Path(__file__).resolve().parents[2] / "docs"
+
 def rag_search(query: str, top_k: int = 3) -> dict:
     with span("rag_search", top_k=top_k, mock=settings.mock_mode):
         if settings.mock_mode or not settings.vertex_search_datastore_id:
-            import glob, pathlib
+            import glob
             passages=[]
-            for fp in glob.glob(str(pathlib.Path(__file__).resolve().parents[2] / "docs" / "*.md")):
+            for fp in glob.glob(str(DOCS_DIR / "*.md")):
                 txt = pathlib.Path(fp).read_text(encoding="utf-8")
                 score = sum(1 for w in query.lower().split() if w in txt.lower())
                 if score:
@@ -0,0 +1,273 @@
+"""Durable upgrade queue: the chat path enqueues, a background worker commits.
+
+execute_upgrade() only inserts into a local SQLite queue (UPGRADE_QUEUE_PATH) and
+returns the ticket. The request is identified by an idempotency key derived from
+(customer, target plan, plan being replaced). A request for the plan of the
+customer's latest ticket, while that ticket is queued or committed within the
+window, is a repeat and gets that ticket back whatever plan it claims to replace
+(after the first call the write-behind plan cache already shows the new plan), so
+a retried or double-submitted upgrade never becomes a second plan change. Only
+the latest ticket counts, so Pro -> Starter -> Pro within the window ends on Pro. A worker thread drains the queue in batches
+(UPGRADE_COMMIT_BATCH_SIZE, after a short UPGRADE_COMMIT_LINGER_MS so bursts
+coalesce) and appends the new plan periods to the billing store in one write per
+batch. Rows survive restarts and are picked up by the next worker.
+
+The new plan is written to the eligibility plan cache when the upgrade is queued
+(write-behind), so follow-up turns see it right away. If the commit finally fails
+after UPGRADE_MAX_ATTEMPTS, the cached plan is dropped.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import sqlite3
+import threading
+import time
+from datetime import date
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+from ..config import settings
+from ..observability import logger, span
+
+QUEUED, COMMITTED, FAILED = "queued", "committed", "failed"
+
+
+def idempotency_key(customer_id: str, requested_plan: str, current_plan: str = "") -> str:
+    raw = f"{customer_id.strip().lower()}|{requested_plan.strip().lower()}|{current_plan.strip().lower()}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:20]
+
+
+class UpgradeQueue:
+    def __init__(
+        self,
+        path: str | Path,
+        store=None,
+        price_of: Optional[Callable[[str], float]] = None,
+        batch_size: Optional[int] = None,
+        on_commit: Optional[Callable[[str, str], None]] = None,
+        on_failure: Optional[Callable[[str, str], None]] = None,
+    ):
+        self.path = Path(path)
+        self._store = store
+        self.price_of = price_of or (lambda plan: 0.0)
+        self.batch_size = batch_size or settings.upgrade_commit_batch_size
+        self.on_commit = on_commit
+        self.on_failure = on_failure
+        self._local = threading.local()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._drain_lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self.batches = 0
+
+    @property
+    def store(self):
+        if self._store is None:
+            from .billing_data import get_billing_store
+
+            self._store = get_billing_store()
+        return self._store
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS upgrade_queue ("
+                " idempotency_key TEXT PRIMARY KEY,"
+                " customer_id TEXT NOT NULL,"
+                " requested_plan TEXT NOT NULL,"
+                " status TEXT NOT NULL,"
+                " attempts INTEGER NOT NULL DEFAULT 0,"
+                " error TEXT,"
+                " enqueued_at REAL NOT NULL,"
+                " committed_at REAL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS upgrade_queue_status ON upgrade_queue (status, enqueued_at)")
+            self._local.conn = conn
+        return conn
+
+    # -- producer side (chat path) -------------------------------------
+
+    def enqueue(self, customer_id: str, requested_plan: str, current_plan: str = "") -> dict[str, Any]:
+        """Record the upgrade durably; a repeat of the same upgrade returns the original ticket."""
+        key = idempotency_key(customer_id, requested_plan, current_plan)
+        now = time.time()
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Only the customer's latest ticket can be repeated; a later change supersedes it.
+            latest = conn.execute(
+                "SELECT idempotency_key, requested_plan, status, committed_at FROM upgrade_queue"
+                " WHERE customer_id = ? ORDER BY enqueued_at DESC LIMIT 1",
+                (customer_id,),
+            ).fetchone()
+            duplicate = (
+                latest is not None
+                and latest[1].strip().lower() == requested_plan.strip().lower()
+                and (latest[2] == QUEUED
+                     or (latest[2] == COMMITTED and now - latest[3] < settings.upgrade_idempotency_window_s))
+            )
+            if duplicate:
+                key = latest[0]
+            else:
+                conn.execute(
+                    "INSERT INTO upgrade_queue (idempotency_key, customer_id, requested_plan, status, enqueued_at)"
+                    " VALUES (?, ?, ?, ?, ?)"
+                    " ON CONFLICT(idempotency_key) DO UPDATE SET status = excluded.status, attempts = 0,"
+                    " error = NULL, enqueued_at = excluded.enqueued_at, committed_at = NULL",
+                    (key, customer_id, requested_plan, QUEUED, now),
+                )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        if not duplicate:
+            self.start()
+            self._wake.set()
+        return {
+            "idempotency_key": key,
+            "ticket_id": f"chg_{key}",
+            "duplicate": duplicate,
+            "queue_status": latest[2] if duplicate else QUEUED,
+        }
+
+    def status(self, key: str) -> Optional[dict[str, Any]]:
+        row = self._conn().execute(
+            "SELECT customer_id, requested_plan, status, attempts, error FROM upgrade_queue WHERE idempotency_key = ?",
+            (key,),
+        ).fetchone()
+        if row is None:
+            return None
+        return dict(zip(("customer_id", "requested_plan", "status", "attempts", "error"), row))
+
+    def pending(self) -> int:
+        return self._conn().execute("SELECT COUNT(*) FROM upgrade_queue WHERE status = ?", (QUEUED,)).fetchone()[0]
+
+    # -- consumer side (worker) -----------------------------------------
+
+    def commit_batch(self) -> int:
+        """Apply up to batch_size queued upgrades to the billing store in one write."""
+        with self._drain_lock, span("commit_upgrades"):
+            conn = self._conn()
+            rows = conn.execute(
+                "SELECT idempotency_key, customer_id, requested_plan FROM upgrade_queue"
+                " WHERE status = ? ORDER BY enqueued_at LIMIT ?",
+                (QUEUED, self.batch_size),
+            ).fetchall()
+            if not rows:
+                return 0
+            today = date.today().isoformat()
+            periods = [
+                {"customer_id": c, "plan": p, "start_date": today, "mrr_usd": self.price_of(p)}
+                for _, c, p in rows
+            ]
+            committed_at = time.time()
+            try:
+                self.store.append_periods(periods)
+            except Exception as e:
+                logger.warning("Upgrade batch of %d failed: %s", len(rows), e)
+                self._record_failure(rows, str(e))
+                return 0
+            conn.execute("BEGIN IMMEDIATE")
+            conn.executemany(
+                "UPDATE upgrade_queue SET status = ?, committed_at = ?, error = NULL WHERE idempotency_key = ?",
+                [(COMMITTED, committed_at, k) for k, _, _ in rows],
+            )
+            conn.execute("COMMIT")
+            self.batches += 1
+            if self.on_commit:
+                for _, c, p in rows:
+                    self.on_commit(c, p)
+            return len(rows)
+
+    def _record_failure(self, rows: list[tuple], error: str) -> None:
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        conn.executemany(
+            "UPDATE upgrade_queue SET attempts = attempts + 1, error = ?,"
+            " status = CASE WHEN attempts + 1 >= ? THEN ? ELSE status END"
+            " WHERE idempotency_key = ?",
+            [(error, settings.upgrade_max_attempts, FAILED, k) for k, _, _ in rows],
+        )
+        conn.execute("COMMIT")
+        if self.on_failure:
+            for key, c, p in rows:
+                if (self.status(key) or {}).get("status") == FAILED:
+                    self.on_failure(c, p)
+
+    def drain(self) -> int:
+        total = 0
+        while True:
+            n = self.commit_batch()
+            total += n
+            if n < self.batch_size:
+                return total
+
+    def start(self) -> None:
+        if self._thread is None:
+            with self._start_lock:
+                if self._thread is None:
+                    self._stop.clear()
+                    self._thread = threading.Thread(target=self._loop, name="zero-touch-upgrade-queue", daemon=True)
+                    self._thread.start()
+
+    def stop(self, flush: bool = True, timeout: float = 10.0) -> None:
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        if flush:
+            self.drain()
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            self._wake.wait(settings.upgrade_commit_interval_s)
+            self._wake.clear()
+            if self._stop.is_set():
+                return
+            time.sleep(settings.upgrade_commit_linger_ms / 1000)  # let a burst coalesce into one batch
+            try:
+                self.drain()
+            except Exception:
+                logger.exception("Upgrade queue worker failed")
+
+    def stats(self) -> dict[str, Any]:
+        counts = dict(self._conn().execute("SELECT status, COUNT(*) FROM upgrade_queue GROUP BY status").fetchall())
+        return {QUEUED: 0, COMMITTED: 0, FAILED: 0, **counts, "batches": self.batches}
+
+
+_queue: UpgradeQueue | None = None
+_queue_lock = threading.Lock()
+
+
+def get_upgrade_queue() -> UpgradeQueue:
+    global _queue
+    with _queue_lock:
+        if _queue is None or _queue.path != Path(settings.upgrade_queue_path):
+            from .billing_tools import PLAN_PRICING, forget_cached_plan
+
+            _queue = UpgradeQueue(
+                settings.upgrade_queue_path,
+                price_of=lambda plan: PLAN_PRICING.get(plan, 0.0),
+                on_failure=forget_cached_plan,
+            )
+        return _queue
+
+
+def stop_upgrade_queue(flush: bool = True) -> None:
+    """Stop the worker; with flush, commit whatever is still queued (used at shutdown)."""
+    with _queue_lock:
+        queue = _queue
+    if queue is not None:
+        queue.stop(flush=flush)
+
+
+def upgrade_queue_stats() -> dict[str, Any]:
+    return get_upgrade_queue().stats()
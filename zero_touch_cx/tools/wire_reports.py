@@ -0,0 +1,199 @@
+"""Wire report point lookups with column projection and a two-level cache.
+
+get_detailed_wire_report used to run ``SELECT t.* ... LIMIT 1`` as a full query
+job per record. Lookups now go through WireReportLookup:
+
+1. an in-process LRU (TTLCache) keyed by (report_id, sender, view);
+2. a local SQLite store (WIRE_REPORT_CACHE_PATH) shared by workers and restarts,
+   filled by every BigQuery read and by warm();
+3. BigQuery, reading only the view's columns (VIEWS, intersected with the table
+   schema, which is fetched once) via the jobs.query fast path when the client
+   supports it.
+
+Entries older than WIRE_REPORT_CACHE_TTL_S are refreshed from BigQuery; misses
+("not found") are cached for a shorter time. warm() loads the most recent wire
+reports of customers active in report_event over the last few days in one query.
+
+    python -m zero_touch_cx.tools.wire_reports --warm
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import threading
+import time
+from datetime import date, timedelta
+from typing import Optional
+
+from ..cache import TTLCache
+from ..config import settings
+from ..kvstore import SqliteKV, make_key
+from ..observability import logger, span
+from ..serialization import dumps
+from .query_builder import DATASET_ID, PROJECT_ID, REPORT_EVENT, TableSpec, run_query, select
+
+WIRE_REPORT = TableSpec(f"{PROJECT_ID}.{DATASET_ID}.wire_report", cluster_columns=("report_id", "SenderName"))
+
+# View -> columns it needs; columns missing from the table are dropped at query time.
+VIEWS = {
+    "summary": ("report_id", "SenderName", "ReceiverName", "Amount", "Currency", "Status"),
+    "detail": (
+        "report_id", "SenderName", "ReceiverName", "Amount", "Currency", "Status", "ValueDate",
+        "SenderAccount", "ReceiverAccount", "ReceiverBank", "Reference", "UpdatedTS",
+    ),
+}
+NOT_FOUND_TTL_S = 60.0
+
+
+def sender_name(customer_id: str) -> str:
+    return customer_id.replace("USR-", "")
+
+
+def _plain(row: dict) -> dict:
+    """JSON-safe copy, so records look the same from BigQuery, the store and the LRU."""
+    return json.loads(dumps(row))
+
+
+class WireReportLookup:
+    def __init__(self, client_factory=None, store_path: Optional[str] = None):
+        self._client_factory = client_factory
+        self._client = None
+        self.store = SqliteKV(store_path or settings.wire_report_cache_path, table="wire_reports")
+        self.lru = TTLCache(maxsize=settings.wire_report_cache_max_entries, ttl_s=settings.wire_report_cache_ttl_s)
+        self._columns: dict[str, list[str]] = {}
+        self._lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self.stats = {"lru_hits": 0, "store_hits": 0, "bigquery": 0, "warmed": 0}
+
+    def _count(self, key: str, n: int = 1) -> None:
+        with self._stats_lock:
+            self.stats[key] += n
+
+    @property
+    def client(self):
+        if self._client is None:
+            from .bigquery_tools import _get_client
+
+            self._client = (self._client_factory or _get_client)()
+        return self._client
+
+    def columns(self, view: str) -> list[str]:
+        """The view's columns that exist in wire_report; ["*"] if the schema cannot be read."""
+        with self._lock:
+            if view not in self._columns:
+                try:
+                    existing = {f.name for f in self.client.get_table(WIRE_REPORT.fqn).schema}
+                except Exception as e:
+                    logger.warning("wire_report schema unavailable (%s); selecting all columns", e)
+                    existing = set()
+                self._columns[view] = [c for c in VIEWS[view] if c in existing] or ["*"]
+            return self._columns[view]
+
+    def _query(self, query) -> list[dict]:
+        sql = query.sql()
+        job_config = query.job_config(maximum_bytes_billed=settings.bq_max_bytes_scanned or None)
+        client = self.client
+        if hasattr(client, "query_and_wait"):  # jobs.query: no job polling for short queries
+            rows = client.query_and_wait(sql, job_config=job_config)
+        else:
+            rows = client.query(sql, job_config=job_config).result()
+        return [_plain(dict(row)) for row in rows]
+
+    def get(self, report_id: str, customer_id: str, view: str = "detail") -> Optional[dict]:
+        if view not in VIEWS:
+            raise ValueError(f"unknown view {view!r}; expected one of {sorted(VIEWS)}")
+        key = make_key(report_id, sender_name(customer_id), view)
+        cached = self.lru.get(key)
+        if cached is not None:
+            self._count("lru_hits")
+            return cached or None
+        entry = self.store.get(key)
+        if entry is not None:
+            record, updated_at = entry
+            ttl = settings.wire_report_cache_ttl_s if record else NOT_FOUND_TTL_S
+            if time.time() - updated_at <= ttl:
+                self._count("store_hits")
+                self.lru.set(key, record, ttl_s=ttl)
+                return record or None
+
+        with span("wire_report_lookup", report_id=report_id, view=view):
+            query = (
+                select(WIRE_REPORT, *self.columns(view), limit=1)
+                .where_equals("report_id", "report_id", "STRING", report_id)
+                .where_equals("SenderName", "sender_name", "STRING", sender_name(customer_id))
+            )
+            rows = self._query(query)
+        self._count("bigquery")
+        record = rows[0] if rows else {}  # {} caches "not found"
+        self.store.set(key, record)
+        self.lru.set(key, record, ttl_s=settings.wire_report_cache_ttl_s if record else NOT_FOUND_TTL_S)
+        return record or None
+
+    def active_customers(self, days: int) -> list[str]:
+        end = date.today()
+        query = select(REPORT_EVENT, "DISTINCT CustomerID").where_partition_range(
+            (end - timedelta(days=days)).isoformat(), end.isoformat()
+        )
+        rows, _ = run_query(query, self.client)
+        return [row["CustomerID"] for row in rows]
+
+    def warm(self, customers: Optional[list[str]] = None, days: Optional[int] = None, view: str = "detail") -> int:
+        """Load the latest WIRE_REPORT_WARM_PER_CUSTOMER reports per customer into both cache levels."""
+        days = days or settings.wire_report_warm_days
+        customers = self.active_customers(days) if customers is None else customers
+        senders = sorted({sender_name(c) for c in customers})
+        if not senders:
+            return 0
+        columns = self.columns(view)
+        query = (
+            select(WIRE_REPORT, *columns)
+            .where_in("SenderName", "senders", "STRING", senders)
+            .bind("per_sender", "INT64", settings.wire_report_warm_per_customer)
+        )
+        sql = query.sql() + "\nQUALIFY ROW_NUMBER() OVER (PARTITION BY SenderName ORDER BY report_id DESC) <= @per_sender"
+        with span("warm_wire_reports", senders=len(senders)):
+            job = self.client.query(sql, job_config=query.job_config())
+            records = [_plain(dict(row)) for row in job.result()]
+        items = [(make_key(r["report_id"], r["SenderName"], view), r) for r in records]
+        self.store.set_many(items)
+        for key, record in items:
+            self.lru.set(key, record)
+        self._count("warmed", len(items))
+        return len(items)
+
+
+_lookup: WireReportLookup | None = None
+_lookup_lock = threading.Lock()
+
+
+def get_wire_report_lookup() -> WireReportLookup:
+    global _lookup
+    with _lookup_lock:
+        if _lookup is None:
+            _lookup = WireReportLookup()
+        return _lookup
+
+
+def wire_report_cache_stats() -> dict:
+    lookup = get_wire_report_lookup()
+    with lookup._stats_lock:
+        stats = dict(lookup.stats)
+    return {**stats, "lru": lookup.lru.stats()}
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Warm the wire report lookup cache")
+    parser.add_argument("--warm", action="store_true", help="load recent reports of active customers")
+    parser.add_argument("--customers", help="comma-separated customer IDs (default: active in report_event)")
+    parser.add_argument("--days", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    if args.warm:
+        customers = [c.strip() for c in args.customers.split(",")] if args.customers else None
+        print({"warmed": get_wire_report_lookup().warm(customers, args.days)})
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())